@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+KB Fortress AI - Combined Financial Products Dataset
+금융상품 데이터셋 + KB 실제 상품 + 수동 입력 상품을 하나의 DataFrame으로 병합
+"""
+
+import os
+import sys
+import pandas as pd
+
+sys.path.append(os.path.dirname(__file__))
+
+from financial_products_dataset import FinancialProductsDataset, PRODUCT_FIELDS, CATEGORICAL_COLUMNS
+from kb_data_parser import KBDataParser
+from manual_data_converter import ManualDataConverter
+
+# KB 실제 상품(snake_case) → 공통 스키마(FinancialProduct, camelCase) 컬럼 매핑
+# 공통 스키마에 대응 항목이 없는 신용등급/대출기간은 병합 대상에서 제외
+_KB_COLUMN_MAP = {
+    "product_name": "productName",
+    "provider": "provider",
+    "product_type": "category",
+    "target_customer": "targetCustomer",
+    "loan_limit": "maxAmount",
+    "interest_rate": "interestRate",
+    "special_conditions": "conditions",
+    "description": "description",
+    "source": "source",
+}
+
+def _kb_to_shared_schema(kb_df: pd.DataFrame) -> pd.DataFrame:
+    """KB 실제 상품 DataFrame을 공통 스키마 컬럼으로 변환"""
+    df = kb_df[list(_KB_COLUMN_MAP)].rename(columns=_KB_COLUMN_MAP)
+    collateral = kb_df["collateral"].astype(str)
+    df["collateralRequired"] = (collateral != "") & (collateral != "무담보")
+    df["guaranteeAvailable"] = (kb_df["guarantee"].astype(str) != "") | (collateral == "보증서담보")
+    return df
+
+def combine_frames(dataset_df: pd.DataFrame, kb_df: pd.DataFrame, manual_df: pd.DataFrame) -> pd.DataFrame:
+    """세 상품 DataFrame을 공통 스키마(PRODUCT_FIELDS)로 맞춘 뒤 병합"""
+    frames = [
+        frame.reindex(columns=PRODUCT_FIELDS)
+        for frame in (dataset_df, _kb_to_shared_schema(kb_df), manual_df)
+    ]
+    df = pd.concat(frames, ignore_index=True, copy=False)
+    # 데이터셋별 카테고리 집합이 달라 concat 시 object로 풀리므로 다시 category dtype으로 변환
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype('category')
+    return df
+
+def combined_df(markdown_file: str = "data/raw/financial_products_manual.md") -> pd.DataFrame:
+    """세 수집기의 상품 DataFrame을 파일 왕복 없이 병합"""
+    dataset = FinancialProductsDataset()
+    
+    kb_parser = KBDataParser(markdown_file)
+    kb_parser.parse_all_products()
+    
+    converter = ManualDataConverter(markdown_file)
+    converter.parse_markdown()
+    
+    return combine_frames(dataset.to_dataframe(), kb_parser.to_dataframe(), converter.to_dataframe())
+
+def main():
+    print("KB Fortress AI - 통합 금융상품 데이터셋")
+    print("=" * 50)
+    
+    df = combined_df()
+    
+    filepath = "data/raw/combined_products.parquet"
+    os.makedirs("data/raw", exist_ok=True)
+    df.to_parquet(filepath, engine='pyarrow', compression='zstd', index=False)
+    
+    print(f"총 상품 수: {len(df)}")
+    print(f"통합 Parquet 파일: {filepath}")
+
+if __name__ == "__main__":
+    main()
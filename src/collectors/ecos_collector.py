@@ -1,10 +1,15 @@
 import requests
+from requests.adapters import HTTPAdapter
 import os
 import json
 import pandas as pd
+import numpy as np
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
-import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
 
 class ECOSAPICollector:
     """한국은행 ECOS API 데이터 수집기"""
@@ -15,7 +20,12 @@ class ECOSAPICollector:
             raise ValueError("ECOS API 키가 필요합니다")
         
         self.base_url = "https://ecos.bok.or.kr/api"
+        
+        # 지표 일괄 수집 시 동시 요청 수 (세션 커넥션 풀 크기와 동일하게 유지)
+        self.max_concurrent_requests = 4
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrent_requests)
+        self.session.mount("https://", adapter)
         
         # 주요 거시경제지표 코드 정의
         self.indicators = {
@@ -140,55 +150,60 @@ class ECOSAPICollector:
             data = response.json()
             
             if "StatisticSearch" not in data:
-                print(f"데이터 없음: {indicator['name']}")
+                logger.warning("데이터 없음: %s", indicator['name'])
                 return None
             
             rows = data["StatisticSearch"]["row"]
             
-            processed_data = []
-            for row in rows:
-                try:
-                    processed_data.append({
-                        "indicator_name": indicator["name"],
-                        "indicator_key": indicator_key,
-                        "date": row["TIME"],
-                        "value": float(row["DATA_VALUE"]) if row["DATA_VALUE"] != "-" else None,
-                        "unit": indicator["unit"],
-                        "stat_code": indicator["stat_code"],
-                        "collected_at": datetime.now().isoformat()
-                    })
-                except (ValueError, KeyError) as e:
-                    print(f"데이터 처리 오류: {row} - {e}")
-                    continue
+            # 행 단위 float 변환 대신 컬럼 단위로 한 번에 변환 ("-"는 결측값)
+            df = pd.DataFrame(rows, columns=["TIME", "DATA_VALUE"])
+            values = pd.to_numeric(df["DATA_VALUE"].replace("-", np.nan), errors="coerce")
+            
+            invalid = df["TIME"].isna() | (values.isna() & (df["DATA_VALUE"] != "-"))
+            if invalid.any():
+                logger.warning("데이터 처리 오류: %s - %d개 행 제외", indicator['name'], int(invalid.sum()))
+                df, values = df[~invalid], values[~invalid]
+            
+            processed_data = pd.DataFrame({
+                "indicator_name": indicator["name"],
+                "indicator_key": indicator_key,
+                "date": df["TIME"],
+                "value": values.astype(object).where(values.notna(), None),
+                "unit": indicator["unit"],
+                "stat_code": indicator["stat_code"],
+                "collected_at": datetime.now().isoformat()
+            }).to_dict("records")
             
-            print(f" {indicator['name']}: {len(processed_data)}개 데이터 수집")
+            logger.info(" %s: %d개 데이터 수집", indicator['name'], len(processed_data))
             return processed_data
             
         except requests.RequestException as e:
-            print(f" API 요청 오류 ({indicator['name']}): {e}")
+            logger.error(" API 요청 오류 (%s): %s", indicator['name'], e)
             return None
         except Exception as e:
-            print(f" 데이터 처리 오류 ({indicator['name']}): {e}")
+            logger.error(" 데이터 처리 오류 (%s): %s", indicator['name'], e)
             return None
     
     def get_latest_indicators(self, days_back: int = 30) -> Dict[str, List[Dict]]:
         """최근 지표 데이터 일괄 수집"""
-        end_date = datetime.now().strftime("%Y%m%d")
-        start_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y%m%d")
+        now = datetime.now()
+        end_date = now.strftime("%Y%m%d")
+        start_date = (now - timedelta(days=days_back)).strftime("%Y%m%d")
         
-        print(f"ECOS 데이터 수집 기간: {start_date} ~ {end_date}")
+        logger.info("ECOS 데이터 수집 기간: %s ~ %s", start_date, end_date)
         
-        all_data = {}
+        def fetch(indicator_key: str) -> Optional[List[Dict]]:
+            logger.info("수집 중: %s", self.indicators[indicator_key]['name'])
+            return self.get_indicator_data(indicator_key, start_date, end_date)
         
-        for indicator_key in self.indicators.keys():
-            print(f"수집 중: {self.indicators[indicator_key]['name']}")
-            
-            data = self.get_indicator_data(indicator_key, start_date, end_date)
-            if data:
-                all_data[indicator_key] = data
-            
-            # API 호출 제한 방지를 위한 대기
-            time.sleep(0.5)
+        # 지표별 요청을 공유 세션으로 동시에 보내되, API 호출 제한을 고려해 동시 요청 수를 제한
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_requests) as executor:
+            results = executor.map(fetch, self.indicators.keys())
+            all_data = {
+                indicator_key: data
+                for indicator_key, data in zip(self.indicators.keys(), results)
+                if data
+            }
         
         return all_data
     
@@ -223,7 +238,7 @@ class ECOSAPICollector:
         json_path = os.path.join(output_dir, "ecos_indicators.json")
         with open(json_path, 'w', encoding='utf-8') as f:
             json.dump(all_data, f, ensure_ascii=False, indent=2)
-        print(f" JSON 저장: {json_path}")
+        logger.info(" JSON 저장: %s", json_path)
         
         # CSV 형태로 변환하여 저장
         csv_data = []
@@ -235,7 +250,7 @@ class ECOSAPICollector:
             df = pd.DataFrame(csv_data)
             csv_path = os.path.join(output_dir, "ecos_indicators.csv")
             df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-            print(f" CSV 저장: {csv_path}")
+            logger.info(" CSV 저장: %s", csv_path)
         
         # 최신값만 별도 저장 (그래프 DB 로딩용)
         latest_data = {}
@@ -249,7 +264,7 @@ class ECOSAPICollector:
         latest_path = os.path.join(output_dir, "ecos_latest_indicators.json")
         with open(latest_path, 'w', encoding='utf-8') as f:
             json.dump(latest_data, f, ensure_ascii=False, indent=2)
-        print(f" 최신 지표 저장: {latest_path}")
+        logger.info(" 최신 지표 저장: %s", latest_path)
         
         return latest_data
     
@@ -296,6 +311,7 @@ class ECOSAPICollector:
 
 def main():
     """ECOS 데이터 수집 실행"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("=== ECOS API 데이터 수집 시작 ===")
     
     try:
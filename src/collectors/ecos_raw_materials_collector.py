@@ -6,8 +6,10 @@ ECOS API에서 실제 원자재 가격 데이터 수집 및 Neo4j 저장
 
 import os
 import sys
+import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
 
 # 프로젝트 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'graph'))
@@ -16,6 +18,78 @@ sys.path.append(os.path.dirname(__file__))
 from ecos_collector import ECOSAPICollector
 from neo4j_manager import Neo4jManager
 
+logger = logging.getLogger(__name__)
+
+# UserCompany.industryDescription 풀텍스트 인덱스 이름
+INDUSTRY_FULLTEXT_INDEX = "userCompanyIndustryIdx"
+
+# 풀텍스트 인덱스 색인 완료 대기 시간 (초)
+_INDEX_AWAIT_TIMEOUT_SECONDS = 300
+
+# 업종별 기업 조회 절 (인덱스가 준비되지 않았으면 CONTAINS 스캔으로 대체)
+_FULLTEXT_COMPANY_MATCH = "CALL db.index.fulltext.queryNodes($index_name, '\"' + industry + '\"') YIELD node AS u"
+_CONTAINS_COMPANY_MATCH = "MATCH (u:UserCompany) WHERE u.industryDescription CONTAINS industry"
+
+# 변동성/카테고리 문자열은 매핑 전체에서 동일 객체를 공유하도록 intern
+VOLATILITY_EXTREME = sys.intern("EXTREME")
+VOLATILITY_HIGH = sys.intern("HIGH")
+VOLATILITY_MEDIUM = sys.intern("MEDIUM")
+HIGH_VOLATILITY_LEVELS = frozenset((VOLATILITY_HIGH, VOLATILITY_EXTREME))
+
+CATEGORY_METALS = sys.intern("METALS")
+CATEGORY_CHEMICALS = sys.intern("CHEMICALS")
+CATEGORY_ENERGY = sys.intern("ENERGY")
+CATEGORY_TEXTILES = sys.intern("TEXTILES")
+CATEGORY_AGRICULTURE = sys.intern("AGRICULTURE")
+
+@dataclass(frozen=True, slots=True)
+class RawMaterialMeta:
+    """원자재 지표 메타데이터 (업종별 영향도)"""
+    category: str
+    volatility: str
+    impact_industries: Tuple[str, ...]
+    risk_multiplier: float
+
+# 원자재 지표 매핑 (모듈 로드 시 한 번만 생성)
+RAW_MATERIAL_MAPPING: Dict[str, RawMaterialMeta] = {
+    "steel_price_index": RawMaterialMeta(
+        category=CATEGORY_METALS,
+        volatility=VOLATILITY_HIGH,
+        impact_industries=("자동차부품", "기계제조", "금속가공", "조선"),
+        risk_multiplier=1.2
+    ),
+    "petrochemical_price_index": RawMaterialMeta(
+        category=CATEGORY_CHEMICALS,
+        volatility=VOLATILITY_HIGH,
+        impact_industries=("플라스틱제품", "화학제품", "자동차부품", "포장재"),
+        risk_multiplier=1.1
+    ),
+    "nonferrous_metal_price_index": RawMaterialMeta(
+        category=CATEGORY_METALS,
+        volatility=VOLATILITY_HIGH,
+        impact_industries=("전자부품", "전선케이블", "기계제조"),
+        risk_multiplier=1.3
+    ),
+    "oil_import_price": RawMaterialMeta(
+        category=CATEGORY_ENERGY,
+        volatility=VOLATILITY_EXTREME,
+        impact_industries=("플라스틱제품", "화학제품", "운송업", "제조업"),
+        risk_multiplier=1.5
+    ),
+    "textile_material_price_index": RawMaterialMeta(
+        category=CATEGORY_TEXTILES,
+        volatility=VOLATILITY_MEDIUM,
+        impact_industries=("섬유제조", "의류제조", "인테리어"),
+        risk_multiplier=0.8
+    ),
+    "agricultural_product_price_index": RawMaterialMeta(
+        category=CATEGORY_AGRICULTURE,
+        volatility=VOLATILITY_MEDIUM,
+        impact_industries=("식품제조", "사료제조", "화학제품"),
+        risk_multiplier=0.7
+    )
+}
+
 class ECOSRawMaterialsCollector:
     """ECOS API 기반 실제 원자재 데이터 수집기"""
     
@@ -28,62 +102,28 @@ class ECOSRawMaterialsCollector:
         os.environ['NEO4J_USER'] = 'neo4j'
         os.environ['NEO4J_PASSWORD'] = 'ehdgusdl11!'
         self.neo4j_manager = Neo4jManager()
+        self.industry_index_online = self._ensure_industry_index()
         
         # 원자재 지표 매핑 (업종별 영향도)
-        self.raw_material_mapping = {
-            "steel_price_index": {
-                "category": "METALS",
-                "volatility": "HIGH",
-                "impact_industries": ["자동차부품", "기계제조", "금속가공", "조선"],
-                "risk_multiplier": 1.2
-            },
-            "petrochemical_price_index": {
-                "category": "CHEMICALS", 
-                "volatility": "HIGH",
-                "impact_industries": ["플라스틱제품", "화학제품", "자동차부품", "포장재"],
-                "risk_multiplier": 1.1
-            },
-            "nonferrous_metal_price_index": {
-                "category": "METALS",
-                "volatility": "HIGH", 
-                "impact_industries": ["전자부품", "전선케이블", "기계제조"],
-                "risk_multiplier": 1.3
-            },
-            "oil_import_price": {
-                "category": "ENERGY",
-                "volatility": "EXTREME",
-                "impact_industries": ["플라스틱제품", "화학제품", "운송업", "제조업"],
-                "risk_multiplier": 1.5
-            },
-            "textile_material_price_index": {
-                "category": "TEXTILES",
-                "volatility": "MEDIUM",
-                "impact_industries": ["섬유제조", "의류제조", "인테리어"],
-                "risk_multiplier": 0.8
-            },
-            "agricultural_product_price_index": {
-                "category": "AGRICULTURE",
-                "volatility": "MEDIUM",
-                "impact_industries": ["식품제조", "사료제조", "화학제품"],
-                "risk_multiplier": 0.7
-            }
-        }
+        self.raw_material_mapping = RAW_MATERIAL_MAPPING
     
     def collect_and_store_real_raw_materials(self, days_back: int = 30) -> Dict[str, Any]:
         """ECOS API에서 실제 원자재 데이터 수집 및 Neo4j 저장"""
-        print(" ECOS API에서 실제 원자재 데이터 수집 시작...")
+        logger.info(" ECOS API에서 실제 원자재 데이터 수집 시작...")
         
         # 원자재 지표만 필터링
         raw_material_keys = list(self.raw_material_mapping.keys())
         
+        # 모든 지표가 동일한 수집 기간을 사용하도록 루프 전에 한 번만 계산
+        now = datetime.now()
+        end_date = now.strftime("%Y%m%d")
+        start_date = (now - timedelta(days=days_back)).strftime("%Y%m%d")
+        
         # ECOS에서 데이터 수집
         all_data = {}
         for indicator_key in raw_material_keys:
             if indicator_key in self.ecos_collector.indicators:
-                print(f" 수집 중: {self.ecos_collector.indicators[indicator_key]['name']}")
-                
-                end_date = datetime.now().strftime("%Y%m%d")
-                start_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y%m%d")
+                logger.info(" 수집 중: %s", self.ecos_collector.indicators[indicator_key]['name'])
                 
                 data = self.ecos_collector.get_indicator_data(indicator_key, start_date, end_date)
                 if data:
@@ -118,11 +158,11 @@ class ECOSRawMaterialsCollector:
             "collection_date": datetime.now().isoformat()
         }
         
-        print(f" ECOS 원자재 데이터 수집 완료: {stored_count}개 지표, {relationship_count}개 관계")
+        logger.info(" ECOS 원자재 데이터 수집 완료: %d개 지표, %d개 관계", stored_count, relationship_count)
         return result
     
     def _create_or_update_macro_indicator(self, latest_data: Dict[str, Any], 
-                                        mapping_info: Dict[str, Any]) -> bool:
+                                        mapping_info: RawMaterialMeta) -> bool:
         """MacroIndicator 노드 생성 또는 업데이트"""
         
         # 기존 노드 확인
@@ -156,10 +196,10 @@ class ECOSRawMaterialsCollector:
                 'indicator_name': latest_data['indicator_name'],
                 'value': latest_data['value'],
                 'change_rate': latest_data.get('change_rate', 0.0),
-                'volatility': mapping_info['volatility'],
-                'category': mapping_info['category'],
-                'risk_multiplier': mapping_info['risk_multiplier'],
-                'impact_industries': mapping_info['impact_industries'],
+                'volatility': mapping_info.volatility,
+                'category': mapping_info.category,
+                'risk_multiplier': mapping_info.risk_multiplier,
+                'impact_industries': list(mapping_info.impact_industries),
                 'collected_date': latest_data['collected_at']
             })
             
@@ -190,57 +230,82 @@ class ECOSRawMaterialsCollector:
                 'value': latest_data['value'],
                 'change_rate': latest_data.get('change_rate', 0.0),
                 'unit': latest_data['unit'],
-                'category': mapping_info['category'],
-                'volatility': mapping_info['volatility'],
-                'risk_multiplier': mapping_info['risk_multiplier'],
-                'impact_industries': mapping_info['impact_industries'],
+                'category': mapping_info.category,
+                'volatility': mapping_info.volatility,
+                'risk_multiplier': mapping_info.risk_multiplier,
+                'impact_industries': list(mapping_info.impact_industries),
                 'stat_code': latest_data['stat_code'],
                 'collected_date': latest_data['collected_at']
             })
             
             return len(result) > 0
     
+    def _ensure_industry_index(self) -> bool:
+        """UserCompany 업종 설명 풀텍스트 인덱스 생성 후 색인 완료까지 대기 (사용 가능하면 True)"""
+        # cjk 분석기는 한글을 bigram으로 색인하므로 구문 검색은 부분 문자열 매칭의 근사치
+        # (한 글자 용어처럼 bigram이 만들어지지 않는 경우 결과가 달라질 수 있음)
+        self.neo4j_manager.execute_query(f"""
+        CREATE FULLTEXT INDEX {INDUSTRY_FULLTEXT_INDEX} IF NOT EXISTS
+        FOR (u:UserCompany) ON EACH [u.industryDescription]
+        OPTIONS {{indexConfig: {{`fulltext.analyzer`: 'cjk'}}}}
+        """)
+        
+        # 새로 만든 인덱스는 백그라운드에서 채워지므로 조회 전에 ONLINE 상태가 될 때까지 대기
+        self.neo4j_manager.execute_query("CALL db.awaitIndex($index_name, $timeout)", {
+            'index_name': INDUSTRY_FULLTEXT_INDEX,
+            'timeout': _INDEX_AWAIT_TIMEOUT_SECONDS
+        })
+        result = self.neo4j_manager.execute_query(
+            "SHOW INDEXES YIELD name, state WHERE name = $index_name RETURN state",
+            {'index_name': INDUSTRY_FULLTEXT_INDEX}
+        )
+        online = bool(result) and result[0].get('state') == 'ONLINE'
+        if not online:
+            logger.warning(" 업종 풀텍스트 인덱스를 사용할 수 없어 CONTAINS 검색으로 대체합니다")
+        return online
+    
     def _create_raw_material_relationships(self, latest_data: Dict[str, Any], 
-                                         mapping_info: Dict[str, Any]) -> int:
+                                         mapping_info: RawMaterialMeta) -> int:
         """원자재와 기업 간 관계 생성"""
         
+        # 영향 업종 전체를 한 번의 쿼리로 처리하고, 업종별 기업은 풀텍스트 인덱스(준비 전이면 CONTAINS)로 조회
+        company_match = _FULLTEXT_COMPANY_MATCH if self.industry_index_online else _CONTAINS_COMPANY_MATCH
+        relationship_query = f"""
+        MATCH (m:MacroIndicator {{indicatorName: $indicator_name}})
+        UNWIND $industries AS industry
+        {company_match}
+        MERGE (u)-[r:IS_EXPOSED_TO]->(m)
+        SET r.exposureLevel = CASE 
+                WHEN m.volatility = 'EXTREME' THEN 'HIGH'
+                WHEN m.volatility = 'HIGH' THEN 'HIGH'  
+                WHEN m.volatility = 'MEDIUM' THEN 'MEDIUM'
+                ELSE 'LOW'
+            END,
+            r.rationale = industry + ' 업종의 주요 원자재 의존도',
+            r.riskType = 'RAW_MATERIALS',
+            r.industryImpact = industry,
+            r.riskMultiplier = $risk_multiplier,
+            r.lastUpdated = datetime()
+        RETURN industry, count(r) as created
+        """
+        
         total_relationships = 0
         
-        for industry in mapping_info['impact_industries']:
-            # 해당 업종의 모든 기업과 원자재 연결
-            relationship_query = """
-            MATCH (u:UserCompany), (m:MacroIndicator {indicatorName: $indicator_name})
-            WHERE u.industryDescription CONTAINS $industry
-            MERGE (u)-[r:IS_EXPOSED_TO]->(m)
-            SET r.exposureLevel = CASE 
-                    WHEN m.volatility = 'EXTREME' THEN 'HIGH'
-                    WHEN m.volatility = 'HIGH' THEN 'HIGH'  
-                    WHEN m.volatility = 'MEDIUM' THEN 'MEDIUM'
-                    ELSE 'LOW'
-                END,
-                r.rationale = $rationale,
-                r.riskType = 'RAW_MATERIALS',
-                r.industryImpact = $industry,
-                r.riskMultiplier = $risk_multiplier,
-                r.lastUpdated = datetime()
-            RETURN count(r) as created
-            """
+        try:
+            result = self.neo4j_manager.execute_query(relationship_query, {
+                'indicator_name': latest_data['indicator_name'],
+                'industries': list(mapping_info.impact_industries),
+                'index_name': INDUSTRY_FULLTEXT_INDEX,
+                'risk_multiplier': mapping_info.risk_multiplier
+            })
             
-            try:
-                result = self.neo4j_manager.execute_query(relationship_query, {
-                    'indicator_name': latest_data['indicator_name'],
-                    'industry': industry,
-                    'rationale': f'{industry} 업종의 주요 원자재 의존도',
-                    'risk_multiplier': mapping_info['risk_multiplier']
-                })
+            for row in result:
+                created = row.get('created', 0)
+                total_relationships += created
+                logger.info(" %s - %s: %d개 관계 생성", row['industry'], latest_data['indicator_name'], created)
                 
-                if result:
-                    created = result[0].get('created', 0)
-                    total_relationships += created
-                    print(f" {industry} - {latest_data['indicator_name']}: {created}개 관계 생성")
-                    
-            except Exception as e:
-                print(f" {industry} - {latest_data['indicator_name']} 관계 생성 실패: {e}")
+        except Exception as e:
+            logger.error(" %s 관계 생성 실패: %s", latest_data['indicator_name'], e)
         
         return total_relationships
     
@@ -267,7 +332,7 @@ class ECOSRawMaterialsCollector:
                     "current_value": latest['value'],
                     "change_rate": change_rate,
                     "unit": latest['unit'],
-                    "volatility": self.raw_material_mapping[indicator_key]['volatility']
+                    "volatility": self.raw_material_mapping[indicator_key].volatility
                 }
                 
                 summary["indicators"][indicator_key] = indicator_summary
@@ -281,7 +346,7 @@ class ECOSRawMaterialsCollector:
                     summary["price_changes"]["stable"].append(indicator_summary)
                 
                 # 고변동성 지표
-                if self.raw_material_mapping[indicator_key]['volatility'] in ['HIGH', 'EXTREME']:
+                if self.raw_material_mapping[indicator_key].volatility in HIGH_VOLATILITY_LEVELS:
                     summary["high_volatility"].append(indicator_summary)
         
         return summary
@@ -341,6 +406,7 @@ class ECOSRawMaterialsCollector:
 
 def main():
     """ECOS 원자재 데이터 수집 메인 실행"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("=== KB Fortress AI ECOS 원자재 데이터 수집기 ===")
     
     collector = ECOSRawMaterialsCollector()
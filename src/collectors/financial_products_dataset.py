@@ -1,10 +1,22 @@
-import json
 import pandas as pd
 from typing import List, Dict
-from dataclasses import dataclass, asdict
+from collections import Counter, defaultdict
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from functools import cached_property
 import os
+import csv
+import sys
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경에서는 pandas JSON 직렬화 사용
+    orjson = None
+
+# 고유값이 적은 문자열 컬럼 (category dtype 대상)
+CATEGORICAL_COLUMNS = ("provider", "category", "targetCustomer", "source")
+
+@dataclass(frozen=True, slots=True)
 class FinancialProduct:
     productName: str
     provider: str
@@ -18,12 +30,38 @@ class FinancialProduct:
     description: str = ""
     source: str = ""
 
+# 행 단위 필드값 추출기 (dataclass 필드 순서 그대로 튜플 반환)
+PRODUCT_FIELDS = tuple(field.name for field in fields(FinancialProduct))
+_product_row = attrgetter(*PRODUCT_FIELDS)
+
+# 저장 디렉터리 생성 여부 (프로세스당 한 번만 생성)
+_DATA_DIRS_READY = False
+
+def _ensure_data_dirs():
+    """저장 디렉터리를 한 번만 생성"""
+    global _DATA_DIRS_READY
+    if not _DATA_DIRS_READY:
+        os.makedirs("data/raw", exist_ok=True)
+        _DATA_DIRS_READY = True
+
 class FinancialProductsDataset:
     def __init__(self):
+        _ensure_data_dirs()
         self.products = []
         self._initialize_kb_products()
         self._initialize_policy_finance_products()
         self._initialize_guarantee_products()
+        self._build_indexes()
+    
+    def _build_indexes(self):
+        """카테고리/제공기관별 역색인 생성 (상품 목록은 초기화 이후 변경되지 않음)"""
+        self._by_category = defaultdict(list)
+        self._by_provider = defaultdict(list)
+        for product in self.products:
+            self._by_category[product.category].append(product)
+            self._by_provider[product.provider].append(product)
+        # 대상고객은 부분 문자열 매칭이므로 조회 결과를 캐시
+        self._by_target = {}
     
     def _initialize_kb_products(self):
         """KB국민은행 중소기업 대출상품 (공개 정보 기반)"""
@@ -190,54 +228,97 @@ class FinancialProductsDataset:
         return self.products
     
     def get_products_by_category(self, category: str) -> List[FinancialProduct]:
-        return [p for p in self.products if p.category == category]
+        return list(self._by_category.get(category, ()))
     
     def get_products_by_provider(self, provider: str) -> List[FinancialProduct]:
-        return [p for p in self.products if p.provider == provider]
+        return list(self._by_provider.get(provider, ()))
     
     def get_products_for_target(self, target_customer: str) -> List[FinancialProduct]:
-        return [p for p in self.products if target_customer in p.targetCustomer]
+        if target_customer not in self._by_target:
+            self._by_target[target_customer] = [
+                p for p in self.products if target_customer in p.targetCustomer
+            ]
+        return list(self._by_target[target_customer])
+    
+    @cached_property
+    def _df(self) -> pd.DataFrame:
+        """상품 목록을 필드값 튜플로 추출해 DataFrame 생성 (저장 메서드 간 공유)"""
+        rows = list(map(_product_row, self.products))
+        df = pd.DataFrame(rows, columns=PRODUCT_FIELDS)
+        # 반복되는 문자열 컬럼은 category dtype으로 변환 (메모리 절감, Parquet 사전 인코딩)
+        for col in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype('category')
+        return df
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """캐시된 상품 DataFrame 반환 (다른 데이터셋과 병합용)"""
+        return self._df
     
-    def save_to_csv(self, filename: str = "financial_products.csv"):
-        df = pd.DataFrame([asdict(product) for product in self.products])
+    def save_to_csv(self, filename: str = "financial_products.csv", engine: str = "csv"):
         filepath = f"data/raw/{filename}"
-        os.makedirs("data/raw", exist_ok=True)
-        df.to_csv(filepath, index=False, encoding='utf-8-sig')
+        if engine == 'pandas':
+            self._df.to_csv(filepath, index=False, encoding='utf-8-sig')
+        else:
+            # 소량 데이터는 DataFrame 없이 표준 csv 모듈로 바로 기록
+            with open(filepath, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(PRODUCT_FIELDS)
+                writer.writerows(map(_product_row, self.products))
         print(f"금융상품 데이터 저장 완료: {filepath}")
         return filepath
     
+    def save_to_parquet(self, filename: str = "financial_products.parquet"):
+        filepath = f"data/raw/{filename}"
+        self._df.to_parquet(filepath, engine='pyarrow', compression='zstd', index=False)
+        print(f"금융상품 Parquet 데이터 저장 완료: {filepath}")
+        return filepath
+    
     def save_to_json(self, filename: str = "financial_products.json"):
-        data = [asdict(product) for product in self.products]
         filepath = f"data/raw/{filename}"
-        os.makedirs("data/raw", exist_ok=True)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            # orjson은 dataclass를 직접 UTF-8 바이트로 직렬화
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(self.products, option=orjson.OPT_INDENT_2))
+        else:
+            self._df.to_json(filepath, orient='records', force_ascii=False, indent=2)
         print(f"금융상품 JSON 데이터 저장 완료: {filepath}")
         return filepath
     
-    def print_summary(self):
-        print(f"=== 금융상품 데이터셋 요약 ===")
-        print(f"총 상품 수: {len(self.products)}")
-        
-        print(f"\n=== 제공기관별 ===")
-        providers = {}
-        for product in self.products:
-            providers[product.provider] = providers.get(product.provider, 0) + 1
-        for provider, count in providers.items():
-            print(f"{provider}: {count}개")
-        
-        print(f"\n=== 카테고리별 ===")
-        categories = {}
-        for product in self.products:
-            categories[product.category] = categories.get(product.category, 0) + 1
-        for category, count in categories.items():
-            print(f"{category}: {count}개")
+    def save_to_ndjson(self, filename: str = "financial_products.ndjson"):
+        """한 줄에 상품 하나씩 기록 (스트리밍 소비자용 NDJSON)"""
+        filepath = f"data/raw/{filename}"
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.writelines(orjson.dumps(product) + b"\n" for product in self.products)
+        else:
+            self._df.to_json(filepath, orient='records', lines=True, force_ascii=False)
+        print(f"금융상품 NDJSON 데이터 저장 완료: {filepath}")
+        return filepath
+    
+    def print_summary(self) -> str:
+        """요약을 한 번에 출력하고 요약 문자열 반환"""
+        providers = Counter(product.provider for product in self.products)
+        categories = Counter(product.category for product in self.products)
         
-        print(f"\n=== 샘플 상품 ===")
+        lines = [
+            "=== 금융상품 데이터셋 요약 ===",
+            f"총 상품 수: {len(self.products)}",
+            "\n=== 제공기관별 ===",
+            *(f"{provider}: {count}개" for provider, count in providers.items()),
+            "\n=== 카테고리별 ===",
+            *(f"{category}: {count}개" for category, count in categories.items()),
+            "\n=== 샘플 상품 ===",
+        ]
         for i, product in enumerate(self.products[:3]):
-            print(f"{i+1}. {product.productName} ({product.provider})")
-            print(f"   대상: {product.targetCustomer}, 한도: {product.maxAmount}")
-            print(f"   금리: {product.interestRate}")
+            lines.append(
+                f"{i+1}. {product.productName} ({product.provider})\n"
+                f"   대상: {product.targetCustomer}, 한도: {product.maxAmount}\n"
+                f"   금리: {product.interestRate}"
+            )
+        
+        summary = "\n".join(lines) + "\n"
+        sys.stdout.write(summary)
+        return summary
 
 def main():
     print("KB Fortress AI - 금융상품 데이터셋 구성")
@@ -246,13 +327,17 @@ def main():
     dataset = FinancialProductsDataset()
     dataset.print_summary()
     
-    # 데이터 저장
-    csv_file = dataset.save_to_csv()
+    # 데이터 저장 (기본 Parquet, CSV는 --csv 옵션 지정 시에만)
+    parquet_file = dataset.save_to_parquet()
     json_file = dataset.save_to_json()
     
     print(f"\n데이터셋 구성 완료!")
-    print(f"CSV 파일: {csv_file}")
+    print(f"Parquet 파일: {parquet_file}")
     print(f"JSON 파일: {json_file}")
+    
+    if "--csv" in sys.argv:
+        csv_file = dataset.save_to_csv()
+        print(f"CSV 파일: {csv_file}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
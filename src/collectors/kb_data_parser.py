@@ -1,11 +1,167 @@
 import re
-import json
+import csv as csv_module
+import mmap
 import pandas as pd
 from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from functools import cached_property
+from collections import Counter
 import os
+import sys
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경에서는 pandas JSON 직렬화 사용
+    orjson = None
+
+# 실제 KB 상품명 패턴 (더 정확하게)
+_PRODUCT_NAMES = (
+    "지방자치단체협약중소기업자금대출",
+    "KB동반성장 팩토링",
+    "KB 수출기업 우대대출", 
+    "KB 소상공인 119plus",
+    "착한기업의 지속가능경영을 지원하는 착한대출",
+    "KB Green Wave_ESG 우수기업대출",
+    "KB 우수기술기업 TCB신용대출",
+    "KB 모아드림론",
+    "KB 태양광발전사업자우대대출",
+    "KB 동산ㆍ채권담보대출",
+    "KB커머셜모기지론",
+    "상업어음할인",
+    "KB 플러스론",
+    "KB구매론",
+    "KB 동반성장협약 상생대출",
+    "KB 사회적경제기업 우대대출",
+    "KB 미래성장기업 우대대출",
+    "KB 유망분야 성장기업 우대대출",
+    "KB 특화산업단지 입주기업대출",
+    "정책자금대출",
+    "KB 지식재산(IP) 협약보증부대출"
+)
+
+# 전체 상품명을 하나의 정규식으로 묶어 본문을 한 번만 스캔 (긴 이름 우선, 모듈 로드 시 한 번만 컴파일)
+# 파일을 mmap으로 바로 스캔하므로 UTF-8 바이트 패턴으로 컴파일
+_PRODUCT_NAME_PATTERN = re.compile(b'|'.join(
+    re.escape(name.encode('utf-8'))
+    for name in sorted(_PRODUCT_NAMES, key=lambda name: len(name.encode('utf-8')), reverse=True)
+))
+
+# 상품명 목록 순서대로의 UTF-8 바이트 키 (섹션 반환 순서 유지용)
+_PRODUCT_NAME_KEYS = tuple(name.encode('utf-8') for name in _PRODUCT_NAMES)
+
+# 필드 추출용 정규식 (모듈 로드 시 한 번만 컴파일)
+# 각 패턴은 (고정 키워드, 정규식) 쌍이며, 키워드가 없는 패턴은 None
+_TARGET_CUSTOMER_PATTERNS = [
+    (anchor, re.compile(pattern, re.IGNORECASE)) for anchor, pattern in (
+        ("가입대상", r"가입대상[:\s]*(.*?)(?:\n|※)"),
+        ("대출신청자격", r"대출신청자격[:\s]*(.*?)(?:\n|※)"),
+        ("개인사업자", r"개인사업자[&\s]*법인"),
+        ("중소기업", r"중소기업"), ("소상공인", r"소상공인"), ("수출기업", r"수출기업")
+    )
+]
+_CREDIT_GRADE_PATTERN = ("신용등급", re.compile(r"신용등급[:\s]*([A-Z]+[+-]?[^가-힣]*?)(?:\n|\s|이상)"))
+_LOAN_LIMIT_PATTERNS = [
+    (anchor, re.compile(pattern, re.MULTILINE | re.DOTALL)) for anchor, pattern in (
+        ("대출금액", r"대출금액[:\s]*(.*?)(?=대출기간|원리금|목록|$)"),
+        ("한도", r"한도[:\s]*(.*?)(?=대출기간|원리금|목록|$)"),
+        ("최대", r"최대[:\s]*(\d+억원?)"),
+        (None, r"(\d+억원?\s*이내)")
+    )
+]
+_LOAN_PERIOD_PATTERN = ("대출기간 및 상환 방법", re.compile(
+    r"대출기간 및 상환 방법[:\s]*(.*?)(?=대출신청시기|금리|목록|$)", re.MULTILINE | re.DOTALL
+))
+_INTEREST_RATE_PATTERNS = [
+    (anchor, re.compile(pattern, re.MULTILINE)) for anchor, pattern in (
+        ("기준금리", r"기준금리[:\s]*연\s*(\d+\.\d+%)"),
+        ("적용금리", r"적용금리[:\s]*연\s*([\d.~%\s]+)"),
+        ("대출금리", r"대출금리[:\s]*(.*?)(?=이자계산|원리금|$)")
+    )
+]
+
+# 모든 필드 키워드를 하나의 정규식으로 묶어 섹션당 한 번만 스캔
+# 전방탐색으로 감싸 겹치는 위치(예: "최대출금액")의 키워드도 빠짐없이 기록
+_FIELD_ANCHORS = {
+    anchor
+    for anchor, _ in (
+        *_TARGET_CUSTOMER_PATTERNS, _CREDIT_GRADE_PATTERN, *_LOAN_LIMIT_PATTERNS,
+        _LOAN_PERIOD_PATTERN, *_INTEREST_RATE_PATTERNS
+    )
+    if anchor
+}
+_FIELD_ANCHOR_PATTERN = re.compile('(?=(%s))' % '|'.join(
+    re.escape(anchor) for anchor in sorted(_FIELD_ANCHORS, key=len, reverse=True)
+))
+
+def _match_at_anchors(anchor: Optional[str], pattern: re.Pattern, text: str,
+                      anchors: Dict[str, List[int]]) -> Optional[re.Match]:
+    """키워드가 등장한 위치에서만 match 시도 (키워드가 없는 패턴만 전체 검색)"""
+    if anchor is None:
+        return pattern.search(text)
+    # 모든 패턴이 키워드로 시작하므로 앞에서부터 첫 성공이 search 결과와 같음
+    for pos in anchors.get(anchor, ()):
+        match = pattern.match(text, pos)
+        if match:
+            return match
+    return None
+
+# 담보 유형 키워드 (순서 = 판정 우선순위)
+_COLLATERAL_RULES = (
+    (("무담보", "신용대출"), "무담보"),
+    (("부동산", "근저당"), "부동산담보"),
+    (("동산", "재고"), "동산담보"),
+    (("보증서",), "보증서담보"),
+)
+
+# 특별 조건 키워드 (출력 순서 유지)
+_CONDITION_KEYWORDS = (
+    "수출실적", "ESG", "기술력", "태양광", "협약", "상생", 
+    "사회적경제", "지식재산", "IP", "특화산업단지"
+)
+
+# 상품 유형 분류 키워드 (상품명 기준 2개 + 본문 기준 1개)
+_FACILITY_NAME_KEYWORDS = ("시설", "모기지", "커머셜")
+_SPECIAL_NAME_KEYWORDS = ("팩토링", "할인", "IP")
+_WORKING_CAPITAL_KEYWORDS = ("운전자금", "운영자금")
+
+# 분류/담보/특별조건에 쓰이는 모든 키워드를 비트 하나씩에 대응
+_KEYWORD_BITS = {
+    keyword: 1 << bit
+    for bit, keyword in enumerate(dict.fromkeys((
+        *(keyword for keywords, _ in _COLLATERAL_RULES for keyword in keywords),
+        *_CONDITION_KEYWORDS, *_FACILITY_NAME_KEYWORDS,
+        *_SPECIAL_NAME_KEYWORDS, *_WORKING_CAPITAL_KEYWORDS
+    )))
+}
+# "부동산"이 매치되면 그 안의 "동산"은 따로 매치되지 않으므로 비트를 함께 세움
+_IMPLIED_BITS = {"부동산": _KEYWORD_BITS["부동산"] | _KEYWORD_BITS["동산"]}
+_KEYWORD_PATTERN = re.compile('|'.join(
+    re.escape(keyword) for keyword in sorted(_KEYWORD_BITS, key=len, reverse=True)
+))
+
+def _keyword_bits(keywords) -> int:
+    mask = 0
+    for keyword in keywords:
+        mask |= _KEYWORD_BITS[keyword]
+    return mask
+
+_COLLATERAL_MASKS = tuple((_keyword_bits(keywords), label) for keywords, label in _COLLATERAL_RULES)
+_FACILITY_NAME_MASK = _keyword_bits(_FACILITY_NAME_KEYWORDS)
+_SPECIAL_NAME_MASK = _keyword_bits(_SPECIAL_NAME_KEYWORDS)
+_WORKING_CAPITAL_MASK = _keyword_bits(_WORKING_CAPITAL_KEYWORDS)
+
+def _keyword_mask(text: str) -> int:
+    """텍스트를 한 번 스캔해 포함된 키워드의 비트마스크 생성"""
+    mask = 0
+    for keyword in set(_KEYWORD_PATTERN.findall(text)):
+        mask |= _IMPLIED_BITS.get(keyword, _KEYWORD_BITS[keyword])
+    return mask
+
+# 고유값이 적은 문자열 컬럼 (category dtype 대상)
+CATEGORICAL_COLUMNS = ("provider", "product_type", "collateral", "source")
+
+@dataclass(frozen=True, slots=True)
 class KBLoanProduct:
     product_name: str
     provider: str = "KB국민은행"
@@ -21,6 +177,10 @@ class KBLoanProduct:
     description: str = ""
     source: str = "KB국민은행 기업금융 실제 데이터"
 
+# 행 단위 필드값 추출기 (dataclass 필드 순서 그대로 튜플 반환)
+PRODUCT_FIELDS = tuple(field.name for field in fields(KBLoanProduct))
+_product_row = attrgetter(*PRODUCT_FIELDS)
+
 class KBDataParser:
     def __init__(self, file_path: str = "data/raw/financial_products_manual.md"):
         self.file_path = file_path
@@ -29,17 +189,23 @@ class KBDataParser:
     def parse_all_products(self) -> List[KBLoanProduct]:
         """전체 파일에서 모든 상품 정보 추출"""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 상품별로 텍스트 분할
-            product_sections = self._split_by_products(content)
+            # 파일 전체를 str로 읽지 않고 mmap 위에서 바로 상품명 스캔 (섹션 단위로만 디코딩)
+            with open(self.file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    product_sections = []
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                        # 상품별로 텍스트 분할
+                        product_sections = self._split_by_products(content)
             
             for section in product_sections:
                 product = self._parse_product(section)
                 if product:
                     self.products.append(product)
             
+            # 상품 목록이 바뀌었으므로 캐시된 DataFrame 무효화
+            self.__dict__.pop('_df', None)
+            
             print(f"총 {len(self.products)}개 KB 상품 파싱 완료")
             return self.products
             
@@ -47,56 +213,35 @@ class KBDataParser:
             print(f"파일 파싱 오류: {e}")
             return []
     
-    def _split_by_products(self, content: str) -> List[str]:
-        """상품명을 기준으로 텍스트 분할"""
-        # 실제 KB 상품명 패턴 (더 정확하게)
-        product_names = [
-            "지방자치단체협약중소기업자금대출",
-            "KB동반성장 팩토링",
-            "KB 수출기업 우대대출", 
-            "KB 소상공인 119plus",
-            "착한기업의 지속가능경영을 지원하는 착한대출",
-            "KB Green Wave_ESG 우수기업대출",
-            "KB 우수기술기업 TCB신용대출",
-            "KB 모아드림론",
-            "KB 태양광발전사업자우대대출",
-            "KB 동산ㆍ채권담보대출",
-            "KB커머셜모기지론",
-            "상업어음할인",
-            "KB 플러스론",
-            "KB구매론",
-            "KB 동반성장협약 상생대출",
-            "KB 사회적경제기업 우대대출",
-            "KB 미래성장기업 우대대출",
-            "KB 유망분야 성장기업 우대대출",
-            "KB 특화산업단지 입주기업대출",
-            "정책자금대출",
-            "KB 지식재산(IP) 협약보증부대출"
-        ]
+    def _split_by_products(self, content: bytes) -> List[str]:
+        """상품명을 기준으로 텍스트 분할 (UTF-8 바이트 버퍼 입력, 섹션은 str로 반환)"""
+        matches = list(_PRODUCT_NAME_PATTERN.finditer(content))
+        
+        # 각 매치의 섹션 끝 = 뒤에서 처음 등장하는 다른 상품명 위치 (역방향 1회 순회)
+        end_positions = [len(content)] * len(matches)
+        for i in range(len(matches) - 2, -1, -1):
+            if matches[i + 1].group(0) != matches[i].group(0):
+                end_positions[i] = matches[i + 1].start()
+            else:
+                end_positions[i] = end_positions[i + 1]
         
-        sections = []
+        sections_by_name = {}
         
-        # 각 상품명으로 텍스트 분할
-        for product_name in product_names:
-            # 상품명이 포함된 위치 찾기
-            start_idx = content.find(product_name)
-            if start_idx == -1:
+        for match, end_idx in zip(matches, end_positions):
+            product_name = match.group(0)
+            # 상품명이 처음 등장한 위치만 섹션 시작으로 사용
+            if product_name in sections_by_name:
                 continue
             
-            # 해당 상품 섹션의 끝 찾기 (다음 상품명까지)
-            end_idx = len(content)
-            for other_name in product_names:
-                if other_name != product_name:
-                    other_idx = content.find(other_name, start_idx + len(product_name))
-                    if other_idx != -1 and other_idx < end_idx:
-                        end_idx = other_idx
-            
             # 섹션 추출
-            section = content[start_idx:end_idx].strip()
-            if len(section) > 100:  # 충분한 길이의 섹션만
-                sections.append(section)
+            section = content[match.start():end_idx].decode('utf-8').strip()
+            sections_by_name[product_name] = section if len(section) > 100 else None  # 충분한 길이의 섹션만
         
-        return sections
+        # 상품 ID(kb_product_NNN)가 순번으로 매겨지므로 문서 순서가 아닌 상품명 목록 순서로 반환
+        return [
+            section for section in map(sections_by_name.get, _PRODUCT_NAME_KEYS)
+            if section is not None
+        ]
     
     def _parse_product(self, section: str) -> Optional[KBLoanProduct]:
         """개별 상품 섹션에서 정보 추출"""
@@ -106,172 +251,200 @@ class KBDataParser:
         lines = section.split('\n')
         product_name = lines[0].strip()
         
+        # 필드 키워드 위치를 한 번의 스캔으로 수집한 뒤 각 추출기에 전달
+        anchors = self._locate_field_anchors(section)
+        
+        # 분류/담보/특별조건 키워드 포함 여부를 비트마스크로 한 번에 계산
+        section_mask = _keyword_mask(section)
+        
         # 기본 정보 추출
         data = {
             'product_name': product_name,
-            'target_customer': self._extract_target_customer(section),
-            'credit_grade_min': self._extract_credit_grade(section),
-            'loan_limit': self._extract_loan_limit(section),
-            'loan_period': self._extract_loan_period(section),
-            'interest_rate': self._extract_interest_rate(section),
-            'collateral': self._extract_collateral(section),
-            'special_conditions': self._extract_special_conditions(section),
+            'target_customer': self._extract_target_customer(section, anchors),
+            'credit_grade_min': self._extract_credit_grade(section, anchors),
+            'loan_limit': self._extract_loan_limit(section, anchors),
+            'loan_period': self._extract_loan_period(section, anchors),
+            'interest_rate': self._extract_interest_rate(section, anchors),
+            'collateral': self._extract_collateral(section_mask),
+            'special_conditions': self._extract_special_conditions(section_mask),
             'description': section[:300]  # 처음 300자를 설명으로
         }
         
         # 상품 유형 분류
-        data['product_type'] = self._classify_product_type(product_name, section)
+        data['product_type'] = self._classify_product_type(_keyword_mask(product_name), section_mask)
         
         return KBLoanProduct(**data)
     
-    def _extract_target_customer(self, text: str) -> str:
+    def _locate_field_anchors(self, text: str) -> Dict[str, List[int]]:
+        """필드 키워드별 등장 위치 목록 (오름차순)"""
+        anchors = {}
+        for match in _FIELD_ANCHOR_PATTERN.finditer(text):
+            anchors.setdefault(match.group(1), []).append(match.start())
+        return anchors
+    
+    def _extract_target_customer(self, text: str, anchors: Dict[str, List[int]]) -> str:
         """대상고객 추출"""
-        patterns = [
-            r"가입대상[:\s]*(.*?)(?:\n|※)",
-            r"대출신청자격[:\s]*(.*?)(?:\n|※)",
-            r"개인사업자[&\s]*법인",
-            r"중소기업", r"소상공인", r"수출기업"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for anchor, pattern in _TARGET_CUSTOMER_PATTERNS:
+            match = _match_at_anchors(anchor, pattern, text, anchors)
             if match:
                 return match.group(1).strip() if match.groups() else match.group(0)
         return "중소기업"
     
-    def _extract_credit_grade(self, text: str) -> str:
+    def _extract_credit_grade(self, text: str, anchors: Dict[str, List[int]]) -> str:
         """신용등급 추출"""
-        pattern = r"신용등급[:\s]*([A-Z]+[+-]?[^가-힣]*?)(?:\n|\s|이상)"
-        match = re.search(pattern, text)
+        match = _match_at_anchors(*_CREDIT_GRADE_PATTERN, text, anchors)
         if match:
             return match.group(1).strip()
         return ""
     
-    def _extract_loan_limit(self, text: str) -> str:
+    def _extract_loan_limit(self, text: str, anchors: Dict[str, List[int]]) -> str:
         """대출한도 추출"""
-        patterns = [
-            r"대출금액[:\s]*(.*?)(?=대출기간|원리금|목록|$)",
-            r"한도[:\s]*(.*?)(?=대출기간|원리금|목록|$)",
-            r"최대[:\s]*(\d+억원?)",
-            r"(\d+억원?\s*이내)"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.MULTILINE | re.DOTALL)
+        for anchor, pattern in _LOAN_LIMIT_PATTERNS:
+            match = _match_at_anchors(anchor, pattern, text, anchors)
             if match:
                 limit_text = match.group(1).strip()
                 if limit_text and len(limit_text) < 200:
                     return limit_text
         return ""
     
-    def _extract_loan_period(self, text: str) -> str:
+    def _extract_loan_period(self, text: str, anchors: Dict[str, List[int]]) -> str:
         """대출기간 추출"""
-        pattern = r"대출기간 및 상환 방법[:\s]*(.*?)(?=대출신청시기|금리|목록|$)"
-        match = re.search(pattern, text, re.MULTILINE | re.DOTALL)
+        match = _match_at_anchors(*_LOAN_PERIOD_PATTERN, text, anchors)
         if match:
             period_text = match.group(1).strip()
             if len(period_text) < 300:
                 return period_text
         return ""
     
-    def _extract_interest_rate(self, text: str) -> str:
+    def _extract_interest_rate(self, text: str, anchors: Dict[str, List[int]]) -> str:
         """금리 정보 추출"""
-        patterns = [
-            r"기준금리[:\s]*연\s*(\d+\.\d+%)",
-            r"적용금리[:\s]*연\s*([\d.~%\s]+)",
-            r"대출금리[:\s]*(.*?)(?=이자계산|원리금|$)"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.MULTILINE)
+        for anchor, pattern in _INTEREST_RATE_PATTERNS:
+            match = _match_at_anchors(anchor, pattern, text, anchors)
             if match:
                 rate_info = match.group(1).strip()
                 if rate_info and len(rate_info) < 100:
                     return rate_info
         return ""
     
-    def _extract_collateral(self, text: str) -> str:
-        """담보 정보 추출"""
-        if "무담보" in text or "신용대출" in text:
-            return "무담보"
-        elif "부동산" in text or "근저당" in text:
-            return "부동산담보"
-        elif "동산" in text or "재고" in text:
-            return "동산담보"
-        elif "보증서" in text:
-            return "보증서담보"
+    def _extract_collateral(self, mask: int) -> str:
+        """담보 정보 추출 (섹션 키워드 비트마스크 기준)"""
+        for collateral_mask, label in _COLLATERAL_MASKS:
+            if mask & collateral_mask:
+                return label
         return ""
     
-    def _extract_special_conditions(self, text: str) -> str:
-        """특별 조건 추출"""
-        conditions = []
-        
-        condition_keywords = [
-            "수출실적", "ESG", "기술력", "태양광", "협약", "상생", 
-            "사회적경제", "지식재산", "IP", "특화산업단지"
-        ]
-        
-        for keyword in condition_keywords:
-            if keyword in text:
-                conditions.append(keyword)
-        
-        return ", ".join(conditions)
+    def _extract_special_conditions(self, mask: int) -> str:
+        """특별 조건 추출 (섹션 키워드 비트마스크 기준)"""
+        return ", ".join(
+            keyword for keyword in _CONDITION_KEYWORDS if mask & _KEYWORD_BITS[keyword]
+        )
     
-    def _classify_product_type(self, name: str, content: str) -> str:
-        """상품 유형 분류"""
-        if any(word in name for word in ["시설", "모기지", "커머셜"]):
+    def _classify_product_type(self, name_mask: int, content_mask: int) -> str:
+        """상품 유형 분류 (상품명/본문 키워드 비트마스크 기준)"""
+        if name_mask & _FACILITY_NAME_MASK:
             return "시설자금"
-        elif any(word in name for word in ["팩토링", "할인", "IP"]):
+        elif name_mask & _SPECIAL_NAME_MASK:
             return "특수금융"
-        elif any(word in content for word in ["운전자금", "운영자금"]):
+        elif content_mask & _WORKING_CAPITAL_MASK:
             return "운전자금"
         else:
             return "기타"
     
-    def save_to_files(self):
-        """CSV와 JSON으로 저장"""
+    @cached_property
+    def _df(self) -> pd.DataFrame:
+        """상품 목록을 필드값 튜플로 추출해 DataFrame 생성 (저장 메서드 간 공유)"""
+        rows = list(map(_product_row, self.products))
+        df = pd.DataFrame(rows, columns=PRODUCT_FIELDS)
+        # 반복되는 문자열 컬럼은 category dtype으로 변환 (메모리 절감, Parquet 사전 인코딩)
+        for col in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype('category')
+        return df
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """캐시된 상품 DataFrame 반환 (다른 데이터셋과 병합용)"""
+        return self._df
+    
+    def save_to_parquet(self, filename: str = "kb_actual_products.parquet"):
+        """Parquet(zstd 압축)으로 저장"""
+        filepath = f"data/raw/{filename}"
+        self._df.to_parquet(filepath, engine='pyarrow', compression='zstd', index=False)
+        print(f"Parquet 저장: {filepath}")
+        return filepath
+    
+    def save_to_ndjson(self, filename: str = "kb_actual_products.ndjson"):
+        """한 줄에 상품 하나씩 기록 (스트리밍 소비자용 NDJSON)"""
+        filepath = f"data/raw/{filename}"
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.writelines(orjson.dumps(product) + b"\n" for product in self.products)
+        else:
+            self._df.to_json(filepath, orient='records', lines=True, force_ascii=False)
+        print(f"NDJSON 저장: {filepath}")
+        return filepath
+    
+    def save_to_csv(self, filename: str = "kb_actual_products.csv", engine: str = "csv"):
+        """CSV로 저장 (engine='pandas' 지정 시 DataFrame 경유)"""
+        filepath = f"data/raw/{filename}"
+        if engine == 'pandas':
+            self._df.to_csv(filepath, index=False, encoding='utf-8-sig')
+        else:
+            # 소량 데이터는 DataFrame 없이 표준 csv 모듈로 바로 기록
+            with open(filepath, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv_module.writer(f)
+                writer.writerow(PRODUCT_FIELDS)
+                writer.writerows(map(_product_row, self.products))
+        print(f"CSV 저장: {filepath}")
+        return filepath
+    
+    def save_to_files(self, csv: bool = False):
+        """Parquet와 JSON으로 저장 (CSV는 요청 시에만)"""
         if not self.products:
             print("저장할 상품 데이터가 없습니다.")
             return
         
+        # Parquet 저장
+        self.save_to_parquet()
+        
         # CSV 저장
-        df = pd.DataFrame([asdict(product) for product in self.products])
-        csv_path = "data/raw/kb_actual_products.csv"
-        df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-        print(f"CSV 저장: {csv_path}")
+        if csv:
+            self.save_to_csv()
         
         # JSON 저장
         json_path = "data/raw/kb_actual_products.json"
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump([asdict(product) for product in self.products], 
-                     f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            # orjson은 dataclass를 직접 UTF-8 바이트로 직렬화
+            with open(json_path, 'wb') as f:
+                f.write(orjson.dumps(self.products, option=orjson.OPT_INDENT_2))
+        else:
+            self._df.to_json(json_path, orient='records', force_ascii=False, indent=2)
         print(f"JSON 저장: {json_path}")
     
-    def print_summary(self):
-        """파싱 결과 요약"""
+    def print_summary(self) -> str:
+        """파싱 결과 요약을 한 번에 출력하고 요약 문자열 반환"""
         if not self.products:
-            return
-            
-        print(f"\n=== KB 실제 상품 데이터 파싱 결과 ===")
-        print(f"총 상품 수: {len(self.products)}")
+            return ""
         
         # 상품 유형별 분류
-        type_count = {}
-        for product in self.products:
-            ptype = product.product_type
-            type_count[ptype] = type_count.get(ptype, 0) + 1
+        type_count = Counter(product.product_type for product in self.products)
         
-        print(f"\n=== 상품 유형별 분포 ===")
-        for ptype, count in type_count.items():
-            print(f"{ptype}: {count}개")
-        
-        print(f"\n=== 상품 목록 (처음 10개) ===")
+        lines = [
+            "\n=== KB 실제 상품 데이터 파싱 결과 ===",
+            f"총 상품 수: {len(self.products)}",
+            "\n=== 상품 유형별 분포 ===",
+            *(f"{ptype}: {count}개" for ptype, count in type_count.items()),
+            "\n=== 상품 목록 (처음 10개) ===",
+        ]
         for i, product in enumerate(self.products[:10], 1):
-            print(f"{i}. {product.product_name}")
-            print(f"   유형: {product.product_type}")
-            print(f"   대상: {product.target_customer}")
-            print(f"   한도: {product.loan_limit[:50]}...")
-            print()
+            lines.append(
+                f"{i}. {product.product_name}\n"
+                f"   유형: {product.product_type}\n"
+                f"   대상: {product.target_customer}\n"
+                f"   한도: {product.loan_limit[:50]}...\n"
+            )
+        
+        summary = "\n".join(lines) + "\n"
+        sys.stdout.write(summary)
+        return summary
 
 def main():
     print("KB 국민은행 실제 상품 데이터 파서")
@@ -282,7 +455,7 @@ def main():
     
     if products:
         parser.print_summary()
-        parser.save_to_files()
+        parser.save_to_files(csv="--csv" in sys.argv)
         print("\n파싱 완료! 이제 실제 KB 상품 데이터를 활용할 수 있습니다.")
     else:
         print("파싱된 상품이 없습니다.")
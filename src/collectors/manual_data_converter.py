@@ -1,10 +1,37 @@
 import re
-import json
+import sys
+import csv
 import pandas as pd
 from typing import List, Dict
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from functools import cached_property
 
-@dataclass 
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경에서는 pandas JSON 직렬화 사용
+    orjson = None
+
+# 상품 섹션 구분 및 필드 추출용 정규식 (모듈 로드 시 한 번만 컴파일)
+_SECTION_SPLIT_PATTERN = re.compile(r'### 상품명:')
+_FIELD_PATTERNS = {
+    field: re.compile(rf'{label}[:\s]*(.+?)(?:\n|$)', re.IGNORECASE | re.MULTILINE)
+    for field, label in (
+        ('maxAmount', '대출한도'),
+        ('interestRate', '금리'),
+        ('targetCustomer', '대상고객'),
+        ('conditions', '자격요건'),
+        ('category', '용도'),
+        ('description', '상환방법'),
+        ('collateral', '담보'),
+        ('guarantee', '보증'),
+    )
+}
+
+# 고유값이 적은 문자열 컬럼 (category dtype 대상)
+CATEGORICAL_COLUMNS = ("provider", "category", "targetCustomer", "source")
+
+@dataclass(frozen=True, slots=True)
 class FinancialProduct:
     productName: str
     provider: str = "KB국민은행"
@@ -18,6 +45,10 @@ class FinancialProduct:
     description: str = ""
     source: str = "KB국민은행 기업금융"
 
+# 행 단위 필드값 추출기 (dataclass 필드 순서 그대로 튜플 반환)
+PRODUCT_FIELDS = tuple(field.name for field in fields(FinancialProduct))
+_product_row = attrgetter(*PRODUCT_FIELDS)
+
 class ManualDataConverter:
     def __init__(self, markdown_file: str = "data/raw/financial_products_manual.md"):
         self.markdown_file = markdown_file
@@ -30,13 +61,16 @@ class ManualDataConverter:
                 content = f.read()
             
             # ### 상품명 패턴으로 각 상품 구분
-            product_sections = re.split(r'### 상품명:', content)[1:]  # 첫 번째는 헤더이므로 제외
+            product_sections = _SECTION_SPLIT_PATTERN.split(content)[1:]  # 첫 번째는 헤더이므로 제외
             
             for section in product_sections:
                 product = self._parse_product_section(section)
                 if product:
                     self.products.append(product)
                     
+            # 상품 목록이 바뀌었으므로 캐시된 DataFrame 무효화
+            self.__dict__.pop('_df', None)
+            
             print(f"총 {len(self.products)}개 상품 파싱 완료")
             return self.products
             
@@ -56,71 +90,126 @@ class ManualDataConverter:
         # 각 필드 추출
         data = {
             'productName': product_name,
-            'maxAmount': self._extract_field(section, r'대출한도[:\s]*(.+?)(?:\n|$)'),
-            'interestRate': self._extract_field(section, r'금리[:\s]*(.+?)(?:\n|$)'),
-            'targetCustomer': self._extract_field(section, r'대상고객[:\s]*(.+?)(?:\n|$)'),
-            'conditions': self._extract_field(section, r'자격요건[:\s]*(.+?)(?:\n|$)'),
-            'category': self._extract_field(section, r'용도[:\s]*(.+?)(?:\n|$)'),
-            'description': self._extract_field(section, r'상환방법[:\s]*(.+?)(?:\n|$)'),
+            'maxAmount': self._extract_field(section, _FIELD_PATTERNS['maxAmount']),
+            'interestRate': self._extract_field(section, _FIELD_PATTERNS['interestRate']),
+            'targetCustomer': self._extract_field(section, _FIELD_PATTERNS['targetCustomer']),
+            'conditions': self._extract_field(section, _FIELD_PATTERNS['conditions']),
+            'category': self._extract_field(section, _FIELD_PATTERNS['category']),
+            'description': self._extract_field(section, _FIELD_PATTERNS['description']),
         }
         
         # 담보 여부 확인
-        collateral_text = self._extract_field(section, r'담보[:\s]*(.+?)(?:\n|$)')
+        collateral_text = self._extract_field(section, _FIELD_PATTERNS['collateral'])
         data['collateralRequired'] = '무담보' not in collateral_text if collateral_text else False
         
         # 보증 가능 여부 확인  
-        guarantee_text = self._extract_field(section, r'보증[:\s]*(.+?)(?:\n|$)')
+        guarantee_text = self._extract_field(section, _FIELD_PATTERNS['guarantee'])
         data['guaranteeAvailable'] = '가능' in guarantee_text if guarantee_text else False
         
         return FinancialProduct(**data)
     
-    def _extract_field(self, text: str, pattern: str) -> str:
-        """정규식으로 필드 값 추출"""
-        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+    def _extract_field(self, text: str, pattern: re.Pattern) -> str:
+        """컴파일된 정규식으로 필드 값 추출"""
+        match = pattern.search(text)
         if match:
             return match.group(1).strip().replace('**', '').replace('*', '')
         return ""
     
-    def save_to_csv(self, filename: str = "kb_products_manual.csv"):
-        """CSV로 저장"""
+    @cached_property
+    def _df(self) -> pd.DataFrame:
+        """상품 목록을 필드값 튜플로 추출해 DataFrame 생성 (저장 메서드 간 공유)"""
+        rows = list(map(_product_row, self.products))
+        df = pd.DataFrame(rows, columns=PRODUCT_FIELDS)
+        # 반복되는 문자열 컬럼은 category dtype으로 변환 (메모리 절감, Parquet 사전 인코딩)
+        for col in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype('category')
+        return df
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """캐시된 상품 DataFrame 반환 (다른 데이터셋과 병합용)"""
+        return self._df
+    
+    def save_to_csv(self, filename: str = "kb_products_manual.csv", engine: str = "csv"):
+        """CSV로 저장 (engine='pandas' 지정 시 DataFrame 경유)"""
         if not self.products:
             print("저장할 상품 데이터가 없습니다.")
             return
             
-        df = pd.DataFrame([asdict(product) for product in self.products])
         filepath = f"data/raw/{filename}"
-        df.to_csv(filepath, index=False, encoding='utf-8-sig')
+        if engine == 'pandas':
+            self._df.to_csv(filepath, index=False, encoding='utf-8-sig')
+        else:
+            # 소량 데이터는 DataFrame 없이 표준 csv 모듈로 바로 기록
+            with open(filepath, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(PRODUCT_FIELDS)
+                writer.writerows(map(_product_row, self.products))
         print(f"수동 입력 상품 데이터 저장: {filepath}")
         return filepath
     
+    def save_to_parquet(self, filename: str = "kb_products_manual.parquet"):
+        """Parquet(zstd 압축)으로 저장"""
+        if not self.products:
+            print("저장할 상품 데이터가 없습니다.")
+            return
+            
+        filepath = f"data/raw/{filename}"
+        self._df.to_parquet(filepath, engine='pyarrow', compression='zstd', index=False)
+        print(f"수동 입력 상품 Parquet 저장: {filepath}")
+        return filepath
+    
     def save_to_json(self, filename: str = "kb_products_manual.json"):
         """JSON으로 저장"""
         if not self.products:
             print("저장할 상품 데이터가 없습니다.")
             return
             
-        data = [asdict(product) for product in self.products]
         filepath = f"data/raw/{filename}"
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            # orjson은 dataclass를 직접 UTF-8 바이트로 직렬화
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(self.products, option=orjson.OPT_INDENT_2))
+        else:
+            self._df.to_json(filepath, orient='records', force_ascii=False, indent=2)
         print(f"JSON 데이터 저장: {filepath}")
         return filepath
     
-    def print_summary(self):
-        """데이터 요약 출력"""
+    def save_to_ndjson(self, filename: str = "kb_products_manual.ndjson"):
+        """한 줄에 상품 하나씩 기록 (스트리밍 소비자용 NDJSON)"""
         if not self.products:
-            print("파싱된 상품이 없습니다.")
+            print("저장할 상품 데이터가 없습니다.")
             return
             
-        print(f"\n=== 수동 입력 상품 데이터 요약 ===")
-        print(f"총 상품 수: {len(self.products)}")
+        filepath = f"data/raw/{filename}"
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.writelines(orjson.dumps(product) + b"\n" for product in self.products)
+        else:
+            self._df.to_json(filepath, orient='records', lines=True, force_ascii=False)
+        print(f"NDJSON 데이터 저장: {filepath}")
+        return filepath
+    
+    def print_summary(self) -> str:
+        """데이터 요약을 한 번에 출력하고 요약 문자열 반환"""
+        if not self.products:
+            print("파싱된 상품이 없습니다.")
+            return ""
         
-        print(f"\n=== 상품 목록 ===")
+        lines = [
+            "\n=== 수동 입력 상품 데이터 요약 ===",
+            f"총 상품 수: {len(self.products)}",
+            "\n=== 상품 목록 ===",
+        ]
         for i, product in enumerate(self.products, 1):
-            print(f"{i}. {product.productName}")
-            print(f"   대상: {product.targetCustomer}, 한도: {product.maxAmount}")
-            print(f"   금리: {product.interestRate}")
-            print()
+            lines.append(
+                f"{i}. {product.productName}\n"
+                f"   대상: {product.targetCustomer}, 한도: {product.maxAmount}\n"
+                f"   금리: {product.interestRate}\n"
+            )
+        
+        summary = "\n".join(lines) + "\n"
+        sys.stdout.write(summary)
+        return summary
 
 def main():
     print("수동 입력 상품 데이터 변환기")
@@ -131,8 +220,10 @@ def main():
     
     if products:
         converter.print_summary()
-        converter.save_to_csv()
+        converter.save_to_parquet()
         converter.save_to_json()
+        if "--csv" in sys.argv:
+            converter.save_to_csv()
     else:
         print("마크다운 파일에 상품 정보를 입력한 후 다시 실행해주세요.")
         print("파일 위치: data/raw/financial_products_manual.md")
@@ -3,12 +3,166 @@
 BigKinds 뉴스 엑셀 파일들을 분석하여 LLM이 처리할 수 있는 형태로 가공
 """
 
-import pandas as pd
+import openpyxl
 import os
 import json
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
 import re
+import sys
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경에서는 표준 json 모듈 사용
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard 미설치 환경에서는 압축 없이 저장
+    zstandard = None
+
+# BigKinds 엑셀 컬럼 → 뉴스 필드명 (뉴스 식별자를 제외한 필드는 문자열로 변환, 빈 셀은 빈 문자열)
+_NEWS_COLUMNS = {
+    "뉴스 식별자": "news_id",
+    "일자": "date",
+    "제목": "title",
+    "언론사": "media",
+    "기고자": "author",
+    "본문": "content",
+    "키워드": "keywords",
+    "URL": "url"
+}
+
+# 카테고리별 분류 키워드 (순서 = 분류 우선순위)
+_CATEGORY_KEYWORDS = {
+    "manufacturing": ("제조업", "공장", "생산", "자동차", "부품"),
+    "financial": ("금리", "환율", "한국은행", "대출"),
+    "policy": ("정책자금", "중소기업지원", "금융지원", "보증"),
+    "macro_economic": ("경기전망", "bsi", "경제상황", "수출실적"),
+}
+_CATEGORIES = tuple(_CATEGORY_KEYWORDS)
+# 키워드 → 카테고리 우선순위
+_KEYWORD_RANKS = {
+    keyword: rank
+    for rank, keywords in enumerate(_CATEGORY_KEYWORDS.values())
+    for keyword in keywords
+}
+# 전체 키워드를 하나의 정규식으로 묶어 뉴스당 한 번만 스캔
+# 전방탐색으로 감싸 겹치는 위치(예: "정책자금리")의 키워드도 빠짐없이 찾음
+_CATEGORY_KEYWORD_PATTERN = re.compile('(?=(%s))' % '|'.join(
+    re.escape(keyword) for keyword in sorted(_KEYWORD_RANKS, key=len, reverse=True)
+))
+
+def _match_category(text: str, full_ranks: frozenset = frozenset()) -> Optional[str]:
+    """텍스트에 등장한 키워드 중 우선순위가 가장 높은 카테고리 (가득 찬 카테고리는 건너뜀, 없으면 None)"""
+    open_ranks = [rank for rank in range(len(_CATEGORIES)) if rank not in full_ranks]
+    if not open_ranks:
+        return None
+    
+    best_rank = len(_CATEGORIES)
+    for match in _CATEGORY_KEYWORD_PATTERN.finditer(text):
+        rank = _KEYWORD_RANKS[match.group(1)]
+        if rank < best_rank and rank not in full_ranks:
+            best_rank = rank
+            if best_rank == open_ranks[0]:  # 남은 카테고리 중 최우선이면 더 볼 필요 없음
+                break
+    return _CATEGORIES[best_rank] if best_rank < len(_CATEGORIES) else None
+
+# 이 개수를 넘는 뉴스만 프로세스 풀로 엔터티를 추출 (적은 양은 풀 생성 비용이 더 큼)
+_PARALLEL_ENTITY_THRESHOLD = 50
+
+# 금융 엔터티 추출용 정규식 (그룹명 = 엔터티 종류, 앞쪽 그룹 우선)
+_ENTITY_PATTERN = re.compile(
+    r"(?P<company_suffix>[가-힣]{2,}(?:주식회사|㈜|기업|그룹|산업|정밀|제조))"
+    r"|(?P<bank>KB국민은행|신한은행|우리은행)"
+    r"|(?P<chaebol>삼성|현대|LG|포스코|SK)"
+    r"|(?P<indicator>기준금리|금리|환율|원달러|원/달러|USD/KRW)"
+    r"|(?P<pct>\d+\.?\d*%)"
+    r"|(?P<amount>\d+(?:조|억|만)원?)"
+)
+# 그룹별로 값을 담을 엔터티 목록 (퍼센트는 지표와 금액 양쪽에 기록)
+_ENTITY_BUCKETS = {
+    "company_suffix": ("companies",),
+    "bank": ("companies",),
+    "chaebol": ("companies",),
+    "indicator": ("financial_indicators",),
+    "pct": ("financial_indicators", "amounts"),
+    "amount": ("amounts",),
+}
+
+def _load_news_file(path_and_name: Tuple[str, str]) -> Tuple[str, List[Dict[str, Any]], str]:
+    """엑셀 파일 하나를 뉴스 dict 목록으로 변환 (프로세스 풀 작업 단위, 오류는 메시지로 반환)"""
+    filepath, filename = path_and_name
+    try:
+        # DataFrame 없이 읽기 전용 모드로 행 튜플을 순서대로 스트리밍
+        workbook = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, ())
+            # 필드별 열 위치 (시트에 없는 컬럼은 None → 빈 문자열)
+            positions = [
+                (field, header.index(column) if column in header else None)
+                for column, field in _NEWS_COLUMNS.items()
+            ]
+            
+            news_items = []
+            for row in rows:
+                if not any(row):  # 서식만 남은 빈 행 제외
+                    continue
+                news_item = {}
+                for field, idx in positions:
+                    value = row[idx] if idx is not None and idx < len(row) else None
+                    if value is None:
+                        value = ""
+                    elif field != "news_id":
+                        value = str(value)
+                    news_item[field] = value
+                news_item["source_file"] = filename
+                news_items.append(news_item)
+        finally:
+            workbook.close()
+        return filename, news_items, ""
+    except Exception as e:
+        return filename, [], str(e)
+
+def _extract_financial_entities(news_item: Dict) -> Dict[str, Any]:
+    """뉴스에서 금융 엔터티 추출 (프로세스 풀 작업 단위)"""
+    title = news_item["title"]
+    content = news_item["content"]
+    combined_text = f"{title} {content}"
+    
+    entities = {
+        "companies": [],
+        "financial_indicators": [],
+        "policies": [],
+        "amounts": []
+    }
+    
+    # 기업명/금융지표/금액 패턴을 한 번의 스캔으로 추출하고, 매칭된 그룹에 따라 분배
+    for match in _ENTITY_PATTERN.finditer(combined_text):
+        value = match.group()
+        for bucket in _ENTITY_BUCKETS[match.lastgroup]:
+            entities[bucket].append(value)
+    
+    return entities
+
+def _dump_json(data: Any, filepath: str, compress: bool = False) -> str:
+    """JSON 저장 (compress=True면 zstd 압축해 .zst 파일로 저장) 후 실제 경로 반환"""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    
+    if compress and zstandard is not None:
+        filepath += ".zst"
+        payload = zstandard.ZstdCompressor(level=3).compress(payload)
+    elif compress:
+        print(" zstandard 미설치: 압축 없이 저장합니다")
+    
+    with open(filepath, 'wb') as f:
+        f.write(payload)
+    return filepath
 
 class NewsProcessor:
     """뉴스 데이터 처리 클래스"""
@@ -41,31 +195,23 @@ class NewsProcessor:
         
         all_news = []
         
-        for filename in news_files:
-            filepath = os.path.join(self.data_dir, filename)
-            
-            if os.path.exists(filepath):
-                try:
-                    df = pd.read_excel(filepath)
-                    
-                    for _, row in df.iterrows():
-                        news_item = {
-                            "news_id": row.get("뉴스 식별자", ""),
-                            "date": str(row.get("일자", "")),
-                            "title": str(row.get("제목", "")),
-                            "media": str(row.get("언론사", "")),
-                            "author": str(row.get("기고자", "")),
-                            "content": str(row.get("본문", "")),
-                            "keywords": str(row.get("키워드", "")),
-                            "url": str(row.get("URL", "")),
-                            "source_file": filename
-                        }
-                        all_news.append(news_item)
-                        
-                    print(f" 로드 완료: {filename} ({len(df)}개 뉴스)")
-                    
-                except Exception as e:
-                    print(f" 파일 로드 오류 {filename}: {e}")
+        paths = [
+            (os.path.join(self.data_dir, filename), filename)
+            for filename in news_files
+            if os.path.exists(os.path.join(self.data_dir, filename))
+        ]
+        if not paths:
+            print("\n 전체 뉴스 수집: 0개")
+            return all_news
+        
+        # 엑셀 파싱은 CPU 작업이고 파일 간 독립적이므로 프로세스별로 병렬 로드 (결과는 파일 순서 유지)
+        with ProcessPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as executor:
+            for filename, news_items, error in executor.map(_load_news_file, paths):
+                if error:
+                    print(f" 파일 로드 오류 {filename}: {error}")
+                    continue
+                all_news.extend(news_items)
+                print(f" 로드 완료: {filename} ({len(news_items)}개 뉴스)")
         
         print(f"\n 전체 뉴스 수집: {len(all_news)}개")
         return all_news
@@ -80,88 +226,35 @@ class NewsProcessor:
             "macro_economic": []
         }
         
+        # 이미 max_per_category를 채운 카테고리 순위
+        full_ranks = frozenset(range(len(_CATEGORIES))) if max_per_category <= 0 else frozenset()
+        
         for news in news_list:
-            title = news["title"].lower()
-            content = news["content"].lower()
-            keywords = news["keywords"].lower()
-            
-            combined_text = f"{title} {content} {keywords}"
-            
-            # 제조업 관련 뉴스
-            if any(keyword in combined_text for keyword in ["제조업", "공장", "생산", "자동차", "부품"]):
-                if len(categorized_news["manufacturing"]) < max_per_category:
-                    news["category"] = "manufacturing"
-                    categorized_news["manufacturing"].append(news)
+            if len(full_ranks) == len(_CATEGORIES):  # 모든 카테고리가 가득 차면 나머지 뉴스는 볼 필요 없음
+                break
             
-            # 금융 관련 뉴스
-            elif any(keyword in combined_text for keyword in ["금리", "환율", "한국은행", "대출"]):
-                if len(categorized_news["financial"]) < max_per_category:
-                    news["category"] = "financial"
-                    categorized_news["financial"].append(news)
+            # 한 번 이어 붙인 뒤 한 번만 소문자 변환하고, 재호출에 대비해 뉴스에 캐시
+            combined_text = news.get("_combined_lower")
+            if combined_text is None:
+                combined_text = f"{news['title']} {news['content']} {news['keywords']}".lower()
+                news["_combined_lower"] = combined_text
             
-            # 정책 관련 뉴스
-            elif any(keyword in combined_text for keyword in ["정책자금", "중소기업지원", "금융지원", "보증"]):
-                if len(categorized_news["policy"]) < max_per_category:
-                    news["category"] = "policy"
-                    categorized_news["policy"].append(news)
-            
-            # 거시경제 관련 뉴스
-            elif any(keyword in combined_text for keyword in ["경기전망", "bsi", "경제상황", "수출실적"]):
-                if len(categorized_news["macro_economic"]) < max_per_category:
-                    news["category"] = "macro_economic"
-                    categorized_news["macro_economic"].append(news)
+            # 제조업 → 금융 → 정책 → 거시경제 순으로, 아직 자리가 남은 카테고리 중 처음 매칭된 곳에 분류
+            category = _match_category(combined_text, full_ranks)
+            if category is not None:
+                news["category"] = category
+                categorized_news[category].append(news)
+                if len(categorized_news[category]) >= max_per_category:
+                    full_ranks = full_ranks | {_CATEGORIES.index(category)}
         
         return categorized_news
     
     def extract_financial_entities(self, news_item: Dict) -> Dict[str, Any]:
         """뉴스에서 금융 엔터티 추출"""
-        title = news_item["title"]
-        content = news_item["content"]
-        combined_text = f"{title} {content}"
-        
-        entities = {
-            "companies": [],
-            "financial_indicators": [],
-            "policies": [],
-            "amounts": []
-        }
-        
-        # 기업명 추출 (간단한 패턴 매칭)
-        company_patterns = [
-            r"([가-힣]{2,}(?:(?:주식회사|㈜|기업|그룹|산업|정밀|제조)))",
-            r"(KB국민은행|신한은행|우리은행)",
-            r"(삼성|현대|LG|포스코|SK)"
-        ]
-        
-        for pattern in company_patterns:
-            matches = re.findall(pattern, combined_text)
-            entities["companies"].extend(matches)
-        
-        # 금융지표 추출
-        indicator_patterns = [
-            r"(기준금리|금리|환율|원달러)",
-            r"(\d+\.?\d*%)",
-            r"(원/달러|USD/KRW)"
-        ]
-        
-        for pattern in indicator_patterns:
-            matches = re.findall(pattern, combined_text)
-            entities["financial_indicators"].extend(matches)
-        
-        # 금액 추출
-        amount_patterns = [
-            r"(\d+(?:조|억|만)원?)",
-            r"(\d+\.?\d*%)"
-        ]
-        
-        for pattern in amount_patterns:
-            matches = re.findall(pattern, combined_text)
-            entities["amounts"].extend(matches)
-        
-        return entities
+        return _extract_financial_entities(news_item)
     
-    def process_and_save(self, output_dir: str = "data/processed") -> Dict[str, str]:
-        """뉴스 데이터 처리 및 저장"""
+    def process_and_save(self, output_dir: str = "data/processed", compress: bool = False) -> Dict[str, str]:
+        """뉴스 데이터 처리 및 저장 (compress=True면 zstd 압축 .json.zst로 저장)"""
         os.makedirs(output_dir, exist_ok=True)
         
         # 1. 모든 뉴스 로드
@@ -170,26 +263,34 @@ class NewsProcessor:
         # 2. 관련 뉴스 필터링
         categorized_news = self.filter_relevant_news(all_news, max_per_category=20)
         
-        # 3. 카테고리별 저장
+        # 3. 엔터티 추출 (분류용 캐시 텍스트는 저장 대상에서 제외)
+        selected_news = [news for news_list in categorized_news.values() for news in news_list]
+        for news in selected_news:
+            news.pop("_combined_lower", None)
+        
+        if len(selected_news) > _PARALLEL_ENTITY_THRESHOLD:
+            # 뉴스 간 공유 상태가 없는 순수 CPU 작업이므로 프로세스별로 나눠 추출
+            with ProcessPoolExecutor() as executor:
+                entities_list = list(executor.map(_extract_financial_entities, selected_news, chunksize=8))
+        else:
+            entities_list = [self.extract_financial_entities(news) for news in selected_news]
+        
+        for news, entities in zip(selected_news, entities_list):
+            news["extracted_entities"] = entities
+        
+        # 4. 카테고리별 저장
         saved_files = {}
         
         for category, news_list in categorized_news.items():
             if news_list:
-                # 엔터티 추출 추가
-                for news in news_list:
-                    news["extracted_entities"] = self.extract_financial_entities(news)
-                
                 # JSON 파일로 저장
                 filename = f"news_{category}_{datetime.now().strftime('%Y%m%d')}.json"
-                filepath = os.path.join(output_dir, filename)
-                
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(news_list, f, ensure_ascii=False, indent=2)
+                filepath = _dump_json(news_list, os.path.join(output_dir, filename), compress)
                 
                 saved_files[category] = filepath
                 print(f" {category}: {len(news_list)}개 뉴스 저장 → {filepath}")
         
-        # 4. 전체 요약 정보 저장
+        # 5. 전체 요약 정보 저장
         summary = {
             "processing_date": datetime.now().isoformat(),
             "total_news_processed": len(all_news),
@@ -198,8 +299,7 @@ class NewsProcessor:
         }
         
         summary_file = os.path.join(output_dir, f"news_processing_summary_{datetime.now().strftime('%Y%m%d')}.json")
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, ensure_ascii=False, indent=2)
+        _dump_json(summary, summary_file, compress)
         
         print(f"\n 처리 요약:")
         print(f"전체 뉴스: {summary['total_news_processed']}개")
@@ -213,7 +313,7 @@ def main():
     print("=== 뉴스 데이터 처리 시작 ===")
     
     processor = NewsProcessor()
-    saved_files = processor.process_and_save()
+    saved_files = processor.process_and_save(compress="--zstd" in sys.argv)
     
     print(f"\n 뉴스 데이터 처리 완료!")
     print("저장된 파일들:")
@@ -4,11 +4,138 @@
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
+import re
 from datetime import datetime
 from typing import List, Dict, Any
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경에서는 표준 json 모듈 사용
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson 미설치 환경에서는 응답 전체를 한 번에 파싱
+    ijson = None
+
+# 보조금24 서비스 중 중소기업 대상 판별용 정규식 (소상공인 대상은 제외)
+_SME_PATTERN = re.compile("중소기업|창업|벤처|기업|사업자|제조|공장|스타트업")
+_SME_EXCLUDE_PATTERN = re.compile("소상공인")
+
+# 실제 제조업 관련 주요 정책들 (수집 시각만 수집할 때마다 기록)
+_MANUFACTURING_POLICIES = (
+    {
+        "policy_id": "mfg_001",
+        "policy_name": "스마트 제조혁신 추진사업",
+        "issuing_org": "산업통상자원부",
+        "support_field": "제조업 디지털 전환",
+        "eligibility_text": "제조업 중소기업, 연매출 1,000억원 미만",
+        "support_amount": "최대 20억원",
+        "support_type": "정책자금",
+        "target_business": "제조업 중소기업",
+        "category": "digital_transformation",
+        "application_period": "연중 상시",
+        "source": "정책 데이터베이스"
+    },
+    {
+        "policy_id": "mfg_002", 
+        "policy_name": "중소기업 기술혁신개발사업",
+        "issuing_org": "중소벤처기업부",
+        "support_field": "기술개발 및 사업화",
+        "eligibility_text": "기술혁신형 중소기업",
+        "support_amount": "최대 15억원",
+        "support_type": "R&D 지원",
+        "target_business": "중소기업",
+        "category": "technology_innovation",
+        "application_period": "2025년 1-3월",
+        "source": "정책 데이터베이스"
+    },
+    {
+        "policy_id": "mfg_003",
+        "policy_name": "자동차부품산업 경쟁력강화사업",
+        "issuing_org": "산업통상자원부",
+        "support_field": "자동차부품 기술개발",
+        "eligibility_text": "자동차부품 제조업체, 매출액 500억원 미만",
+        "support_amount": "최대 30억원",
+        "support_type": "기술개발 지원",
+        "target_business": "자동차부품 제조업",
+        "category": "automotive_support",
+        "application_period": "2025년 상반기",
+        "source": "정책 데이터베이스"
+    },
+    {
+        "policy_id": "mfg_004",
+        "policy_name": "중소기업 정책자금 융자",
+        "issuing_org": "중소벤처기업부",
+        "support_field": "운전자금 및 시설자금",
+        "eligibility_text": "중소기업기본법상 중소기업",
+        "support_amount": "업체당 최대 30억원",
+        "support_type": "정책자금",
+        "target_business": "중소기업",
+        "category": "policy_loan",
+        "application_period": "연중 상시",
+        "source": "정책 데이터베이스"
+    },
+    {
+        "policy_id": "mfg_005",
+        "policy_name": "수출기업 금융지원",
+        "issuing_org": "한국수출입은행",
+        "support_field": "수출 운전자금",
+        "eligibility_text": "수출실적 보유 중소기업",
+        "support_amount": "수출계약금액의 80% 이내",
+        "support_type": "수출금융",
+        "target_business": "수출기업",
+        "category": "export_support",
+        "application_period": "연중 상시",
+        "source": "정책 데이터베이스"
+    },
+    # 추가 보조금 데이터 (수동 정의)
+    {
+        "policy_id": "subsidy_001",
+        "policy_name": "중소기업육성자금",
+        "issuing_org": "중소벤처기업부",
+        "support_field": "운전자금",
+        "eligibility_text": "중소기업기본법상 중소기업",
+        "support_amount": "최대 100억원",
+        "support_type": "보조금",
+        "target_business": "중소기업",
+        "category": "subsidy",
+        "application_period": "연중 상시",
+        "source": "보조금24 데이터베이스"
+    },
+    {
+        "policy_id": "subsidy_002", 
+        "policy_name": "기술혁신 바우처사업",
+        "issuing_org": "중소벤처기업부",
+        "support_field": "기술개발",
+        "eligibility_text": "기술혁신형 중소기업",
+        "support_amount": "최대 2억원",
+        "support_type": "바우처",
+        "target_business": "중소기업",
+        "category": "innovation_voucher",
+        "application_period": "2025년 1-6월",
+        "source": "보조금24 데이터베이스"
+    },
+    {
+        "policy_id": "subsidy_003",
+        "policy_name": "중소기업 성장사다리펀드",
+        "issuing_org": "중소벤처기업부",
+        "support_field": "성장지원",
+        "eligibility_text": "성장단계 중소기업",
+        "support_amount": "최대 50억원",
+        "support_type": "펀드투자",
+        "target_business": "중소기업",
+        "category": "growth_fund",
+        "application_period": "2025년 상반기",
+        "source": "중소기업 정책 데이터베이스"
+    }
+)
 
 class PolicyCollector:
     """정책 데이터 수집 클래스"""
@@ -23,6 +150,11 @@ class PolicyCollector:
         # 보조금24 API URLs  
         self.odcloud_base_url = "https://api.odcloud.kr/api"
         
+        # 공유 세션으로 커넥션을 재사용하고, 일시적인 서버 오류는 백오프 후 재시도
+        self.session = requests.Session()
+        adapter = HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]))
+        self.session.mount("https://", adapter)
+        
     def collect_bizinfo_support_policies(self) -> List[Dict[str, Any]]:
         """기업마당 지원사업 정책 수집"""
         print("️  기업마당 지원사업 정책 수집 중...")
@@ -33,27 +165,31 @@ class PolicyCollector:
         }
         
         try:
-            response = requests.get(self.bizinfo_base_url, params=params, timeout=30)
+            response = self.session.get(self.bizinfo_base_url, params=params, timeout=30)
             response.raise_for_status()
             
-            # XML 파싱
-            root = ET.fromstring(response.content)
+            # XML 파싱 (외부 응답이므로 엔티티 확장은 비활성화)
+            parser = etree.XMLParser(resolve_entities=False)
+            root = etree.fromstring(response.content, parser)
             
             policies = []
-            for item in root.findall('.//item'):
+            collected_at = datetime.now().isoformat()  # 응답 단위로 한 번만 기록
+            for item in root.iterfind('.//item'):
                 try:
+                    # findtext는 태그가 없으면 기본값, 텍스트가 비어 있으면 ""를 반환하므로 or로 기본값 통일
+                    description = item.findtext('description') or ""
                     policy = {
                         "policy_id": f"bizinfo_{len(policies)+1:03d}",
-                        "policy_name": self._get_xml_text(item, 'title'),
-                        "issuing_org": self._get_xml_text(item, 'author', '기업마당'),
-                        "support_field": self._extract_support_field(self._get_xml_text(item, 'description')),
-                        "eligibility_text": self._get_xml_text(item, 'description'),
-                        "application_period": self._get_xml_text(item, 'pubDate'),
-                        "link": self._get_xml_text(item, 'link'),
+                        "policy_name": item.findtext('title') or "",
+                        "issuing_org": item.findtext('author') or "기업마당",
+                        "support_field": self._extract_support_field(description),
+                        "eligibility_text": description,
+                        "application_period": item.findtext('pubDate') or "",
+                        "link": item.findtext('link') or "",
                         "category": "government_support",
                         "target_business": "중소기업",
                         "support_type": "정책자금",
-                        "collected_at": datetime.now().isoformat(),
+                        "collected_at": collected_at,
                         "source": "기업마당 API"
                     }
                     policies.append(policy)
@@ -85,16 +221,24 @@ class PolicyCollector:
         }
         
         try:
-            response = requests.get(endpoint, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            
             policies = []
-            if "data" in data:
-                print(f" 전체 서비스: {len(data['data'])}개 검토 중...")
+            reviewed = 0
+            collected_at = datetime.now().isoformat()  # 응답 단위로 한 번만 기록
+            with self.session.get(endpoint, params=params, timeout=30, stream=ijson is not None) as response:
+                response.raise_for_status()
+                
+                if ijson is not None:
+                    # data 배열 항목을 하나씩 스트리밍 파싱 (응답 전체를 dict로 올리지 않음)
+                    response.raw.decode_content = True
+                    items = ijson.items(response.raw, 'data.item', use_float=True)
+                elif orjson is not None:
+                    # 원본 바이트를 바로 파싱 (requests의 인코딩 추정 및 표준 json 파서 생략)
+                    items = orjson.loads(response.content).get("data", [])
+                else:
+                    items = response.json().get("data", [])
                 
-                for item in data["data"]:
+                for item in items:
+                    reviewed += 1
                     try:
                         # 중소기업 관련 키워드로 필터링
                         service_name = item.get("서비스명", "")
@@ -105,10 +249,8 @@ class PolicyCollector:
                         # 중소기업 관련 텍스트 검사
                         combined_text = f"{service_name} {target} {field} {content}".lower()
                         
-                        sme_keywords = ["중소기업", "창업", "벤처", "기업", "사업자", "제조", "공장", "스타트업"]
-                        
                         # 소상공인은 제외하고 중소기업만 필터링
-                        if any(keyword in combined_text for keyword in sme_keywords) and "소상공인" not in combined_text:
+                        if _SME_PATTERN.search(combined_text) and not _SME_EXCLUDE_PATTERN.search(combined_text):
                             policy = {
                                 "policy_id": f"gov24_{len(policies)+1:03d}",
                                 "policy_name": service_name,
@@ -121,7 +263,7 @@ class PolicyCollector:
                                 "target_business": "중소기업",
                                 "support_type": "정부지원서비스",
                                 "category": "government_service",
-                                "collected_at": datetime.now().isoformat(),
+                                "collected_at": collected_at,
                                 "source": "보조금24 API"
                             }
                             policies.append(policy)
@@ -130,6 +272,7 @@ class PolicyCollector:
                         print(f"️  정부서비스 파싱 오류: {e}")
                         continue
             
+            print(f" 전체 서비스: {reviewed}개 검토")
             print(f" 보조금24 데이터 수집 완료: {len(policies)}개")
             return policies
             
@@ -141,134 +284,15 @@ class PolicyCollector:
         """제조업 특화 정책 데이터 (수동 정의)"""
         print(" 제조업 특화 정책 데이터 수집 중...")
         
-        # 실제 제조업 관련 주요 정책들
+        # 수집 시각은 한 번만 계산해 모든 정책에 공통으로 기록
+        collected_at = datetime.now().isoformat()
         manufacturing_policies = [
-            {
-                "policy_id": "mfg_001",
-                "policy_name": "스마트 제조혁신 추진사업",
-                "issuing_org": "산업통상자원부",
-                "support_field": "제조업 디지털 전환",
-                "eligibility_text": "제조업 중소기업, 연매출 1,000억원 미만",
-                "support_amount": "최대 20억원",
-                "support_type": "정책자금",
-                "target_business": "제조업 중소기업",
-                "category": "digital_transformation",
-                "application_period": "연중 상시",
-                "collected_at": datetime.now().isoformat(),
-                "source": "정책 데이터베이스"
-            },
-            {
-                "policy_id": "mfg_002", 
-                "policy_name": "중소기업 기술혁신개발사업",
-                "issuing_org": "중소벤처기업부",
-                "support_field": "기술개발 및 사업화",
-                "eligibility_text": "기술혁신형 중소기업",
-                "support_amount": "최대 15억원",
-                "support_type": "R&D 지원",
-                "target_business": "중소기업",
-                "category": "technology_innovation",
-                "application_period": "2025년 1-3월",
-                "collected_at": datetime.now().isoformat(),
-                "source": "정책 데이터베이스"
-            },
-            {
-                "policy_id": "mfg_003",
-                "policy_name": "자동차부품산업 경쟁력강화사업",
-                "issuing_org": "산업통상자원부",
-                "support_field": "자동차부품 기술개발",
-                "eligibility_text": "자동차부품 제조업체, 매출액 500억원 미만",
-                "support_amount": "최대 30억원",
-                "support_type": "기술개발 지원",
-                "target_business": "자동차부품 제조업",
-                "category": "automotive_support",
-                "application_period": "2025년 상반기",
-                "collected_at": datetime.now().isoformat(),
-                "source": "정책 데이터베이스"
-            },
-            {
-                "policy_id": "mfg_004",
-                "policy_name": "중소기업 정책자금 융자",
-                "issuing_org": "중소벤처기업부",
-                "support_field": "운전자금 및 시설자금",
-                "eligibility_text": "중소기업기본법상 중소기업",
-                "support_amount": "업체당 최대 30억원",
-                "support_type": "정책자금",
-                "target_business": "중소기업",
-                "category": "policy_loan",
-                "application_period": "연중 상시",
-                "collected_at": datetime.now().isoformat(),
-                "source": "정책 데이터베이스"
-            },
-            {
-                "policy_id": "mfg_005",
-                "policy_name": "수출기업 금융지원",
-                "issuing_org": "한국수출입은행",
-                "support_field": "수출 운전자금",
-                "eligibility_text": "수출실적 보유 중소기업",
-                "support_amount": "수출계약금액의 80% 이내",
-                "support_type": "수출금융",
-                "target_business": "수출기업",
-                "category": "export_support",
-                "application_period": "연중 상시",
-                "collected_at": datetime.now().isoformat(),
-                "source": "정책 데이터베이스"
-            },
-            # 추가 보조금 데이터 (수동 정의)
-            {
-                "policy_id": "subsidy_001",
-                "policy_name": "중소기업육성자금",
-                "issuing_org": "중소벤처기업부",
-                "support_field": "운전자금",
-                "eligibility_text": "중소기업기본법상 중소기업",
-                "support_amount": "최대 100억원",
-                "support_type": "보조금",
-                "target_business": "중소기업",
-                "category": "subsidy",
-                "application_period": "연중 상시",
-                "collected_at": datetime.now().isoformat(),
-                "source": "보조금24 데이터베이스"
-            },
-            {
-                "policy_id": "subsidy_002", 
-                "policy_name": "기술혁신 바우처사업",
-                "issuing_org": "중소벤처기업부",
-                "support_field": "기술개발",
-                "eligibility_text": "기술혁신형 중소기업",
-                "support_amount": "최대 2억원",
-                "support_type": "바우처",
-                "target_business": "중소기업",
-                "category": "innovation_voucher",
-                "application_period": "2025년 1-6월",
-                "collected_at": datetime.now().isoformat(),
-                "source": "보조금24 데이터베이스"
-            },
-            {
-                "policy_id": "subsidy_003",
-                "policy_name": "중소기업 성장사다리펀드",
-                "issuing_org": "중소벤처기업부",
-                "support_field": "성장지원",
-                "eligibility_text": "성장단계 중소기업",
-                "support_amount": "최대 50억원",
-                "support_type": "펀드투자",
-                "target_business": "중소기업",
-                "category": "growth_fund",
-                "application_period": "2025년 상반기",
-                "collected_at": datetime.now().isoformat(),
-                "source": "중소기업 정책 데이터베이스"
-            }
+            {**policy, "collected_at": collected_at} for policy in _MANUFACTURING_POLICIES
         ]
         
         print(f" 제조업/보조금 정책 수집 완료: {len(manufacturing_policies)}개")
         return manufacturing_policies
     
-    def _get_xml_text(self, element, tag, default=""):
-        """XML 요소에서 텍스트 추출"""
-        try:
-            found = element.find(tag)
-            return found.text if found is not None and found.text else default
-        except:
-            return default
-    
     def _extract_support_field(self, description):
         """설명에서 지원분야 추출"""
         if not description:
@@ -297,11 +321,15 @@ class PolicyCollector:
             "manufacturing_policies": []
         }
         
-        # 1. 기업마당 정책 수집
-        all_policies["bizinfo_policies"] = self.collect_bizinfo_support_policies()
-        
-        # 2. 보조금24 데이터 수집  
-        all_policies["odcloud_subsidies"] = self.collect_odcloud_subsidies()
+        try:
+            # 1. 기업마당 정책 + 2. 보조금24 데이터는 서로 독립된 HTTP 호출이므로 동시에 수집
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                bizinfo_future = executor.submit(self.collect_bizinfo_support_policies)
+                odcloud_future = executor.submit(self.collect_odcloud_subsidies)
+                all_policies["bizinfo_policies"] = bizinfo_future.result()
+                all_policies["odcloud_subsidies"] = odcloud_future.result()
+        finally:
+            self.session.close()
         
         # 3. 제조업 특화 정책 수집
         all_policies["manufacturing_policies"] = self.collect_manufacturing_specific_policies()
@@ -331,8 +359,12 @@ class PolicyCollector:
             "policies": all_policies
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(output_data, f, ensure_ascii=False, indent=2)
         
         print(f" 정책 데이터 저장 완료: {filepath}")
         print(f" 총 {len(all_policies)}개 정책 수집")
@@ -9,12 +9,99 @@ import json
 import os
 import sys
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass
 
 # 프로젝트 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'graph'))
 from neo4j_manager import Neo4jManager
 
+@dataclass(frozen=True, slots=True)
+class RawMaterial:
+    """원자재 가격 레코드"""
+    material_name: str
+    indicator_name: str
+    current_value: float
+    change_rate: float
+    unit: str
+    description: str
+    impact_industries: Tuple[str, ...]
+    volatility: str
+
+# 샘플 원자재 가격 데이터 (실제 서비스에서는 API 연동, 모든 수집기 인스턴스가 공유)
+_RAW_MATERIALS_DATA: Tuple[RawMaterial, ...] = (
+    RawMaterial(
+        material_name="철강가격지수",
+        indicator_name="철강가격지수",
+        current_value=156.8,
+        change_rate=2.3,
+        unit="지수",
+        description="국내 철강 종합가격지수",
+        impact_industries=("자동차부품", "기계제조", "금속가공"),
+        volatility="HIGH"
+    ),
+    RawMaterial(
+        material_name="구리가격",
+        indicator_name="구리선물가격",
+        current_value=8250.0,
+        change_rate=-1.2,
+        unit="USD/톤",
+        description="LME 구리 선물 가격",
+        impact_industries=("전자부품", "전선케이블", "기계제조"),
+        volatility="HIGH"
+    ),
+    RawMaterial(
+        material_name="알루미늄가격",
+        indicator_name="알루미늄선물가격",
+        current_value=2180.0,
+        change_rate=0.8,
+        unit="USD/톤",
+        description="LME 알루미늄 선물 가격",
+        impact_industries=("자동차부품", "항공우주", "포장재"),
+        volatility="MEDIUM"
+    ),
+    RawMaterial(
+        material_name="플라스틱원료",
+        indicator_name="석유화학가격지수",
+        current_value=142.5,
+        change_rate=3.1,
+        unit="지수",
+        description="국내 석유화학 제품 종합가격지수",
+        impact_industries=("플라스틱제품", "자동차부품", "포장재"),
+        volatility="HIGH"
+    ),
+    RawMaterial(
+        material_name="화학소재",
+        indicator_name="화학소재가격지수",
+        current_value=128.9,
+        change_rate=1.7,
+        unit="지수",
+        description="정밀화학 및 특수소재 가격지수",
+        impact_industries=("화학제품", "전자부품", "섬유제조"),
+        volatility="MEDIUM"
+    ),
+    RawMaterial(
+        material_name="반도체소재",
+        indicator_name="반도체소재가격지수",
+        current_value=189.3,
+        change_rate=4.2,
+        unit="지수",
+        description="반도체 제조용 핵심 소재 가격지수",
+        impact_industries=("반도체", "전자부품", "디스플레이"),
+        volatility="EXTREME"
+    ),
+    RawMaterial(
+        material_name="섬유원료",
+        indicator_name="섬유원료가격지수",
+        current_value=98.7,
+        change_rate=-0.5,
+        unit="지수",
+        description="면화, 폴리에스터 등 섬유 원료 가격지수",
+        impact_industries=("섬유제조", "의류제조", "인테리어"),
+        volatility="LOW"
+    ),
+)
+
 class RawMaterialsCollector:
     """원자재 가격 수집기"""
     
@@ -24,169 +111,72 @@ class RawMaterialsCollector:
         os.environ['NEO4J_USER'] = 'neo4j'
         os.environ['NEO4J_PASSWORD'] = r'ehdgusdl11!'
         self.neo4j_manager = Neo4jManager()
+        # 수집기 수명 동안 세션 하나를 재사용 (cleanup에서 닫음)
+        self.session = self.neo4j_manager.open_session()
+        self._ensure_indicator_index()
         
         # 원자재 가격 매핑 (실제로는 API에서 가져와야 함)
-        self.raw_materials_data = self._get_sample_raw_materials_data()
+        self.raw_materials_data = _RAW_MATERIALS_DATA
         
-    def _get_sample_raw_materials_data(self) -> List[Dict[str, Any]]:
-        """샘플 원자재 가격 데이터 (실제 서비스에서는 API 연동)"""
-        return [
-            {
-                "material_name": "철강가격지수",
-                "indicator_name": "철강가격지수",
-                "current_value": 156.8,
-                "change_rate": 2.3,
-                "unit": "지수",
-                "description": "국내 철강 종합가격지수",
-                "impact_industries": ["자동차부품", "기계제조", "금속가공"],
-                "volatility": "HIGH"
-            },
-            {
-                "material_name": "구리가격",
-                "indicator_name": "구리선물가격", 
-                "current_value": 8250.0,
-                "change_rate": -1.2,
-                "unit": "USD/톤",
-                "description": "LME 구리 선물 가격",
-                "impact_industries": ["전자부품", "전선케이블", "기계제조"],
-                "volatility": "HIGH"
-            },
-            {
-                "material_name": "알루미늄가격",
-                "indicator_name": "알루미늄선물가격",
-                "current_value": 2180.0,
-                "change_rate": 0.8,
-                "unit": "USD/톤", 
-                "description": "LME 알루미늄 선물 가격",
-                "impact_industries": ["자동차부품", "항공우주", "포장재"],
-                "volatility": "MEDIUM"
-            },
-            {
-                "material_name": "플라스틱원료",
-                "indicator_name": "석유화학가격지수",
-                "current_value": 142.5,
-                "change_rate": 3.1,
-                "unit": "지수",
-                "description": "국내 석유화학 제품 종합가격지수",
-                "impact_industries": ["플라스틱제품", "자동차부품", "포장재"],
-                "volatility": "HIGH"
-            },
-            {
-                "material_name": "화학소재",
-                "indicator_name": "화학소재가격지수",
-                "current_value": 128.9,
-                "change_rate": 1.7,
-                "unit": "지수",
-                "description": "정밀화학 및 특수소재 가격지수",
-                "impact_industries": ["화학제품", "전자부품", "섬유제조"],
-                "volatility": "MEDIUM"
-            },
-            {
-                "material_name": "반도체소재",
-                "indicator_name": "반도체소재가격지수",
-                "current_value": 189.3,
-                "change_rate": 4.2,
-                "unit": "지수",
-                "description": "반도체 제조용 핵심 소재 가격지수",
-                "impact_industries": ["반도체", "전자부품", "디스플레이"],
-                "volatility": "EXTREME"
-            },
-            {
-                "material_name": "섬유원료",
-                "indicator_name": "섬유원료가격지수",
-                "current_value": 98.7,
-                "change_rate": -0.5,
-                "unit": "지수",
-                "description": "면화, 폴리에스터 등 섬유 원료 가격지수",
-                "impact_industries": ["섬유제조", "의류제조", "인테리어"],
-                "volatility": "LOW"
-            }
-        ]
+    def _ensure_indicator_index(self):
+        """MacroIndicator 지표명 인덱스 생성 (MERGE 시 레이블 전체 스캔 방지)"""
+        # Neo4jManager.create_constraints_and_indexes와 같은 이름이라 이미 있으면 그대로 둠
+        self.neo4j_manager.execute_query(
+            "CREATE INDEX indicator_name IF NOT EXISTS FOR (m:MacroIndicator) ON (m.indicatorName)",
+            session=self.session
+        )
     
     def collect_and_store_raw_materials(self):
         """원자재 데이터 수집 및 Neo4j 저장"""
         print(" 원자재 가격 데이터 수집 및 저장 시작...")
         
-        created_count = 0
+        rows = [
+            {
+                'indicator_name': material.indicator_name,
+                'value': material.current_value,
+                'change_rate': material.change_rate,
+                'unit': material.unit,
+                'description': material.description,
+                'volatility': material.volatility,
+                'impact_industries': list(material.impact_industries)
+            }
+            for material in self.raw_materials_data
+        ]
+        
+        try:
+            stored = self._upsert_macro_indicator_nodes(rows)
+        except Exception as e:
+            print(f" 원자재 데이터 저장 실패: {e}")
+            stored = []
         
-        for material in self.raw_materials_data:
-            try:
-                # MacroIndicator 노드로 저장
-                result = self._create_macro_indicator_node(material)
-                if result:
-                    created_count += 1
-                    print(f" {material['indicator_name']} 저장 완료")
-                    
-            except Exception as e:
-                print(f" {material['indicator_name']} 저장 실패: {e}")
+        for indicator_name in stored:
+            print(f" {indicator_name} 저장 완료")
         
+        created_count = len(stored)
         print(f" 원자재 데이터 저장 완료: {created_count}개")
         return created_count
     
-    def _create_macro_indicator_node(self, material_data: Dict[str, Any]) -> bool:
-        """MacroIndicator 노드 생성"""
+    def _upsert_macro_indicator_nodes(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """MacroIndicator 노드 일괄 생성/갱신 (저장된 지표명 목록 반환)"""
         
-        # 기존 노드 확인
-        check_query = """
-        MATCH (m:MacroIndicator {indicatorName: $indicator_name})
+        # 기존 노드 확인 없이 MERGE로 생성/갱신을 서버에서 분기하고, 전체 원자재를 한 번의 쿼리로 처리
+        upsert_query = """
+        UNWIND $rows AS row
+        MERGE (m:MacroIndicator {indicatorName: row.indicator_name})
+        ON CREATE SET m.unit = row.unit,
+                      m.category = 'RAW_MATERIALS',
+                      m.impactIndustries = row.impact_industries,
+                      m.createdAt = datetime()
+        SET m.value = row.value,
+            m.changeRate = row.change_rate,
+            m.lastUpdated = datetime(),
+            m.volatility = row.volatility,
+            m.description = row.description
         RETURN m.indicatorName as indicator
         """
         
-        existing = self.neo4j_manager.execute_query(
-            check_query, 
-            {'indicator_name': material_data['indicator_name']}
-        )
-        
-        if existing:
-            # 기존 노드가 있으면 업데이트
-            update_query = """
-            MATCH (m:MacroIndicator {indicatorName: $indicator_name})
-            SET m.value = $value,
-                m.changeRate = $change_rate,
-                m.lastUpdated = datetime(),
-                m.volatility = $volatility,
-                m.description = $description
-            RETURN m.indicatorName as indicator
-            """
-            
-            result = self.neo4j_manager.execute_query(update_query, {
-                'indicator_name': material_data['indicator_name'],
-                'value': material_data['current_value'],
-                'change_rate': material_data['change_rate'],
-                'volatility': material_data['volatility'],
-                'description': material_data['description']
-            })
-            
-            return len(result) > 0
-        else:
-            # 새 노드 생성
-            create_query = """
-            CREATE (m:MacroIndicator {
-                indicatorName: $indicator_name,
-                value: $value,
-                changeRate: $change_rate,
-                unit: $unit,
-                description: $description,
-                category: 'RAW_MATERIALS',
-                volatility: $volatility,
-                impactIndustries: $impact_industries,
-                lastUpdated: datetime(),
-                createdAt: datetime()
-            })
-            RETURN m.indicatorName as indicator
-            """
-            
-            result = self.neo4j_manager.execute_query(create_query, {
-                'indicator_name': material_data['indicator_name'],
-                'value': material_data['current_value'],
-                'change_rate': material_data['change_rate'],
-                'unit': material_data['unit'],
-                'description': material_data['description'],
-                'volatility': material_data['volatility'],
-                'impact_industries': material_data['impact_industries']
-            })
-            
-            return len(result) > 0
+        result = self.neo4j_manager.execute_write(upsert_query, {'rows': rows}, session=self.session)
+        return [record['indicator'] for record in result]
     
     def create_raw_material_relationships(self):
         """원자재와 기업 간 관계 생성"""
@@ -204,72 +194,94 @@ class RawMaterialsCollector:
             "반도체": ["반도체소재가격지수", "화학소재가격지수"]
         }
         
+        # UserCompany를 한 번만 훑으며 업종 키워드 포함 여부를 기업당 한 번만 평가하고 (노드에는 저장하지 않음),
+        # 업종 목록 → 원자재는 매핑 파라미터에서 바로 조회 (MERGE로 중복 관계 방지)
+        relationship_query = """
+        MATCH (u:UserCompany)
+        UNWIND [industry IN $industries WHERE u.industryDescription CONTAINS industry] AS industry
+        UNWIND $mapping[industry] AS material
+        // 여러 업종이 같은 원자재로 이어지는 기업은 (기업, 원자재) 쌍을 한 번만 처리 (관계 중복 집계 방지)
+        WITH u, material, collect(industry)[0] AS industry
+        MATCH (m:MacroIndicator {indicatorName: material})
+        MERGE (u)-[r:IS_EXPOSED_TO]->(m)
+        ON CREATE SET r.exposureLevel = CASE 
+                WHEN m.volatility = 'EXTREME' THEN 'HIGH'
+                WHEN m.volatility = 'HIGH' THEN 'HIGH'  
+                WHEN m.volatility = 'MEDIUM' THEN 'MEDIUM'
+                ELSE 'LOW'
+            END,
+            r.rationale = '업종별 주요 원자재 의존',
+            r.riskType = 'RAW_MATERIALS',
+            r.createdAt = datetime()
+        // datetime()은 문장 단위 시각이므로 createdAt이 같으면 이번 실행에서 새로 만든 관계
+        RETURN industry, material,
+               count(r) as linked,
+               count(CASE WHEN r.createdAt = datetime() THEN r END) as created
+        """
+        
         total_relationships = 0
         
-        for industry, materials in industry_material_mapping.items():
-            for material in materials:
-                # 해당 업종의 모든 기업과 원자재 연결
-                relationship_query = """
-                MATCH (u:UserCompany), (m:MacroIndicator {indicatorName: $material})
-                WHERE u.industryDescription CONTAINS $industry
-                CREATE (u)-[:IS_EXPOSED_TO {
-                    exposureLevel: CASE 
-                        WHEN m.volatility = 'EXTREME' THEN 'HIGH'
-                        WHEN m.volatility = 'HIGH' THEN 'HIGH'  
-                        WHEN m.volatility = 'MEDIUM' THEN 'MEDIUM'
-                        ELSE 'LOW'
-                    END,
-                    rationale: '업종별 주요 원자재 의존',
-                    riskType: 'RAW_MATERIALS',
-                    createdAt: datetime()
-                }]->(m)
-                RETURN count(*) as created
-                """
+        try:
+            # 관계 생성 전체를 하나의 쓰기 트랜잭션으로 커밋 (실패 시 함께 롤백)
+            def write_exposures(tx):
+                return tx.run(
+                    relationship_query,
+                    industries=list(industry_material_mapping),
+                    mapping=industry_material_mapping
+                ).data()
+            
+            result = self.session.execute_write(write_exposures)
+            
+            for row in result:
+                created = row.get('created', 0)
+                total_relationships += created
+                print(f" {row['industry']} - {row['material']}: {row.get('linked', 0)}개 관계 연결 (신규 {created}개)")
                 
-                try:
-                    result = self.neo4j_manager.execute_query(relationship_query, {
-                        'industry': industry,
-                        'material': material
-                    })
-                    
-                    if result:
-                        created = result[0].get('created', 0)
-                        total_relationships += created
-                        print(f" {industry} - {material}: {created}개 관계 생성")
-                        
-                except Exception as e:
-                    print(f" {industry} - {material} 관계 생성 실패: {e}")
+        except Exception as e:
+            print(f" 원자재 관계 생성 실패: {e}")
         
-        print(f" 원자재 관계 생성 완료: 총 {total_relationships}개")
+        print(f" 원자재 관계 생성 완료: 신규 {total_relationships}개")
         return total_relationships
     
     def get_raw_materials_summary(self) -> Dict[str, Any]:
         """원자재 현황 요약"""
+        # 정렬과 상승/하락/고변동성 분류를 서버에서 처리해 결과 한 행으로 받음
         summary_query = """
         MATCH (m:MacroIndicator)
         WHERE m.category = 'RAW_MATERIALS'
-        RETURN m.indicatorName as material,
-               m.value as value,
-               m.changeRate as change,
-               m.volatility as volatility,
-               m.unit as unit
-        ORDER BY m.changeRate DESC
+        WITH m ORDER BY m.changeRate DESC
+        WITH collect({
+            material: m.indicatorName,
+            value: m.value,
+            change: m.changeRate,
+            volatility: m.volatility,
+            unit: m.unit
+        }) AS materials
+        RETURN size(materials) AS total,
+               [x IN materials WHERE x.change > 0] AS rising,
+               [x IN materials WHERE x.change < 0] AS falling,
+               [x IN materials WHERE x.volatility = 'HIGH'] AS high_volatility,
+               materials
         """
         
-        results = self.neo4j_manager.execute_query(summary_query)
+        results = self.neo4j_manager.execute_query(summary_query, session=self.session, read_only=True)
+        row = results[0] if results else {}
         
         summary = {
-            "total_materials": len(results),
-            "rising_materials": [r for r in results if r['change'] > 0],
-            "falling_materials": [r for r in results if r['change'] < 0],
-            "high_volatility": [r for r in results if r['volatility'] == 'HIGH'],
-            "materials": results
+            "total_materials": row.get('total', 0),
+            "rising_materials": row.get('rising', []),
+            "falling_materials": row.get('falling', []),
+            "high_volatility": row.get('high_volatility', []),
+            "materials": row.get('materials', [])
         }
         
         return summary
     
     def cleanup(self):
         """리소스 정리"""
+        if getattr(self, 'session', None) is not None:
+            self.session.close()
+            self.session = None
         if hasattr(self, 'neo4j_manager') and self.neo4j_manager:
             self.neo4j_manager.close()
 
@@ -5,10 +5,17 @@
 
 import json
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import time
 import sys
 
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경에서는 표준 json 모듈 사용
+    orjson = None
+
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from src.graph.llm_graph_transformer import LLMGraphTransformer
 
@@ -17,6 +24,9 @@ class BatchGraphBuilder:
     
     def __init__(self):
         self.transformer = LLMGraphTransformer()
+        
+        # 동시에 진행할 LLM 추출 배치 수 (API 호출 제한에 맞춰 조정)
+        self.max_concurrent_batches = 5
     
     def build_complete_graph(self):
         """전체 데이터를 배치로 나누어 완전한 그래프 구축"""
@@ -31,44 +41,72 @@ class BatchGraphBuilder:
         all_nodes = []
         all_relationships = []
         
-        for i, batch_data in enumerate(batches, 1):
-            print(f"\n 배치 {i}/5 처리 중...")
-            
+        def extract(batch: Tuple[int, Dict[str, Any]]) -> Optional[Dict[str, List]]:
+            i, batch_data = batch
+            print(f"\n 배치 {i}/{len(batches)} 처리 중...")
             try:
                 # LLM으로 그래프 요소 추출
-                extracted = self.transformer.extract_graph_elements(batch_data)
-                
-                if extracted and 'nodes' in extracted:
-                    all_nodes.extend(extracted['nodes'])
-                    all_relationships.extend(extracted.get('relationships', []))
-                    
-                    print(f" 배치 {i} 완료: 노드 {len(extracted['nodes'])}개, 관계 {len(extracted.get('relationships', []))}개")
-                else:
-                    print(f"️  배치 {i} 결과 없음")
-                
-                # 배치 간 지연
-                if i < len(batches):
-                    print("⏱️  다음 배치 처리를 위해 10초 대기...")
-                    time.sleep(10)
-                    
+                return self.transformer.extract_graph_elements(batch_data)
             except Exception as e:
                 print(f" 배치 {i} 처리 오류: {e}")
-                continue
+                return None
+        
+        # LLM 호출은 외부 API 대기 시간이 대부분이므로 배치를 동시에 처리 (결과는 배치 순서대로 병합)
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_batches) as executor:
+            results = list(executor.map(extract, enumerate(batches, 1)))
+        
+        for i, extracted in enumerate(results, 1):
+            if extracted and 'nodes' in extracted:
+                all_nodes.extend(extracted['nodes'])
+                all_relationships.extend(extracted.get('relationships', []))
+                
+                print(f" 배치 {i} 완료: 노드 {len(extracted['nodes'])}개, 관계 {len(extracted.get('relationships', []))}개")
+            elif extracted is not None:
+                print(f"️  배치 {i} 결과 없음")
+        
+        # 배치 2~5에 연결용으로 포함된 기업 등이 중복 추출되므로 Neo4j 저장 전에 제거
+        all_nodes = self._dedupe(all_nodes, lambda n: (n.get('type'), n.get('id') or n.get('name')))
+        all_relationships = self._dedupe(
+            all_relationships, lambda r: (r.get('type'), r.get('source_id'), r.get('target_id'))
+        )
         
         print(f"\n️  전체 추출 완료: 노드 {len(all_nodes)}개, 관계 {len(all_relationships)}개")
         
+        # 노드/관계 타입별 통계는 한 번만 계산해 오프라인 통계와 보고서에서 공유
+        node_stats = Counter(node.get('type', 'Unknown') for node in all_nodes)
+        rel_stats = Counter(rel.get('type', 'Unknown') for rel in all_relationships)
+        
         # Neo4j에 일괄 생성
-        self._create_all_in_neo4j(all_nodes, all_relationships)
+        self._create_all_in_neo4j(all_nodes, all_relationships, node_stats, rel_stats)
         
         # 최종 보고서 생성
-        report = self._generate_final_report(all_nodes, all_relationships)
+        report = self._generate_final_report(all_nodes, all_relationships, node_stats, rel_stats)
         self._save_report(report)
         
         return report
     
+    @staticmethod
+    def _dedupe(elements: List[Dict], key: Callable[[Dict], Tuple]) -> List[Dict]:
+        """키 기준 중복 요소 제거 (처음 추출된 요소와 순서 유지)"""
+        seen = set()
+        deduped = []
+        for element in elements:
+            k = key(element)
+            if k not in seen:
+                seen.add(k)
+                deduped.append(element)
+        return deduped
+    
     def _create_batches(self, all_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """데이터를 5개 배치로 분할"""
         
+        # 배치 2~5에서 공유하는 연결용 기업 일부
+        # 기업 노드는 배치 1에서만 추출하고, 나머지 배치에는 관계 연결에 필요한 ID/기업명만 전달
+        linked_companies = tuple(
+            {"company_id": company.get("company_id"), "corp_name": company.get("corp_name")}
+            for company in all_data["companies"][:5]
+        )
+        
         # 배치 1: 핵심 인프라 (기업 + 거시지표)
         batch1 = {
             "기업정보": all_data["companies"],
@@ -78,26 +116,26 @@ class BatchGraphBuilder:
         # 배치 2: KB 금융상품
         batch2 = {
             "KB금융상품": all_data["kb_products"],
-            "기업정보": all_data["companies"][:5]  # 연결용 기업 일부
+            "연결기업목록": linked_companies  # 연결용 기업 일부
         }
         
         # 배치 3: 정책 데이터 (절반)
         batch3 = {
             "정책데이터": all_data["policies"][:35],
-            "기업정보": all_data["companies"][:5]  # 연결용 기업 일부
+            "연결기업목록": linked_companies  # 연결용 기업 일부
         }
         
         # 배치 4: 정책 데이터 (나머지) + 뉴스 절반
         batch4 = {
             "정책데이터": all_data["policies"][35:],
             "뉴스_데이터": all_data["news"][:30],
-            "기업정보": all_data["companies"][:5]  # 연결용 기업 일부
+            "연결기업목록": linked_companies  # 연결용 기업 일부
         }
         
         # 배치 5: 뉴스 나머지
         batch5 = {
             "뉴스_데이터": all_data["news"][30:],
-            "기업정보": all_data["companies"][:5],  # 연결용 기업 일부
+            "연결기업목록": linked_companies,  # 연결용 기업 일부
             "거시경제지표": all_data["macro_indicators"]  # 뉴스-지표 연결용
         }
         
@@ -110,7 +148,8 @@ class BatchGraphBuilder:
         
         return [batch1, batch2, batch3, batch4, batch5]
     
-    def _create_all_in_neo4j(self, all_nodes: List[Dict], all_relationships: List[Dict]):
+    def _create_all_in_neo4j(self, all_nodes: List[Dict], all_relationships: List[Dict],
+                             node_stats: Counter, rel_stats: Counter):
         """모든 노드와 관계를 Neo4j에 생성"""
         print("\n️  Neo4j 데이터베이스에 그래프 구축 중...")
         
@@ -127,40 +166,29 @@ class BatchGraphBuilder:
             
         except Exception as e:
             print(f"️  Neo4j 연결 문제로 인해 오프라인 모드로 진행: {e}")
-            # 노드 타입별 통계 생성
-            node_counts = {}
-            for node in all_nodes:
-                node_type = node.get('type', 'Unknown')
-                node_counts[node_type] = node_counts.get(node_type, 0) + 1
-            
-            # 관계 타입별 통계 생성  
-            rel_counts = {}
-            for rel in all_relationships:
-                rel_type = rel.get('type', 'Unknown')
-                rel_counts[rel_type] = rel_counts.get(rel_type, 0) + 1
+            # 미리 계산한 타입별 통계 사용
+            node_counts = dict(node_stats)
+            rel_counts = dict(rel_stats)
                 
             print(f" 오프라인 통계 - 노드: {node_counts}, 관계: {rel_counts}")
             return node_counts, rel_counts
     
-    def _generate_final_report(self, all_nodes: List[Dict], all_relationships: List[Dict]) -> Dict[str, Any]:
+    def _generate_final_report(self, all_nodes: List[Dict], all_relationships: List[Dict],
+                               node_stats: Counter, rel_stats: Counter) -> Dict[str, Any]:
         """최종 구축 보고서 생성"""
         
-        # 노드 타입별 통계
-        node_stats = {}
-        for node in all_nodes:
-            node_type = node.get('type', 'Unknown')
-            node_stats[node_type] = node_stats.get(node_type, 0) + 1
-        
-        # 관계 타입별 통계
-        rel_stats = {}
-        for rel in all_relationships:
-            rel_type = rel.get('type', 'Unknown')
-            rel_stats[rel_type] = rel_stats.get(rel_type, 0) + 1
-        
-        # Neo4j 실제 검증
-        verification = self._verify_neo4j_graph()
+        # Neo4j 실제 검증은 백그라운드에서 진행하고, 그동안 나머지 보고서 항목을 구성
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            verification = executor.submit(self._verify_neo4j_graph)
+            report = self._build_report_body(all_nodes, all_relationships, node_stats, rel_stats)
+            report["neo4j_verification"] = verification.result()
         
-        report = {
+        return report
+    
+    def _build_report_body(self, all_nodes: List[Dict], all_relationships: List[Dict],
+                           node_stats: Counter, rel_stats: Counter) -> Dict[str, Any]:
+        """Neo4j 검증 결과를 제외한 보고서 항목 구성 (검증 항목은 자리만 확보)"""
+        return {
             "build_timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
             "total_data_processed": {
                 "companies": 16,
@@ -172,10 +200,10 @@ class BatchGraphBuilder:
             "extracted_elements": {
                 "total_nodes": len(all_nodes),
                 "total_relationships": len(all_relationships),
-                "node_breakdown": node_stats,
-                "relationship_breakdown": rel_stats
+                "node_breakdown": dict(node_stats),
+                "relationship_breakdown": dict(rel_stats)
             },
-            "neo4j_verification": verification,
+            "neo4j_verification": None,
             "key_achievements": [
                 f"총 {len(all_nodes)}개 노드와 {len(all_relationships)}개 관계로 구성된 지식그래프 구축",
                 "16개 제조업 기업의 실제 리스크 패턴 분석 완료",
@@ -190,37 +218,38 @@ class BatchGraphBuilder:
                 "news_monitoring": "실시간 뉴스 영향도 분석"
             }
         }
-        
-        return report
     
     def _verify_neo4j_graph(self) -> Dict[str, Any]:
         """Neo4j 그래프 검증"""
         try:
-            # 전체 노드 수 확인
-            node_query = "MATCH (n) RETURN labels(n) as labels, count(n) as count"
-            node_results = self.transformer.neo4j_manager.execute_query(node_query)
-            
-            # 전체 관계 수 확인
-            rel_query = "MATCH ()-[r]->() RETURN type(r) as type, count(r) as count"
-            rel_results = self.transformer.neo4j_manager.execute_query(rel_query)
-            
-            # 핵심 쿼리 테스트
-            test_queries = {
-                "risk_exposure_count": "MATCH ()-[r:IS_EXPOSED_TO]->() RETURN count(r) as count",
-                "product_recommendation_count": "MATCH ()-[r:IS_ELIGIBLE_FOR]->() RETURN count(r) as count",
-                "news_impact_count": "MATCH ()-[r:HAS_IMPACT_ON]->() RETURN count(r) as count"
+            # 노드/관계 분포와 핵심 관계 수를 CALL 서브쿼리로 묶어 한 번의 왕복으로 조회
+            verify_query = """
+            CALL {
+                MATCH (n)
+                WITH labels(n) as labels, count(n) as count
+                RETURN collect({labels: labels, count: count}) as nodes
             }
-            
-            test_results = {}
-            for test_name, query in test_queries.items():
-                result = self.transformer.neo4j_manager.execute_query(query)
-                test_results[test_name] = result[0]['count'] if result else 0
+            CALL {
+                MATCH ()-[r]->()
+                WITH type(r) as type, count(r) as count
+                RETURN collect({type: type, count: count}) as relationships
+            }
+            CALL { MATCH ()-[r:IS_EXPOSED_TO]->() RETURN count(r) as risk_exposure_count }
+            CALL { MATCH ()-[r:IS_ELIGIBLE_FOR]->() RETURN count(r) as product_recommendation_count }
+            CALL { MATCH ()-[r:HAS_IMPACT_ON]->() RETURN count(r) as news_impact_count }
+            RETURN nodes, relationships, risk_exposure_count, product_recommendation_count, news_impact_count
+            """
+            result = self.transformer.neo4j_manager.execute_query(verify_query, read_only=True)
+            row = result[0] if result else {}
             
             return {
                 "status": "SUCCESS",
-                "node_distribution": {str(r['labels']): r['count'] for r in node_results},
-                "relationship_distribution": {r['type']: r['count'] for r in rel_results},
-                "core_functionality": test_results
+                "node_distribution": {str(r['labels']): r['count'] for r in row.get('nodes', [])},
+                "relationship_distribution": {r['type']: r['count'] for r in row.get('relationships', [])},
+                "core_functionality": {
+                    test_name: row.get(test_name, 0)
+                    for test_name in ("risk_exposure_count", "product_recommendation_count", "news_impact_count")
+                }
             }
             
         except Exception as e:
@@ -243,8 +272,12 @@ class BatchGraphBuilder:
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         filepath = f"reports/kb_fortress_ai_graph_build_report_{timestamp}.json"
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
         
         # 마크다운 보고서도 생성
         self._create_markdown_report(report, timestamp)
@@ -254,7 +287,8 @@ class BatchGraphBuilder:
     def _create_markdown_report(self, report: Dict[str, Any], timestamp: str):
         """마크다운 형태 보고서 생성"""
         
-        md_content = f"""# KB Fortress AI 지식그래프 구축 완료 보고서
+        # 문자열 += 반복 대신 조각을 모아 마지막에 한 번만 합침
+        parts = [f"""# KB Fortress AI 지식그래프 구축 완료 보고서
 
 **구축 완료 시간**: {report['build_timestamp']}
 
@@ -272,19 +306,17 @@ class BatchGraphBuilder:
 - **총 관계 수**: {report['extracted_elements']['total_relationships']}개
 
 #### 노드 타입별 분포
-"""
+"""]
         
-        for node_type, count in report['extracted_elements']['node_breakdown'].items():
-            md_content += f"- **{node_type}**: {count}개\n"
+        parts.extend(f"- **{node_type}**: {count}개\n" for node_type, count in report['extracted_elements']['node_breakdown'].items())
         
-        md_content += f"""
+        parts.append("""
 #### 관계 타입별 분포
-"""
+""")
         
-        for rel_type, count in report['extracted_elements']['relationship_breakdown'].items():
-            md_content += f"- **{rel_type}**: {count}개\n"
+        parts.extend(f"- **{rel_type}**: {count}개\n" for rel_type, count in report['extracted_elements']['relationship_breakdown'].items())
         
-        md_content += f"""
+        parts.append(f"""
 
 ## ️ Neo4j 데이터베이스 검증 결과
 
@@ -310,12 +342,11 @@ class BatchGraphBuilder:
 뉴스 기사의 기업별 영향도를 실시간으로 분석할 수 있습니다.
 
 ##  주요 달성 사항
-"""
+""")
         
-        for achievement in report['key_achievements']:
-            md_content += f"- {achievement}\n"
+        parts.extend(f"- {achievement}\n" for achievement in report['key_achievements'])
         
-        md_content += f"""
+        parts.append("""
 
 ##  다음 단계
 1. **Graph RAG 시스템 연동** - 구축된 지식그래프 기반 질의응답
@@ -325,7 +356,8 @@ class BatchGraphBuilder:
 
 ---
 *KB Fortress AI - 중소기업 금융 리스크 관리 및 기회 포착 시스템*
-"""
+""")
+        md_content = "".join(parts)
         
         md_filepath = f"reports/kb_fortress_ai_report_{timestamp}.md"
         with open(md_filepath, 'w', encoding='utf-8') as f:
@@ -1,10 +1,48 @@
 import json
 import os
+import logging
 from typing import List, Dict, Any
 from neo4j_manager import Neo4jManager
 from schema import KB_Product, NodeType
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경에서는 표준 json 모듈 사용
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # msgspec 미설치 환경에서는 orjson/json 로드 후 필드별 추출
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+# UNWIND 한 번에 넘길 최대 행 수 (트랜잭션 메모리 부담 방지)
+_WRITE_CHUNK_SIZE = 10_000
+
+# JSON 원본에서 KB_Product로 옮기는 상품 필드 (누락 시 빈 문자열)
+_PRODUCT_FIELDS = (
+    "product_name", "product_type", "target_customer", "loan_limit", "interest_rate",
+    "collateral", "credit_grade_min", "loan_period", "special_conditions", "description",
+)
+
+if msgspec is not None:
+    class _KBProductRecord(msgspec.Struct):
+        """JSON 상품 레코드 (파싱·타입 검증·기본값 처리를 디코더에서 한 번에 수행)"""
+        product_name: str = ""
+        product_type: str = ""
+        target_customer: str = ""
+        loan_limit: str = ""
+        interest_rate: str = ""
+        collateral: str = ""
+        credit_grade_min: str = ""
+        loan_period: str = ""
+        special_conditions: str = ""
+        description: str = ""
+
+    _product_decoder = msgspec.json.Decoder(list[_KBProductRecord])
+
 class KBProductLoader:
     def __init__(self):
         self.neo4j_manager = Neo4jManager()
@@ -14,28 +52,32 @@ class KBProductLoader:
         if not os.path.exists(json_path):
             raise FileNotFoundError(f"파일을 찾을 수 없습니다: {json_path}")
         
-        with open(json_path, 'r', encoding='utf-8') as f:
-            products_data = json.load(f)
+        if msgspec is not None:
+            with open(json_path, 'rb') as f:
+                products_data = [msgspec.structs.asdict(record) for record in _product_decoder.decode(f.read())]
+        else:
+            if orjson is not None:
+                with open(json_path, 'rb') as f:
+                    raw_products = orjson.loads(f.read())
+            else:
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    raw_products = json.load(f)
+            products_data = [
+                {field: product_data.get(field, "") for field in _PRODUCT_FIELDS}
+                for product_data in raw_products
+            ]
         
-        kb_products = []
-        for product_data in products_data:
-            # 데이터 정제
-            kb_product = KB_Product(
-                node_id=f"kb_product_{len(kb_products)+1:03d}",
+        created_at = datetime.now()  # 한 번 로드한 상품은 같은 생성 시각 공유
+        # 데이터 정제 (노드 ID는 파일 내 순번으로 부여, 설명은 500자로 제한)
+        kb_products = [
+            KB_Product(
+                node_id=f"kb_product_{i:03d}",
                 node_type=NodeType.KB_PRODUCT.value,
-                created_at=datetime.now(),
-                product_name=product_data.get("product_name", ""),
-                product_type=product_data.get("product_type", ""),
-                target_customer=product_data.get("target_customer", ""),
-                loan_limit=product_data.get("loan_limit", ""),
-                interest_rate=product_data.get("interest_rate", ""),
-                collateral=product_data.get("collateral", ""),
-                credit_grade_min=product_data.get("credit_grade_min", ""),
-                loan_period=product_data.get("loan_period", ""),
-                special_conditions=product_data.get("special_conditions", ""),
-                description=product_data.get("description", "")[:500]  # 설명은 500자로 제한
+                created_at=created_at,
+                **{**product_data, "description": product_data["description"][:500]}
             )
-            kb_products.append(kb_product)
+            for i, product_data in enumerate(products_data, 1)
+        ]
         
         print(f"JSON에서 {len(kb_products)}개 KB 상품 로드 완료")
         return kb_products
@@ -43,32 +85,45 @@ class KBProductLoader:
     def create_kb_product_nodes(self, kb_products: List[KB_Product]) -> bool:
         """KB 상품 노드를 Neo4j에 생성"""
         try:
+            # 상품 목록 전체를 파라미터 하나로 넘겨 UNWIND로 일괄 생성 (상품별 왕복 제거)
             create_query = """
+            UNWIND $rows AS row
             CREATE (p:KB_Product {
-                nodeId: $nodeId,
-                nodeType: $nodeType,
-                createdAt: $createdAt,
-                productName: $productName,
-                productType: $productType,
-                targetCustomer: $targetCustomer,
-                loanLimit: $loanLimit,
-                interestRate: $interestRate,
-                collateral: $collateral,
-                creditGradeMin: $creditGradeMin,
-                loanPeriod: $loanPeriod,
-                specialConditions: $specialConditions,
-                description: $description
+                nodeId: row.nodeId,
+                nodeType: row.nodeType,
+                createdAt: row.createdAt,
+                productName: row.productName,
+                productType: row.productType,
+                targetCustomer: row.targetCustomer,
+                loanLimit: row.loanLimit,
+                interestRate: row.interestRate,
+                collateral: row.collateral,
+                creditGradeMin: row.creditGradeMin,
+                loanPeriod: row.loanPeriod,
+                specialConditions: row.specialConditions,
+                description: row.description
             })
+            RETURN count(p) as created
             """
             
-            success_count = 0
-            for product in kb_products:
-                try:
-                    product_dict = product.to_dict()
-                    self.neo4j_manager.execute_query(create_query, product_dict)
-                    success_count += 1
-                except Exception as e:
-                    print(f"상품 생성 실패: {product.product_name} - {e}")
+            rows = [product.to_dict() for product in kb_products]
+            
+            # 모든 청크를 트랜잭션 하나로 묶어 커밋(로그 플러시)은 한 번만 수행
+            results = self.neo4j_manager.bulk_write([
+                (create_query, {"rows": rows[start:start + _WRITE_CHUNK_SIZE]})
+                for start in range(0, len(rows), _WRITE_CHUNK_SIZE)
+            ])
+            
+            if results is not None:
+                success_count = sum(result[0]["created"] for result in results if result)
+            else:
+                # 일괄 트랜잭션이 롤백되면 실패한 상품을 가려내기 위해 상품별로 재시도
+                success_count = 0
+                for product, row in zip(kb_products, rows):
+                    if self.neo4j_manager.execute_write(create_query, {"rows": [row]}):
+                        success_count += 1
+                    else:
+                        logger.warning("상품 생성 실패: %s", product.product_name)
             
             print(f" {success_count}/{len(kb_products)}개 KB 상품 노드 생성 완료")
             return success_count == len(kb_products)
@@ -116,30 +171,35 @@ class KBProductLoader:
         ]
         
         create_relationship_query = """
+        UNWIND $rows AS row
         MATCH (c:Company {nodeId: "company_daehan_precision"})
-        MATCH (p:KB_Product {productName: $productName})
+        MATCH (p:KB_Product {productName: row.productName})
         CREATE (c)-[r:IS_ELIGIBLE_FOR {
-            eligibilityScore: $eligibilityScore,
-            matchingConditions: $matchingConditions,
-            recommendationReason: $recommendationReason,
-            createdAt: $createdAt
+            eligibilityScore: row.eligibilityScore,
+            matchingConditions: row.matchingConditions,
+            recommendationReason: row.recommendationReason,
+            createdAt: row.createdAt
         }]->(p)
+        RETURN row.productName as productName
         """
         
-        success_count = 0
-        for product_name, score, reason in eligible_products:
-            try:
-                self.neo4j_manager.execute_query(create_relationship_query, {
-                    "productName": product_name,
-                    "eligibilityScore": score,
-                    "matchingConditions": reason,
-                    "recommendationReason": f"대한정밀의 {reason}으로 추천",
-                    "createdAt": datetime.now().isoformat()
-                })
-                success_count += 1
-                print(f" 자격 관계 생성: 대한정밀 → {product_name}")
-            except Exception as e:
-                print(f" 자격 관계 생성 실패: {product_name} - {e}")
+        created_at = datetime.now().isoformat()  # 일괄 생성 관계는 같은 생성 시각 공유
+        rows = [
+            {
+                "productName": product_name,
+                "eligibilityScore": score,
+                "matchingConditions": reason,
+                "recommendationReason": f"대한정밀의 {reason}으로 추천",
+                "createdAt": created_at
+            }
+            for product_name, score, reason in eligible_products
+        ]
+        
+        # 자격 관계 전체를 한 번의 쿼리로 생성 (상품을 찾지 못한 행은 MATCH에서 제외)
+        result = self.neo4j_manager.execute_write(create_relationship_query, {"rows": rows})
+        for record in result:
+            logger.debug(" 자격 관계 생성: 대한정밀 → %s", record['productName'])
+        success_count = len(result)
         
         print(f"총 {success_count}개 자격 관계 생성 완료")
         return success_count
@@ -217,6 +277,7 @@ class KBProductLoader:
             self.neo4j_manager.close()
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     loader = KBProductLoader()
     loader.run_full_loading_process()
 
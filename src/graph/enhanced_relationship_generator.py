@@ -4,17 +4,56 @@ LLM 기반 정교한 관계 생성 전용 시스템
 """
 
 import json
+import logging
 import os
+import re
+import sqlite3
+import threading
+from hashlib import blake2b
 from typing import Dict, List, Any, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
+try:
+    import orjson
+except ImportError:  # orjson 미설치 환경에서는 표준 json 모듈 사용
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson 미설치 환경에서는 파일 전체를 한 번에 파싱
+    ijson = None
+
 from src.graph.neo4j_manager import Neo4jManager
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
+from langchain_core.output_parsers import JsonOutputParser
+from pydantic import BaseModel
+
+class ImpactAnalysis(BaseModel):
+    """LLM 영향 분석 결과 (공통 항목)"""
+    has_impact: bool = False
+    impact_score: float = 0.0
+    impact_direction: str = "NEUTRAL"
+    confidence: float = 0.0
+    reasoning: str = ""
+
+class NewsMacroImpact(ImpactAnalysis):
+    """뉴스 → 거시지표 영향 분석 결과"""
+    impact_mechanism: str = ""
+    time_horizon: str = ""
+    affected_sectors: List[str] = []
+
+class NewsCompanyImpact(ImpactAnalysis):
+    """뉴스 → 기업 영향 분석 결과"""
+    impact_areas: List[str] = []
+    financial_impact: str = ""
+    urgency: str = ""
 
 @dataclass
 class RelationshipCandidate:
@@ -29,79 +68,8 @@ class RelationshipCandidate:
     confidence: float = 0.0
     reasoning: str = ""
 
-class EnhancedRelationshipGenerator:
-    """LLM 기반 정교한 관계 생성기"""
-    
-    def __init__(self):
-        try:
-            self.neo4j_manager = Neo4jManager()
-        except Exception as e:
-            print(f"️ Neo4j 연결 실패: {e}")
-            self.neo4j_manager = None
-        
-        # Google Gemini 설정
-        google_api_key = os.getenv("GOOGLE_API_KEY")
-        if google_api_key:
-            from langchain_google_genai import ChatGoogleGenerativeAI
-            self.llm = ChatGoogleGenerativeAI(
-                model="gemini-2.0-flash-exp",
-                temperature=0.1,
-                google_api_key=google_api_key
-            )
-            print(" Enhanced Relationship Generator with Gemini 2.0 Flash")
-        else:
-            raise ValueError("GOOGLE_API_KEY 환경변수가 필요합니다")
-    
-    def create_news_impact_relationships(self) -> Dict[str, Any]:
-        """뉴스 → 거시지표/기업 영향 관계 생성"""
-        print(" 뉴스 영향 관계 생성 시작...")
-        
-        # 1. 뉴스와 거시지표 데이터 로드
-        news_data = self._load_news_articles()
-        macro_data = self._load_macro_indicators()
-        company_data = self._load_companies()
-        
-        print(f" 로드된 데이터: 뉴스 {len(news_data)}개, 거시지표 {len(macro_data)}개, 기업 {len(company_data)}개")
-        
-        # 2. 뉴스 → 거시지표 관계 생성
-        news_macro_relationships = []
-        for news in news_data[:10]:  # 테스트를 위해 10개만
-            for macro in macro_data:
-                relationship = self._analyze_news_macro_impact(news, macro)
-                if relationship and relationship.confidence > 0.3:
-                    news_macro_relationships.append(relationship)
-        
-        # 3. 뉴스 → 기업 관계 생성
-        news_company_relationships = []
-        for news in news_data[:10]:
-            for company in company_data[:5]:  # 상위 5개 기업
-                relationship = self._analyze_news_company_impact(news, company)
-                if relationship and relationship.confidence > 0.3:
-                    news_company_relationships.append(relationship)
-        
-        # 4. Neo4j에 관계 생성
-        created_relationships = {
-            "news_macro": 0,
-            "news_company": 0,
-            "total": 0
-        }
-        
-        if self.neo4j_manager:
-            created_relationships["news_macro"] = self._create_relationships_in_neo4j(news_macro_relationships)
-            created_relationships["news_company"] = self._create_relationships_in_neo4j(news_company_relationships)
-            created_relationships["total"] = created_relationships["news_macro"] + created_relationships["news_company"]
-        
-        return {
-            "relationships_analyzed": len(news_macro_relationships) + len(news_company_relationships),
-            "relationships_created": created_relationships,
-            "news_macro_candidates": len(news_macro_relationships),
-            "news_company_candidates": len(news_company_relationships)
-        }
-    
-    def _analyze_news_macro_impact(self, news: Dict, macro: Dict) -> Optional[RelationshipCandidate]:
-        """뉴스가 거시지표에 미치는 영향 분석"""
-        
-        prompt = ChatPromptTemplate.from_template("""
+# 뉴스 영향 분석 프롬프트 (모듈 로드 시 한 번만 파싱해 모든 분석 호출에서 재사용)
+_MACRO_IMPACT_PROMPT = ChatPromptTemplate.from_template("""
 당신은 금융 분석 전문가입니다. 다음 뉴스가 거시경제지표에 미치는 영향을 분석하세요.
 
 === 뉴스 정보 ===
@@ -143,57 +111,8 @@ class EnhancedRelationshipGenerator:
 
 **주의**: JSON 형식만 출력하고 추가 설명 금지.
 """)
-        
-        try:
-            # 뉴스 데이터 전처리
-            news_content = news.get('content', news.get('summary', ''))[:500]  # 길이 제한
-            news_keywords = ', '.join(news.get('keywords', '').split(',')[:10]) if news.get('keywords') else ''
-            
-            formatted_prompt = prompt.format(
-                news_title=news.get('title', ''),
-                news_publisher=news.get('media', news.get('publisher', '')),
-                news_date=news.get('date', news.get('publishDate', '')),
-                news_content=news_content,
-                news_keywords=news_keywords,
-                macro_name=macro.get('indicatorName', ''),
-                macro_value=macro.get('value', macro.get('currentValue', '')),
-                macro_type=macro.get('type', macro.get('unit', ''))
-            )
-            
-            response = self.llm.invoke([HumanMessage(content=formatted_prompt)])
-            
-            # JSON 파싱
-            response_text = response.content.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:-3].strip()
-            elif response_text.startswith('```'):
-                response_text = response_text[3:-3].strip()
-            
-            analysis = json.loads(response_text)
-            
-            if analysis.get('has_impact', False) and analysis.get('confidence', 0) > 0.3:
-                return RelationshipCandidate(
-                    source_id=f"news_{news.get('news_id', hash(news.get('title', '')))}",
-                    source_type="NewsArticle",
-                    source_data=news,
-                    target_id=f"macro_{macro.get('indicator_id', hash(macro.get('indicatorName', '')))}",
-                    target_type="MacroIndicator", 
-                    target_data=macro,
-                    relationship_type="HAS_IMPACT_ON",
-                    confidence=analysis.get('confidence', 0),
-                    reasoning=analysis.get('reasoning', '')
-                )
-            
-            return None
-            
-        except Exception as e:
-            print(f" 뉴스-거시지표 분석 실패: {e}")
-            return None
-    
-    def _analyze_news_company_impact(self, news: Dict, company: Dict) -> Optional[RelationshipCandidate]:
-        """뉴스가 특정 기업에 미치는 영향 분석"""
-        
-        prompt = ChatPromptTemplate.from_template("""
+
+_COMPANY_IMPACT_PROMPT = ChatPromptTemplate.from_template("""
 당신은 제조업 전문 금융 애널리스트입니다. 다음 뉴스가 특정 제조기업에 미치는 영향을 분석하세요.
 
 === 뉴스 정보 ===
@@ -233,49 +152,408 @@ class EnhancedRelationshipGenerator:
   "urgency": "즉시/단기/중기/장기"
 }}
 """)
+
+def _read_json_head(file_path: str, limit: int) -> List[Dict]:
+    """JSON 배열 파일에서 앞쪽 limit개 항목만 읽기 (ijson이 있으면 필요한 만큼만 스트리밍 파싱)"""
+    if ijson is None:
+        if orjson is not None:
+            with open(file_path, 'rb') as f:
+                return orjson.loads(f.read())[:limit]
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)[:limit]
+    with open(file_path, 'rb') as f:
+        return list(islice(ijson.items(f, 'item', use_float=True), limit))
+
+# LLM 영향 분석에 필요한 최소 뉴스 본문 길이
+_MIN_NEWS_CONTENT_LENGTH = 30
+
+def _node_id(prefix: str, explicit_id: Optional[str], name: str) -> str:
+    """노드 ID 생성 (원본 ID가 없으면 이름의 BLAKE2b 다이제스트 사용, 실행 간 동일한 ID 보장)"""
+    if explicit_id:
+        return f"{prefix}_{explicit_id}"
+    return f"{prefix}_{blake2b(name.encode('utf-8'), digest_size=8).hexdigest()}"
+
+# 대상 이름/업종을 검색 용어로 나누는 구분자
+_TERM_SPLIT_PATTERN = re.compile(r"[\s,/()·\[\]'\"]+")
+
+def _search_pattern(*texts: str) -> Optional[re.Pattern]:
+    """대상 이름/업종 문자열의 검색 용어(한 글자 용어 제외)를 하나의 정규식으로 컴파일 (용어가 없으면 None)"""
+    terms = {
+        term for text in texts if isinstance(text, str)
+        for term in _TERM_SPLIT_PATTERN.split(text) if len(term) >= 2
+    }
+    if not terms:
+        return None
+    # 용어별 in 비교를 파이썬에서 반복하지 않고, 정규식 엔진이 뉴스 문자열을 한 번만 훑도록 alternation으로 결합
+    return re.compile("|".join(map(re.escape, sorted(terms))))
+
+def _mentions_any(news_text: str, pattern: Optional[re.Pattern]) -> bool:
+    """뉴스에 대상 용어가 하나라도 등장하는지 확인 (용어가 없는 대상은 판단하지 않고 통과)"""
+    # 한국어 복합어(예: "철강가격")도 잡도록 토큰 일치 대신 부분 문자열로 비교
+    return pattern is None or pattern.search(news_text) is not None
+
+# 분석 쌍마다 같은 dict 조회를 반복하지 않도록, 프롬프트/사전 필터에 쓰는 필드는 로드 직후 한 번만 추출
+@dataclass(frozen=True, slots=True)
+class _NewsView:
+    """뉴스 분석용 필드"""
+    data: Dict[str, Any]
+    node_id: str
+    title: str
+    publisher: str
+    date: str
+    content: str  # 본문(없으면 요약), LLM 전송 길이인 500자로 제한
+    keywords: Tuple[str, ...]
+    category: str
+    search_text: str  # 사전 필터용 제목/키워드/본문 결합 문자열
+    analyzable: bool  # 제목이 있고 본문이 최소 길이 이상인지
+
+@dataclass(frozen=True, slots=True)
+class _MacroView:
+    """거시지표 분석용 필드"""
+    data: Dict[str, Any]
+    node_id: str
+    name: str
+    value: Any
+    type: str
+    search_pattern: Optional[re.Pattern]
+
+@dataclass(frozen=True, slots=True)
+class _CompanyView:
+    """기업 분석용 필드"""
+    data: Dict[str, Any]
+    node_id: str
+    name: str
+    sector: str
+    business: str
+    revenue: str
+    location: str
+    search_pattern: Optional[re.Pattern]
+
+def _news_view(news: Dict) -> _NewsView:
+    title = news.get('title', '') or ''
+    content = news.get('content', news.get('summary', '')) or ''
+    raw_keywords = news.get('keywords', '') or ''
+    return _NewsView(
+        data=news,
+        node_id=news.get('nodeId') or _node_id("news", news.get('news_id'), title),
+        title=title,
+        publisher=news.get('media', news.get('publisher', '')),
+        date=news.get('date', news.get('publishDate', '')),
+        content=content[:500],
+        keywords=tuple(raw_keywords.split(',')) if raw_keywords else (),
+        category=news.get('category', ''),
+        search_text=" ".join((title, raw_keywords, content[:500])),
+        analyzable=bool(title) and len(content.strip()) >= _MIN_NEWS_CONTENT_LENGTH
+    )
+
+def _macro_view(macro: Dict) -> _MacroView:
+    name = macro.get('indicatorName', '')
+    return _MacroView(
+        data=macro,
+        node_id=macro.get('nodeId') or _node_id("macro", macro.get('indicator_id'), name),
+        name=name,
+        value=macro.get('value', macro.get('currentValue', '')),
+        type=macro.get('type', macro.get('unit', '')),
+        search_pattern=_search_pattern(name, macro.get('type', ''), macro.get('category', ''))
+    )
+
+def _company_view(company: Dict) -> _CompanyView:
+    name = company.get('companyName', '')
+    sector = company.get('sector', company.get('industry', ''))
+    business = company.get('mainBusiness', '')
+    return _CompanyView(
+        data=company,
+        node_id=company.get('nodeId') or _node_id("company", company.get('company_id'), name),
+        name=name,
+        sector=sector,
+        business=business,
+        revenue=company.get('revenue', ''),
+        location=company.get('location', ''),
+        search_pattern=_search_pattern(name, sector, business)
+    )
+
+logger = logging.getLogger(__name__)
+
+# 라벨별 자연 키 (nodeId가 없는 노드는 이 속성으로 조회, 예: 원자재 수집기가 만든 MacroIndicator)
+_NATURAL_KEYS = {
+    "NewsArticle": "title",
+    "MacroIndicator": "indicatorName",
+    "ReferenceCompany": "companyName",
+}
+
+# (대상 라벨, 뉴스 조회 키, 대상 조회 키)별 영향 관계 생성 쿼리
+# 라벨과 조회 키를 쿼리에 고정해 라벨 없는 전체 노드 스캔 대신 인덱스 조회를 쓰고,
+# MERGE로 재실행 시에도 관계가 중복 생성되지 않도록 함
+_IMPACT_WRITE_QUERIES = {
+    (label, source_key, target_key): f"""
+    UNWIND $rows AS row
+    MATCH (source:NewsArticle {{{source_key}: row.sourceKey}})
+    MATCH (target:{label} {{{target_key}: row.targetKey}})
+    MERGE (source)-[r:HAS_IMPACT_ON]->(target)
+    ON CREATE SET r.createdAt = datetime()
+    SET r += row.props
+    RETURN count(r) as created
+    """
+    for label in ("MacroIndicator", "ReferenceCompany")
+    for source_key in ("nodeId", _NATURAL_KEYS["NewsArticle"])
+    for target_key in ("nodeId", _NATURAL_KEYS[label])
+}
+
+def _match_key(label: str, data: Dict[str, Any]) -> Tuple[str, Any]:
+    """노드 조회 (속성, 값) 쌍 (nodeId가 있으면 nodeId, 없으면 라벨별 자연 키)"""
+    if data.get('nodeId'):
+        return "nodeId", data['nodeId']
+    key = _NATURAL_KEYS.get(label, "nodeId")
+    return key, data.get(key)
+
+# LLM 영향 분석 결과 캐시 파일
+_ANALYSIS_CACHE_PATH = "data/cache/news_impact_analysis.sqlite3"
+
+# 영향 분석 모델 설정 (캐시 키에도 포함해 설정이 바뀌면 이전 분석 결과를 재사용하지 않음)
+_GEMINI_MODEL = "gemini-2.0-flash-exp"
+_GEMINI_TEMPERATURE = 0.1
+
+class _AnalysisCache:
+    """프롬프트 다이제스트 → 분석 결과(JSON) SQLite 캐시 (분석 스레드 간 공유)"""
+    
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS analysis (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM analysis WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO analysis (key, value) VALUES (?, ?)", (key, value))
+            self._conn.commit()
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class EnhancedRelationshipGenerator:
+    """LLM 기반 정교한 관계 생성기"""
+    
+    def __init__(self):
+        try:
+            self.neo4j_manager = Neo4jManager()
+            self._ensure_node_id_indexes()
+        except Exception as e:
+            print(f"️ Neo4j 연결 실패: {e}")
+            self.neo4j_manager = None
+        
+        # 뉴스-대상 쌍 분석 시 동시에 보낼 LLM 요청 수 (Gemini 호출 한도에 맞춰 조정)
+        self.max_concurrent_requests = 16
+        
+        # Google Gemini 설정
+        google_api_key = os.getenv("GOOGLE_API_KEY")
+        if google_api_key:
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            from google.api_core.exceptions import ResourceExhausted
+            self.llm = ChatGoogleGenerativeAI(
+                model=_GEMINI_MODEL,
+                temperature=_GEMINI_TEMPERATURE,
+                google_api_key=google_api_key
+            )
+            print(" Enhanced Relationship Generator with Gemini 2.0 Flash")
+            
+            # 응답의 JSON(코드블럭 포함)을 dict로 파싱하는 체인 (결과는 호출부에서 분석 스키마로 검증)
+            # 동시 요청 중 호출 한도 초과(429) 응답은 쌍을 누락시키지 않도록 지수 백오프로 재시도
+            self.impact_analysis_chain = self.llm.with_retry(
+                retry_if_exception_type=(ResourceExhausted,),
+                wait_exponential_jitter=True,
+                stop_after_attempt=5
+            ) | JsonOutputParser()
+        else:
+            raise ValueError("GOOGLE_API_KEY 환경변수가 필요합니다")
+        
+        # 프롬프트별 LLM 분석 결과 캐시 (재실행 시 같은 입력은 LLM 호출 없이 재사용)
+        self.analysis_cache = _AnalysisCache(_ANALYSIS_CACHE_PATH)
+    
+    def close(self):
+        """분석 캐시 및 Neo4j 연결 정리"""
+        self.analysis_cache.close()
+        if self.neo4j_manager:
+            self.neo4j_manager.close()
+    
+    def _ensure_node_id_indexes(self):
+        """관계 생성 시 노드 조회에 쓰는 nodeId 인덱스 생성 (이미 있으면 그대로 둠)"""
+        for label in ("NewsArticle", "MacroIndicator", "ReferenceCompany"):
+            self.neo4j_manager.execute_query(
+                f"CREATE INDEX {label.lower()}_node_id IF NOT EXISTS FOR (n:{label}) ON (n.nodeId)"
+            )
+    
+    def create_news_impact_relationships(self) -> Dict[str, Any]:
+        """뉴스 → 거시지표/기업 영향 관계 생성"""
+        print(" 뉴스 영향 관계 생성 시작...")
+        
+        # 1. 뉴스와 거시지표 데이터 로드
+        news_data = self._load_news_articles()
+        macro_data = self._load_macro_indicators()
+        company_data = self._load_companies()
+        
+        print(f" 로드된 데이터: 뉴스 {len(news_data)}개, 거시지표 {len(macro_data)}개, 기업 {len(company_data)}개")
+        
+        # 2~3. 뉴스 → 거시지표 / 뉴스 → 기업 영향 분석
+        # 쌍별 LLM 호출은 서로 독립적인 I/O 대기이므로 동시에 요청 (결과는 쌍 순서대로 수집)
+        target_news = news_data[:10]  # 테스트를 위해 10개만
+        target_companies = company_data[:5]  # 상위 5개 기업
+        
+        news_views = [_news_view(news) for news in target_news]
+        macro_views = [_macro_view(macro) for macro in macro_data]
+        company_views = [_company_view(company) for company in target_companies]
+        
+        # 대상의 이름/업종 용어가 뉴스에 하나도 나오지 않는 쌍은 무관련(0.0)으로 보고 LLM 호출 생략
+        macro_pairs = [
+            (news, macro)
+            for news in news_views
+            for macro in macro_views
+            if _mentions_any(news.search_text, macro.search_pattern)
+        ]
+        company_pairs = [
+            (news, company)
+            for news in news_views
+            for company in company_views
+            if _mentions_any(news.search_text, company.search_pattern)
+        ]
+        
+        total_pairs = len(news_views) * (len(macro_views) + len(company_views))
+        print(f" 키워드 사전 필터: {total_pairs}개 쌍 중 {len(macro_pairs) + len(company_pairs)}개 LLM 분석")
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_requests) as executor:
+            macro_results = executor.map(lambda pair: self._analyze_news_macro_impact(*pair), macro_pairs)
+            company_results = executor.map(lambda pair: self._analyze_news_company_impact(*pair), company_pairs)
+            
+            news_macro_relationships = [
+                relationship for relationship in macro_results
+                if relationship and relationship.confidence > 0.3
+            ]
+            news_company_relationships = [
+                relationship for relationship in company_results
+                if relationship and relationship.confidence > 0.3
+            ]
+        
+        # 4. Neo4j에 관계 생성
+        created_relationships = {
+            "news_macro": 0,
+            "news_company": 0,
+            "total": 0
+        }
+        
+        if self.neo4j_manager:
+            created_relationships["news_macro"] = self._create_relationships_in_neo4j(news_macro_relationships)
+            created_relationships["news_company"] = self._create_relationships_in_neo4j(news_company_relationships)
+            created_relationships["total"] = created_relationships["news_macro"] + created_relationships["news_company"]
+        
+        return {
+            "relationships_analyzed": len(news_macro_relationships) + len(news_company_relationships),
+            "relationships_created": created_relationships,
+            "news_macro_candidates": len(news_macro_relationships),
+            "news_company_candidates": len(news_company_relationships)
+        }
+    
+    def _analyze_news_macro_impact(self, news: _NewsView, macro: _MacroView) -> Optional[RelationshipCandidate]:
+        """뉴스가 거시지표에 미치는 영향 분석"""
+        
+        # 본문이 없거나 너무 짧은 뉴스는 의미 있는 관계가 나올 수 없으므로 LLM 호출 생략
+        if not news.analyzable:
+            return None
         
         try:
-            formatted_prompt = prompt.format(
-                news_title=news.get('title', ''),
-                news_content=news.get('content', news.get('summary', ''))[:300],
-                news_keywords=', '.join(news.get('keywords', '').split(',')[:8]) if news.get('keywords') else '',
-                news_category=news.get('category', ''),
-                company_name=company.get('companyName', ''),
-                company_sector=company.get('sector', company.get('industry', '')),
-                company_business=company.get('mainBusiness', ''),
-                company_revenue=company.get('revenue', ''),
-                company_location=company.get('location', '')
+            formatted_prompt = _MACRO_IMPACT_PROMPT.format(
+                news_title=news.title,
+                news_publisher=news.publisher,
+                news_date=news.date,
+                news_content=news.content,
+                news_keywords=', '.join(news.keywords[:10]),
+                macro_name=macro.name,
+                macro_value=macro.value,
+                macro_type=macro.type
             )
             
-            response = self.llm.invoke([HumanMessage(content=formatted_prompt)])
-            response_text = response.content.strip()
+            analysis = self._invoke_cached(NewsMacroImpact, formatted_prompt)
             
-            if response_text.startswith('```json'):
-                response_text = response_text[7:-3].strip()
-            elif response_text.startswith('```'):
-                response_text = response_text[3:-3].strip()
+            if analysis and analysis.has_impact and analysis.confidence > 0.3:
+                return RelationshipCandidate(
+                    source_id=news.node_id,
+                    source_type="NewsArticle",
+                    source_data=news.data,
+                    target_id=macro.node_id,
+                    target_type="MacroIndicator", 
+                    target_data=macro.data,
+                    relationship_type="HAS_IMPACT_ON",
+                    confidence=analysis.confidence,
+                    reasoning=analysis.reasoning
+                )
+            
+            return None
+            
+        except Exception as e:
+            logger.warning(" 뉴스-거시지표 분석 실패: %s", e)
+            return None
+    
+    def _analyze_news_company_impact(self, news: _NewsView, company: _CompanyView) -> Optional[RelationshipCandidate]:
+        """뉴스가 특정 기업에 미치는 영향 분석"""
+        
+        # 본문이 없거나 너무 짧은 뉴스는 의미 있는 관계가 나올 수 없으므로 LLM 호출 생략
+        if not news.analyzable:
+            return None
+        
+        try:
+            formatted_prompt = _COMPANY_IMPACT_PROMPT.format(
+                news_title=news.title,
+                news_content=news.content[:300],
+                news_keywords=', '.join(news.keywords[:8]),
+                news_category=news.category,
+                company_name=company.name,
+                company_sector=company.sector,
+                company_business=company.business,
+                company_revenue=company.revenue,
+                company_location=company.location
+            )
             
-            analysis = json.loads(response_text)
+            analysis = self._invoke_cached(NewsCompanyImpact, formatted_prompt)
             
-            if analysis.get('has_impact', False) and analysis.get('confidence', 0) > 0.3:
+            if analysis and analysis.has_impact and analysis.confidence > 0.3:
                 return RelationshipCandidate(
-                    source_id=f"news_{news.get('news_id', hash(news.get('title', '')))}",
+                    source_id=news.node_id,
                     source_type="NewsArticle",
-                    source_data=news,
-                    target_id=f"company_{company.get('company_id', hash(company.get('companyName', '')))}",
+                    source_data=news.data,
+                    target_id=company.node_id,
                     target_type="ReferenceCompany",
-                    target_data=company,
+                    target_data=company.data,
                     relationship_type="HAS_IMPACT_ON",
-                    confidence=analysis.get('confidence', 0),
-                    reasoning=analysis.get('reasoning', '')
+                    confidence=analysis.confidence,
+                    reasoning=analysis.reasoning
                 )
             
             return None
             
         except Exception as e:
-            print(f" 뉴스-기업 분석 실패: {e}")
+            logger.warning(" 뉴스-기업 분석 실패: %s", e)
             return None
     
+    def _invoke_cached(self, schema: type, formatted_prompt: str) -> Optional[ImpactAnalysis]:
+        """같은 프롬프트의 분석 결과는 디스크 캐시에서 재사용하고, 없을 때만 LLM 호출"""
+        key_source = f"{_GEMINI_MODEL}\ntemperature={_GEMINI_TEMPERATURE}\n{schema.__name__}\n{formatted_prompt}"
+        key = blake2b(key_source.encode('utf-8')).hexdigest()
+        cached = self.analysis_cache.get(key)
+        if cached is not None:
+            return schema.model_validate_json(cached)
+        
+        parsed = self.impact_analysis_chain.invoke([HumanMessage(content=formatted_prompt)])
+        if not isinstance(parsed, dict):
+            return None
+        analysis = schema.model_validate(parsed)
+        self.analysis_cache.set(key, analysis.model_dump_json())
+        return analysis
+    
     def _load_news_articles(self) -> List[Dict]:
         """뉴스 데이터 로드"""
         try:
@@ -292,13 +570,15 @@ class EnhancedRelationshipGenerator:
                     "data/processed/news_policy_20250813.json"
                 ]
                 
+                limit = 15  # 테스트용으로 15개만
                 all_news = []
                 for file_path in news_files:
+                    if len(all_news) >= limit:
+                        break
                     if os.path.exists(file_path):
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            all_news.extend(json.load(f))
+                        all_news.extend(_read_json_head(file_path, limit - len(all_news)))
                 
-                return all_news[:15]  # 테스트용으로 15개만
+                return all_news
                 
         except Exception as e:
             print(f" 뉴스 로드 실패: {e}")
@@ -365,43 +645,61 @@ class EnhancedRelationshipGenerator:
         if not self.neo4j_manager or not relationships:
             return 0
         
-        created_count = 0
+        # 같은 (뉴스, 대상) 쌍이 여러 번 분석된 경우(제목이 같은 뉴스 등) 신뢰도가 가장 높은 후보만 기록
+        best_by_pair = {}
         for rel in relationships:
-            try:
-                # 소스와 타겟 노드 존재 확인 및 관계 생성
-                query = """
-                MATCH (source), (target)
-                WHERE (source:NewsArticle AND source.title = $source_title)
-                  AND ((target:MacroIndicator AND target.indicatorName = $target_name)
-                       OR (target:ReferenceCompany AND target.companyName = $target_name))
-                CREATE (source)-[r:HAS_IMPACT_ON {
-                    impactScore: $impact_score,
-                    confidence: $confidence,
-                    rationale: $reasoning,
-                    createdAt: datetime()
-                }]->(target)
-                RETURN count(r) as created
-                """
-                
-                params = {
-                    "source_title": rel.source_data.get('title', ''),
-                    "target_name": rel.target_data.get('indicatorName', rel.target_data.get('companyName', '')),
-                    "impact_score": rel.confidence,
+            key = (rel.source_id, rel.target_id)
+            if key not in best_by_pair or rel.confidence > best_by_pair[key].confidence:
+                best_by_pair[key] = rel
+        
+        # 대상 라벨/조회 키별로 행을 나눠 라벨과 키가 고정된 쿼리로 기록
+        rows_by_query = {}
+        for rel in best_by_pair.values():
+            source_key, source_value = _match_key(rel.source_type, rel.source_data)
+            target_key, target_value = _match_key(rel.target_type, rel.target_data)
+            rows_by_query.setdefault((rel.target_type, source_key, target_key), []).append({
+                "sourceKey": source_value,
+                "targetKey": target_value,
+                "props": {
+                    "impactScore": rel.confidence,
                     "confidence": rel.confidence,
-                    "reasoning": rel.reasoning
+                    "rationale": rel.reasoning
                 }
-                
-                result = self.neo4j_manager.execute_query(query, params)
-                if result and result[0].get('created', 0) > 0:
-                    created_count += 1
-                    
-            except Exception as e:
-                print(f" 관계 생성 실패: {e}")
+            })
+        
+        created_count = 0
+        for query_key, rows in rows_by_query.items():
+            label = query_key[0]
+            query = _IMPACT_WRITE_QUERIES.get(query_key)
+            if query is None:
+                logger.warning(" 지원하지 않는 대상 라벨: %s (%d개 관계 건너뜀)", label, len(rows))
                 continue
+            
+            # 그룹별 관계 전체를 쿼리 하나(트랜잭션 하나)로 생성하고, 롤백되면 관계별로 재시도
+            result = self.neo4j_manager.execute_write(query, {"rows": rows})
+            if result:
+                created = result[0].get('created', 0)
+            else:
+                created = 0
+                for row in rows:
+                    result = self.neo4j_manager.execute_write(query, {"rows": [row]})
+                    if result:
+                        created += result[0].get('created', 0)
+                    else:
+                        logger.warning(" 관계 생성 실패: %s → %s", row['sourceKey'], row['targetKey'])
+            
+            # 양 끝 노드를 찾지 못한 행은 MATCH에서 걸러지므로 누락 건수를 따로 기록
+            if created < len(rows):
+                logger.warning(" %s: %d개 관계의 양 끝 노드를 찾지 못함", label, len(rows) - created)
+            created_count += created
         
         return created_count
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     generator = EnhancedRelationshipGenerator()
-    result = generator.create_news_impact_relationships()
-    print(f" 관계 생성 완료: {result}")
\ No newline at end of file
+    try:
+        result = generator.create_news_impact_relationships()
+        print(f" 관계 생성 완료: {result}")
+    finally:
+        generator.close()
\ No newline at end of file
@@ -6,45 +6,208 @@ KB Fortress AI - Enhanced Relationship Management
 
 import os
 import sys
-from typing import Dict, Any, List
+import uuid
+from hashlib import blake2b
+from typing import Dict, Any, List, Literal
 from datetime import datetime
 
 sys.path.append(os.path.join(os.path.dirname(__file__)))
 from neo4j_manager import Neo4jManager
 
+# 이전 버전은 분 단위 시각으로 eventId를 만들어 같은 분에 발생한 서로 다른 이벤트가 같은 ID를 가질 수 있음
+# → 유일성 제약조건 생성 전에 중복 ID 중 가장 먼저 생긴 노드만 원래 ID를 유지하고 나머지는 접미사를 붙여 분리
+# (서로 다른 이벤트이므로 병합하지 않으며, 노드와 관계는 그대로 보존)
+_RISK_EVENT_DEDUP_QUERY = """
+MATCH (e:RiskEvent)
+WHERE e.eventId IS NOT NULL
+WITH e ORDER BY e.occurredAt
+WITH e.eventId AS event_id, collect(e) AS events
+WHERE size(events) > 1
+UNWIND range(1, size(events) - 1) AS i
+WITH events[i] AS e, event_id, i
+SET e.eventId = event_id + '_dup' + toString(i)
+RETURN count(e) AS renamed
+"""
+
+# 리포트/이벤트 조회 키 제약조건 및 인덱스 (MATCH/MERGE가 라벨 스캔 대신 인덱스 조회를 사용)
+# UserCompany는 기업 등록 시 같은 이름으로 다시 CREATE될 수 있으므로 유일성 제약 대신 일반 인덱스 사용
+_SCHEMA_STATEMENTS = (
+    "CREATE INDEX user_company_name IF NOT EXISTS FOR (u:UserCompany) ON (u.companyName)",
+    "CREATE CONSTRAINT analysis_report_id IF NOT EXISTS FOR (a:AnalysisReport) REQUIRE a.reportId IS UNIQUE",
+    "CREATE CONSTRAINT alert_report_id IF NOT EXISTS FOR (a:AlertReport) REQUIRE a.alertId IS UNIQUE",
+    "CREATE CONSTRAINT risk_event_id IF NOT EXISTS FOR (e:RiskEvent) REQUIRE e.eventId IS UNIQUE",
+)
+
+# 리포트 생성 방식별 쿼리 (두 방식 모두 리포트 노드를 한 번만 만든 뒤 같은 이름의 기업마다 관계 연결)
+# CREATE: ID가 생성 시각+기업명으로 매번 새로 만들어지므로 중복 검사(MERGE) 없이 바로 생성 (UserCompany 잠금 경합 최소화)
+# MERGE: 같은 ID로 다시 적재하는 경우 리포트 노드와 ID를 담은 관계를 재사용해 중복 생성 방지
+_INITIAL_REPORT_QUERIES = {
+    'CREATE': """
+    CREATE (ar:AnalysisReport {
+        reportId: $report_id,
+        reportType: 'INITIAL',
+        generatedAt: datetime(),
+        reportPath: $report_path,
+        riskLevel: $risk_level,
+        companyName: $company_name,
+        summary: $summary,
+        confidence: $confidence
+    })
+    WITH ar
+    MATCH (u:UserCompany {companyName: $company_name})
+    CREATE (u)-[:HAS_INITIAL_REPORT {
+        generatedAt: datetime(),
+        reportType: 'INITIAL',
+        accessCount: 0,
+        lastAccessed: null
+    }]->(ar)
+    RETURN count(*) as created
+    """,
+    'MERGE': """
+    MERGE (ar:AnalysisReport {reportId: $report_id})
+    ON CREATE SET ar.reportType = 'INITIAL',
+                  ar.generatedAt = datetime(),
+                  ar.reportPath = $report_path,
+                  ar.riskLevel = $risk_level,
+                  ar.companyName = $company_name,
+                  ar.summary = $summary,
+                  ar.confidence = $confidence
+    WITH ar
+    MATCH (u:UserCompany {companyName: $company_name})
+    MERGE (u)-[r:HAS_INITIAL_REPORT {reportId: $report_id}]->(ar)
+    ON CREATE SET r.generatedAt = datetime(),
+                  r.reportType = 'INITIAL',
+                  r.accessCount = 0
+    RETURN count(*) as created
+    """,
+}
+
+# 같은 이벤트의 알림은 여러 기업에 걸쳐 하나의 RiskEvent를 공유하므로 생성 방식과 관계없이 eventId로 MERGE
+_RISK_EVENT_CLAUSE = """
+    MERGE (re:RiskEvent {eventId: $event_id})
+    ON CREATE SET re.eventType = $event_type,
+                  re.title = $title,
+                  re.description = $description,
+                  re.severity = $severity,
+                  re.occurredAt = datetime()
+"""
+
+_ALERT_REPORT_QUERIES = {
+    'CREATE': _RISK_EVENT_CLAUSE + """
+    CREATE (ar:AlertReport {
+        alertId: $alert_id,
+        reportType: 'ALERT',
+        generatedAt: datetime(),
+        reportPath: $report_path,
+        triggeredBy: $title,
+        severity: $severity,
+        companyName: $company_name,
+        estimatedImpact: $estimated_impact,
+        actionRequired: $action_required
+    })
+    WITH re, ar
+    MATCH (u:UserCompany {companyName: $company_name})
+    CREATE (u)-[:RECEIVED_ALERT {
+        receivedAt: datetime(),
+        isRead: false,
+        urgency: $urgency,
+        responseDeadline: datetime() + duration('P7D')  // 7일 후
+    }]->(ar)
+    CREATE (re)-[:AFFECTS {
+        impactLevel: $impact_level,
+        estimatedCost: $estimated_cost,
+        rationale: $rationale,
+        affectedAt: datetime()
+    }]->(u)
+    RETURN count(*) as created
+    """,
+    'MERGE': _RISK_EVENT_CLAUSE + """
+    MERGE (ar:AlertReport {alertId: $alert_id})
+    ON CREATE SET ar.reportType = 'ALERT',
+                  ar.generatedAt = datetime(),
+                  ar.reportPath = $report_path,
+                  ar.triggeredBy = $title,
+                  ar.severity = $severity,
+                  ar.companyName = $company_name,
+                  ar.estimatedImpact = $estimated_impact,
+                  ar.actionRequired = $action_required
+    WITH re, ar
+    MATCH (u:UserCompany {companyName: $company_name})
+    MERGE (u)-[r:RECEIVED_ALERT {alertId: $alert_id}]->(ar)
+    ON CREATE SET r.receivedAt = datetime(),
+                  r.isRead = false,
+                  r.urgency = $urgency,
+                  r.responseDeadline = datetime() + duration('P7D')  // 7일 후
+    MERGE (re)-[i:AFFECTS {alertId: $alert_id}]->(u)
+    ON CREATE SET i.impactLevel = $impact_level,
+                  i.estimatedCost = $estimated_cost,
+                  i.rationale = $rationale,
+                  i.affectedAt = datetime()
+    RETURN count(*) as created
+    """,
+}
+
+def make_event_id(event_data: Dict[str, Any]) -> str:
+    """리스크 이벤트 ID 생성
+    
+    event_id가 주어지면 그대로 사용하고, 발생 시각(occurred_at)이 있으면 유형/제목/시각의 다이제스트로,
+    둘 다 없으면 uuid로 생성. 여러 기업에 같은 이벤트를 알릴 때는 호출 전에 한 번 만들어 event_data에 담아 전달
+    """
+    if event_data.get('event_id'):
+        return event_data['event_id']
+    occurred_at = event_data.get('occurred_at')
+    if occurred_at:
+        key = f"{event_data.get('event_type', '')}\n{event_data.get('title', '')}\n{occurred_at}"
+        return f"event_{blake2b(key.encode('utf-8'), digest_size=8).hexdigest()}"
+    return f"event_{uuid.uuid4().hex}"
+
 class EnhancedRelationshipManager:
     """고급 관계 관리자"""
     
+    # 프로세스 내에서 제약조건/인덱스 생성을 이미 시도했는지 여부 (실패해도 매 호출마다 재시도하지 않음)
+    _schema_checked = False
+    
     def __init__(self):
         # Neo4j 연결
         os.environ['NEO4J_URI'] = 'neo4j://localhost:7687'
         os.environ['NEO4J_USER'] = 'neo4j'
         os.environ['NEO4J_PASSWORD'] = r'ehdgusdl11!'
         self.neo4j_manager = Neo4jManager()
+        self._ensure_schema()
         
-    def create_initial_report_relationship(self, company_name: str, report_data: Dict[str, Any]) -> bool:
-        """최초 분석 리포트 관계 생성"""
+    def _ensure_schema(self):
+        """리포트/이벤트 제약조건 및 인덱스 생성 (프로세스당 한 번만 시도, 이미 있으면 그대로 둠)"""
+        if EnhancedRelationshipManager._schema_checked:
+            return
+        EnhancedRelationshipManager._schema_checked = True
         
-        # 먼저 AnalysisReport 노드 생성
-        create_report_query = """
-        CREATE (ar:AnalysisReport {
-            reportId: $report_id,
-            reportType: 'INITIAL',
-            generatedAt: datetime(),
-            reportPath: $report_path,
-            riskLevel: $risk_level,
-            companyName: $company_name,
-            summary: $summary,
-            confidence: $confidence
-        })
-        RETURN ar.reportId as reportId
-        """
+        # execute_query는 오류를 삼키므로 세션에서 직접 실행해 실패 여부 확인
+        with self.neo4j_manager.open_session() as session:
+            try:
+                renamed = session.run(_RISK_EVENT_DEDUP_QUERY).single()['renamed']
+                if renamed:
+                    print(f" 중복 eventId를 가진 RiskEvent {renamed}개의 ID 분리")
+            except Exception as e:
+                print(f" RiskEvent 중복 ID 정리 실패: {e}")
+            
+            # 실패한 제약조건은 기존 데이터를 정리한 뒤 프로세스를 재시작하면 다시 생성됨
+            for statement in _SCHEMA_STATEMENTS:
+                try:
+                    session.run(statement).consume()
+                except Exception as e:
+                    print(f" 제약조건/인덱스 생성 실패: {statement} ({e})")
+    
+    def create_initial_report_relationship(self, company_name: str, report_data: Dict[str, Any],
+                                           creation_mode: Literal['CREATE', 'MERGE'] = 'CREATE') -> bool:
+        """최초 분석 리포트 관계 생성 (creation_mode='MERGE'면 같은 reportId 재적재 시 기존 리포트/관계 재사용)"""
         
-        report_id = f"initial_{company_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        if creation_mode not in _INITIAL_REPORT_QUERIES:
+            raise ValueError(f"지원하지 않는 생성 방식입니다: {creation_mode}")
+        
+        report_id = report_data.get('report_id') or f"initial_{company_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
         try:
-            # AnalysisReport 노드 생성
-            self.neo4j_manager.execute_query(create_report_query, {
+            result = self.neo4j_manager.execute_write(_INITIAL_REPORT_QUERIES[creation_mode], {
                 'report_id': report_id,
                 'report_path': report_data.get('report_path', ''),
                 'risk_level': report_data.get('risk_level', 'MEDIUM'),
@@ -53,24 +216,6 @@ class EnhancedRelationshipManager:
                 'confidence': report_data.get('confidence', 0.8)
             })
             
-            # UserCompany와 관계 생성
-            create_relationship_query = """
-            MATCH (u:UserCompany {companyName: $company_name}), 
-                  (ar:AnalysisReport {reportId: $report_id})
-            CREATE (u)-[:HAS_INITIAL_REPORT {
-                generatedAt: datetime(),
-                reportType: 'INITIAL',
-                accessCount: 0,
-                lastAccessed: null
-            }]->(ar)
-            RETURN count(*) as created
-            """
-            
-            result = self.neo4j_manager.execute_query(create_relationship_query, {
-                'company_name': company_name,
-                'report_id': report_id
-            })
-            
             success = result[0]['created'] > 0 if result else False
             print(f" {company_name} 최초 분석 리포트 관계 생성: {report_id}")
             
@@ -80,104 +225,38 @@ class EnhancedRelationshipManager:
             print(f" 최초 리포트 관계 생성 실패: {e}")
             return False
     
-    def create_alert_report_relationship(self, company_name: str, event_data: Dict[str, Any], alert_data: Dict[str, Any]) -> bool:
-        """알림 리포트 관계 생성"""
+    def create_alert_report_relationship(self, company_name: str, event_data: Dict[str, Any], alert_data: Dict[str, Any],
+                                         creation_mode: Literal['CREATE', 'MERGE'] = 'CREATE') -> bool:
+        """알림 리포트 관계 생성 (creation_mode='MERGE'면 같은 alertId 재적재 시 기존 리포트/관계 재사용)"""
         
-        # 먼저 RiskEvent 노드 생성 (없다면)
-        create_event_query = """
-        MERGE (re:RiskEvent {
-            eventId: $event_id,
-            eventType: $event_type,
-            title: $title,
-            description: $description,
-            severity: $severity,
-            occurredAt: datetime()
-        })
-        RETURN re.eventId as eventId
-        """
+        if creation_mode not in _ALERT_REPORT_QUERIES:
+            raise ValueError(f"지원하지 않는 생성 방식입니다: {creation_mode}")
         
-        event_id = f"event_{datetime.now().strftime('%Y%m%d_%H%M')}"
+        event_id = make_event_id(event_data)
+        alert_id = alert_data.get('alert_id') or f"alert_{company_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
         try:
-            # RiskEvent 노드 생성
-            self.neo4j_manager.execute_query(create_event_query, {
+            # RiskEvent(없다면) / AlertReport 노드와 RECEIVED_ALERT / AFFECTS 관계를 쿼리 하나(트랜잭션 하나)로 생성
+            result = self.neo4j_manager.execute_write(_ALERT_REPORT_QUERIES[creation_mode], {
                 'event_id': event_id,
                 'event_type': event_data.get('event_type', 'MARKET_CHANGE'),
                 'title': event_data.get('title', ''),
                 'description': event_data.get('description', ''),
-                'severity': event_data.get('severity', 'MEDIUM')
-            })
-            
-            # AlertReport 노드 생성
-            alert_id = f"alert_{company_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            
-            create_alert_query = """
-            CREATE (ar:AlertReport {
-                alertId: $alert_id,
-                reportType: 'ALERT',
-                generatedAt: datetime(),
-                reportPath: $report_path,
-                triggeredBy: $triggered_by,
-                severity: $severity,
-                companyName: $company_name,
-                estimatedImpact: $estimated_impact,
-                actionRequired: $action_required
-            })
-            RETURN ar.alertId as alertId
-            """
-            
-            self.neo4j_manager.execute_query(create_alert_query, {
+                'severity': event_data.get('severity', 'MEDIUM'),
                 'alert_id': alert_id,
                 'report_path': alert_data.get('report_path', ''),
-                'triggered_by': event_data.get('title', ''),
-                'severity': event_data.get('severity', 'MEDIUM'),
                 'company_name': company_name,
                 'estimated_impact': alert_data.get('estimated_impact', '분석 중'),
-                'action_required': alert_data.get('action_required', '전문가 상담 권장')
-            })
-            
-            # UserCompany - AlertReport 관계
-            create_alert_relationship_query = """
-            MATCH (u:UserCompany {companyName: $company_name}), 
-                  (ar:AlertReport {alertId: $alert_id})
-            CREATE (u)-[:RECEIVED_ALERT {
-                receivedAt: datetime(),
-                isRead: false,
-                urgency: $urgency,
-                responseDeadline: datetime() + duration('P7D')  // 7일 후
-            }]->(ar)
-            RETURN count(*) as created
-            """
-            
-            self.neo4j_manager.execute_query(create_alert_relationship_query, {
-                'company_name': company_name,
-                'alert_id': alert_id,
-                'urgency': 'HIGH' if event_data.get('severity') == 'HIGH' else 'MEDIUM'
-            })
-            
-            # RiskEvent - UserCompany 영향 관계
-            create_impact_query = """
-            MATCH (re:RiskEvent {eventId: $event_id}), 
-                  (u:UserCompany {companyName: $company_name})
-            CREATE (re)-[:AFFECTS {
-                impactLevel: $impact_level,
-                estimatedCost: $estimated_cost,
-                rationale: $rationale,
-                affectedAt: datetime()
-            }]->(u)
-            RETURN count(*) as created
-            """
-            
-            self.neo4j_manager.execute_query(create_impact_query, {
-                'event_id': event_id,
-                'company_name': company_name,
+                'action_required': alert_data.get('action_required', '전문가 상담 권장'),
+                'urgency': 'HIGH' if event_data.get('severity') == 'HIGH' else 'MEDIUM',
                 'impact_level': alert_data.get('impact_level', 'MEDIUM'),
                 'estimated_cost': alert_data.get('estimated_cost', 0),
                 'rationale': alert_data.get('rationale', '리스크 요인에 노출됨')
             })
             
+            success = result[0]['created'] > 0 if result else False
             print(f" {company_name} 알림 리포트 관계 생성: {alert_id}")
-            return True
+            return success
             
         except Exception as e:
             print(f" 알림 리포트 관계 생성 실패: {e}")
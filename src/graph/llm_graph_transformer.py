@@ -5,8 +5,10 @@ LLM 기반 지식그래프 변환기
 
 import json
 import os
+import re
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
+from collections import defaultdict
 from datetime import datetime
 import sys
 
@@ -17,6 +19,95 @@ from src.graph.schema import ReferenceCompany, UserCompany, NewsArticle, MacroIn
 
 from langchain_core.prompts import ChatPromptTemplate
 
+# LLM 응답 앞뒤의 ```json / ``` 코드블럭 표시
+_CODE_FENCE_PATTERN = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+
+# 쓰기 트랜잭션 하나에 담을 최대 행 수 (트랜잭션 메모리 부담 방지)
+_WRITE_CHUNK_SIZE = 10_000
+
+# apoc.periodic.iterate 사용 시 서버에서 한 번에 커밋할 행 수
+_PERIODIC_ITERATE_BATCH_SIZE = 1_000
+
+# 노드 타입별 MERGE 구문 (행 단위 row 기준, UNWIND로 감싸 여러 행을 한 번에 기록)
+_NODE_MERGE_STATEMENTS = {
+    "ReferenceCompany": """
+    MERGE (c:ReferenceCompany {nodeId: row.nodeId})
+    SET c.companyName = row.props.companyName,
+        c.sector = row.props.sector,
+        c.industryCode = row.props.industryCode,
+        c.revenue = row.props.revenue,
+        c.debtRatio = row.props.debtRatio,
+        c.variableRateExposure = row.props.variableRateExposure,
+        c.exportRatioPct = row.props.exportRatioPct,
+        c.createdAt = datetime()
+    """,
+    "NewsArticle": """
+    MERGE (n:NewsArticle {nodeId: row.nodeId})
+    SET n.title = row.props.title,
+        n.content = row.props.content,
+        n.publishDate = row.props.publishDate,
+        n.media = row.props.media,
+        n.summary = row.props.summary,
+        n.createdAt = datetime()
+    """,
+    "MacroIndicator": """
+    MERGE (m:MacroIndicator {nodeId: row.nodeId})
+    SET m.indicatorName = row.props.indicatorName,
+        m.value = row.props.value,
+        m.unit = row.props.unit,
+        m.changeRate = row.props.changeRate,
+        m.createdAt = datetime()
+    """,
+    "KB_Product": """
+    MERGE (p:KB_Product {nodeId: row.nodeId})
+    SET p.productName = row.props.productName,
+        p.productType = row.props.productType,
+        p.interestRate = row.props.interestRate,
+        p.loanLimit = row.props.loanLimit,
+        p.createdAt = datetime()
+    """,
+}
+
+# 관계 타입별 MERGE 구문 (양 끝 노드가 없는 행은 MATCH에서 제외되어 집계되지 않음)
+_RELATIONSHIP_MERGE_STATEMENTS = {
+    "IS_EXPOSED_TO": """
+    MATCH (c:ReferenceCompany {nodeId: row.sourceId})
+    MATCH (m:MacroIndicator {nodeId: row.targetId})
+    MERGE (c)-[r:IS_EXPOSED_TO]->(m)
+    SET r.exposureLevel = row.props.exposureLevel,
+        r.rationale = row.props.rationale,
+        r.riskType = row.props.riskType,
+        r.createdAt = datetime()
+    """,
+    "HAS_IMPACT_ON": """
+    MATCH (n:NewsArticle {nodeId: row.sourceId})
+    MATCH (target {nodeId: row.targetId})
+    MERGE (n)-[r:HAS_IMPACT_ON]->(target)
+    SET r.impactScore = row.props.impactScore,
+        r.impactDirection = row.props.impactDirection,
+        r.rationale = row.props.rationale,
+        r.createdAt = datetime()
+    """,
+    "IS_ELIGIBLE_FOR": """
+    MATCH (c:ReferenceCompany {nodeId: row.sourceId})
+    MATCH (target {nodeId: row.targetId})
+    MERGE (c)-[r:IS_ELIGIBLE_FOR]->(target)
+    SET r.eligibilityScore = row.props.eligibilityScore,
+        r.matchingConditions = row.props.matchingConditions,
+        r.recommendationReason = row.props.recommendationReason,
+        r.createdAt = datetime()
+    """,
+    "COMPETES_WITH": """
+    MATCH (c1:ReferenceCompany {nodeId: row.sourceId})
+    MATCH (c2:ReferenceCompany {nodeId: row.targetId})
+    MERGE (c1)-[r:COMPETES_WITH]->(c2)
+    SET r.similarityScore = row.props.similarityScore,
+        r.competitionType = row.props.competitionType,
+        r.commonFactors = row.props.commonFactors,
+        r.createdAt = datetime()
+    """,
+}
+
 @dataclass
 class ExtractedEntity:
     """추출된 엔터티"""
@@ -41,15 +132,24 @@ class LLMGraphTransformer:
             print(f"️  Neo4j 연결 실패, 오프라인 모드로 진행: {e}")
             self.neo4j_manager = None
         
+        # 관계 일괄 생성을 apoc.periodic.iterate에 맡길지 여부 (APOC 플러그인이 설치된 서버에서만 사용)
+        self.use_apoc_for_relationships = os.getenv("NEO4J_USE_APOC", "").lower() == "true"
+        
         # Google Gemini 2.5 사용
         google_api_key = os.getenv("GOOGLE_API_KEY")
         
         if google_api_key:
             from langchain_google_genai import ChatGoogleGenerativeAI
+            from google.api_core.exceptions import ResourceExhausted
+            # 고정 대기 없이 호출하고, 호출 한도 초과(429) 응답일 때만 지수 백오프로 재시도
             self.llm = ChatGoogleGenerativeAI(
                 model="gemini-2.5-pro",
                 google_api_key=google_api_key,
                 temperature=0.1
+            ).with_retry(
+                retry_if_exception_type=(ResourceExhausted,),
+                wait_exponential_jitter=True,
+                stop_after_attempt=5
             )
             print(" Google Gemini 2.5 Pro 사용")
         else:
@@ -130,6 +230,8 @@ class LLMGraphTransformer:
    - 실제 기업명을 그대로 사용하세요! "기업_1" 금지!
    - 한국어 정보는 원문 보존 필수
    - ID만 영문_underscore: news_bridge_economy_20250618, policy_sme_digital_support
+   - ReferenceCompany 노드 ID는 입력 데이터의 company_id를 그대로 사용
+   - "연결기업목록"의 기업은 이미 생성된 노드이므로 노드로 다시 만들지 말고, company_id로 관계만 연결
 
 2. **관계 생성 기준**:
    - 명확한 인과관계나 연관성이 있는 경우만
@@ -286,12 +388,7 @@ class LLMGraphTransformer:
             print(f" LLM 응답 미리보기: {response.content[:300]}...")
             
             # JSON 파싱 (코드블럭 제거)
-            content = response.content.strip()
-            if content.startswith('```json'):
-                content = content[7:]  # ```json 제거
-            if content.endswith('```'):
-                content = content[:-3]  # ``` 제거
-            content = content.strip()
+            content = _CODE_FENCE_PATTERN.sub('', response.content)
             
             extracted_graph = json.loads(content)
             
@@ -305,147 +402,84 @@ class LLMGraphTransformer:
             return {"nodes": [], "relationships": []}
     
     def create_nodes_in_neo4j(self, nodes: List[Dict]) -> Dict[str, int]:
-        """Neo4j에 노드 생성"""
+        """Neo4j에 노드 생성 (타입별로 묶어 UNWIND 청크 단위로 기록)"""
+        rows_by_type = defaultdict(list)
+        for node in nodes:
+            rows_by_type[node["type"]].append({"nodeId": node["id"], "props": node.get("properties", {})})
+        
+        return self._write_in_chunks(_NODE_MERGE_STATEMENTS, rows_by_type, "노드")
+    
+    def create_relationships_in_neo4j(self, relationships: List[Dict]) -> Dict[str, int]:
+        """Neo4j에 관계 생성 (타입별로 묶어 UNWIND 청크 단위로 기록)"""
+        rows_by_type = defaultdict(list)
+        for rel in relationships:
+            rows_by_type[rel["type"]].append({
+                "sourceId": rel["source_id"],
+                "targetId": rel["target_id"],
+                "props": rel.get("properties", {})
+            })
+        
+        if self.use_apoc_for_relationships:
+            return self._write_with_periodic_iterate(_RELATIONSHIP_MERGE_STATEMENTS, rows_by_type, "관계")
+        return self._write_in_chunks(_RELATIONSHIP_MERGE_STATEMENTS, rows_by_type, "관계")
+    
+    def _write_in_chunks(self, statements: Dict[str, str], rows_by_type: Dict[str, List[Dict]],
+                         label: str) -> Dict[str, int]:
+        """타입별 행 목록을 청크 단위 쓰기 트랜잭션으로 기록하고 타입별 기록 건수 반환"""
         created_counts = {}
         
-        for node in nodes:
-            node_type = node["type"]
-            node_id = node["id"]
-            properties = node["properties"]
+        for element_type, rows in rows_by_type.items():
+            statement = statements.get(element_type)
+            if statement is None:
+                print(f" 지원하지 않는 {label} 타입 ({element_type}): {len(rows)}개 건너뜀")
+                continue
             
+            query = f"UNWIND $rows AS row{statement}RETURN count(*) as written"
             try:
-                if node_type == "ReferenceCompany":
-                    query = """
-                    MERGE (c:ReferenceCompany {nodeId: $nodeId})
-                    SET c.companyName = $companyName,
-                        c.sector = $sector,
-                        c.industryCode = $industryCode,
-                        c.revenue = $revenue,
-                        c.debtRatio = $debtRatio,
-                        c.variableRateExposure = $variableRateExposure,
-                        c.exportRatioPct = $exportRatioPct,
-                        c.createdAt = datetime()
-                    """
-                    self.neo4j_manager.execute_query(query, {
-                        "nodeId": node_id,
-                        **properties
-                    })
-                
-                elif node_type == "NewsArticle":
-                    query = """
-                    MERGE (n:NewsArticle {nodeId: $nodeId})
-                    SET n.title = $title,
-                        n.content = $content,
-                        n.publishDate = $publishDate,
-                        n.media = $media,
-                        n.summary = $summary,
-                        n.createdAt = datetime()
-                    """
-                    self.neo4j_manager.execute_query(query, {
-                        "nodeId": node_id,
-                        **properties
-                    })
-                
-                elif node_type == "MacroIndicator":
-                    query = """
-                    MERGE (m:MacroIndicator {nodeId: $nodeId})
-                    SET m.indicatorName = $indicatorName,
-                        m.value = $value,
-                        m.unit = $unit,
-                        m.changeRate = $changeRate,
-                        m.createdAt = datetime()
-                    """
-                    self.neo4j_manager.execute_query(query, {
-                        "nodeId": node_id,
-                        **properties
-                    })
-                
-                elif node_type == "KB_Product":
-                    query = """
-                    MERGE (p:KB_Product {nodeId: $nodeId})
-                    SET p.productName = $productName,
-                        p.productType = $productType,
-                        p.interestRate = $interestRate,
-                        p.loanLimit = $loanLimit,
-                        p.createdAt = datetime()
-                    """
-                    self.neo4j_manager.execute_query(query, {
-                        "nodeId": node_id,
-                        **properties
-                    })
-                
-                created_counts[node_type] = created_counts.get(node_type, 0) + 1
-                
+                for start in range(0, len(rows), _WRITE_CHUNK_SIZE):
+                    result = self.neo4j_manager.execute_write(
+                        query, {"rows": rows[start:start + _WRITE_CHUNK_SIZE]}
+                    )
+                    written = result[0]["written"] if result else 0
+                    created_counts[element_type] = created_counts.get(element_type, 0) + written
+                    
             except Exception as e:
-                print(f" 노드 생성 오류 ({node_type}): {e}")
+                print(f" {label} 생성 오류 ({element_type}): {e}")
         
         return created_counts
     
-    def create_relationships_in_neo4j(self, relationships: List[Dict]) -> Dict[str, int]:
-        """Neo4j에 관계 생성"""
+    def _write_with_periodic_iterate(self, statements: Dict[str, str], rows_by_type: Dict[str, List[Dict]],
+                                     label: str) -> Dict[str, int]:
+        """타입별 행 목록을 apoc.periodic.iterate 호출 한 번으로 넘겨 서버에서 배치 커밋"""
+        # 같은 기업 노드에 관계가 몰리므로 잠금 경합을 피하기 위해 병렬 배치는 사용하지 않음
+        iterate_query = """
+        CALL apoc.periodic.iterate(
+            'UNWIND $rows AS row RETURN row',
+            $statement,
+            {batchSize: $batchSize, parallel: false, params: {rows: $rows}}
+        )
+        YIELD committedOperations, failedOperations, errorMessages
+        RETURN committedOperations as written, failedOperations as failed, errorMessages as errors
+        """
         created_counts = {}
         
-        for rel in relationships:
-            rel_type = rel["type"]
-            source_id = rel["source_id"]
-            target_id = rel["target_id"]
-            properties = rel.get("properties", {})
+        for element_type, rows in rows_by_type.items():
+            statement = statements.get(element_type)
+            if statement is None:
+                print(f" 지원하지 않는 {label} 타입 ({element_type}): {len(rows)}개 건너뜀")
+                continue
             
-            try:
-                if rel_type == "IS_EXPOSED_TO":
-                    query = """
-                    MATCH (c:ReferenceCompany {nodeId: $sourceId})
-                    MATCH (m:MacroIndicator {nodeId: $targetId})
-                    MERGE (c)-[r:IS_EXPOSED_TO]->(m)
-                    SET r.exposureLevel = $exposureLevel,
-                        r.rationale = $rationale,
-                        r.riskType = $riskType,
-                        r.createdAt = datetime()
-                    """
-                    
-                elif rel_type == "HAS_IMPACT_ON":
-                    query = """
-                    MATCH (n:NewsArticle {nodeId: $sourceId})
-                    MATCH (target {nodeId: $targetId})
-                    MERGE (n)-[r:HAS_IMPACT_ON]->(target)
-                    SET r.impactScore = $impactScore,
-                        r.impactDirection = $impactDirection,
-                        r.rationale = $rationale,
-                        r.createdAt = datetime()
-                    """
-                
-                elif rel_type == "IS_ELIGIBLE_FOR":
-                    query = """
-                    MATCH (c:ReferenceCompany {nodeId: $sourceId})
-                    MATCH (target {nodeId: $targetId})
-                    MERGE (c)-[r:IS_ELIGIBLE_FOR]->(target)
-                    SET r.eligibilityScore = $eligibilityScore,
-                        r.matchingConditions = $matchingConditions,
-                        r.recommendationReason = $recommendationReason,
-                        r.createdAt = datetime()
-                    """
-                
-                elif rel_type == "COMPETES_WITH":
-                    query = """
-                    MATCH (c1:ReferenceCompany {nodeId: $sourceId})
-                    MATCH (c2:ReferenceCompany {nodeId: $targetId})
-                    MERGE (c1)-[r:COMPETES_WITH]->(c2)
-                    SET r.similarityScore = $similarityScore,
-                        r.competitionType = $competitionType,
-                        r.commonFactors = $commonFactors,
-                        r.createdAt = datetime()
-                    """
-                
-                self.neo4j_manager.execute_query(query, {
-                    "sourceId": source_id,
-                    "targetId": target_id,
-                    **properties
-                })
-                
-                created_counts[rel_type] = created_counts.get(rel_type, 0) + 1
-                
-            except Exception as e:
-                print(f" 관계 생성 오류 ({rel_type}): {e}")
+            result = self.neo4j_manager.execute_query(iterate_query, {
+                "statement": statement,
+                "rows": rows,
+                "batchSize": _PERIODIC_ITERATE_BATCH_SIZE
+            })
+            if not result:
+                continue
+            
+            created_counts[element_type] = result[0]["written"]
+            if result[0]["failed"]:
+                print(f" {label} 생성 오류 ({element_type}): {result[0]['failed']}개 실패 - {result[0]['errors']}")
         
         return created_counts
     
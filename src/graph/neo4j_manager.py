@@ -1,7 +1,49 @@
 import os
 from neo4j import GraphDatabase
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
+import threading
+
+# 접속 정보별 공유 드라이버와 사용 중인 Neo4jManager 수 (로더/생성기마다 핸드셰이크와 커넥션 풀을 새로 만들지 않음)
+_drivers: Dict[Tuple[str, str, str], Any] = {}
+_driver_refs: Dict[Tuple[str, str, str], int] = {}
+_drivers_lock = threading.Lock()
+
+def get_driver(uri: str, user: str, password: str):
+    """접속 정보에 해당하는 공유 드라이버 반환 (없으면 생성 후 연결 테스트)"""
+    key = (uri, user, password)
+    with _drivers_lock:
+        driver = _drivers.get(key)
+        if driver is None:
+            try:
+                # neo4j 프로토콜 사용 (최신 버전 권장), 드라이버 하나의 커넥션 풀을 모든 쿼리가 공유
+                driver = GraphDatabase.driver(
+                    uri, 
+                    auth=(user, password),
+                    max_connection_pool_size=50,
+                    connection_acquisition_timeout=60
+                )
+                # 연결 테스트
+                with driver.session() as session:
+                    session.run("RETURN 1")
+                print(f"Neo4j 연결 성공: {uri}")
+            except Exception as e:
+                print(f"Neo4j 연결 실패: {e}")
+                raise
+            _drivers[key] = driver
+        _driver_refs[key] = _driver_refs.get(key, 0) + 1
+        return driver
+
+def release_driver(uri: str, user: str, password: str):
+    """공유 드라이버 사용 종료 (더 이상 사용하는 곳이 없으면 드라이버 종료)"""
+    key = (uri, user, password)
+    with _drivers_lock:
+        _driver_refs[key] = _driver_refs.get(key, 1) - 1
+        if _driver_refs[key] <= 0:
+            _driver_refs.pop(key, None)
+            driver = _drivers.pop(key, None)
+            if driver is not None:
+                driver.close()
 
 class Neo4jManager:
     def __init__(self, uri: str = None, user: str = None, password: str = None):
@@ -18,29 +60,28 @@ class Neo4jManager:
         self._connect()
     
     def _connect(self):
-        """Neo4j 데이터베이스 연결"""
-        try:
-            # neo4j 프로토콜 사용 (최신 버전 권장)
-            self.driver = GraphDatabase.driver(
-                self.uri, 
-                auth=(self.user, self.password)
-            )
-            # 연결 테스트
-            with self.driver.session() as session:
-                session.run("RETURN 1")
-            print(f"Neo4j 연결 성공: {self.uri}")
-        except Exception as e:
-            print(f"Neo4j 연결 실패: {e}")
-            raise
+        """Neo4j 데이터베이스 연결 (같은 접속 정보의 드라이버는 프로세스 내에서 공유)"""
+        self.driver = get_driver(self.uri, self.user, self.password)
     
     def close(self):
-        """연결 종료"""
+        """연결 종료 (공유 드라이버는 마지막 사용자가 닫을 때 실제로 종료)"""
         if self.driver:
-            self.driver.close()
+            release_driver(self.uri, self.user, self.password)
+            self.driver = None
     
-    def execute_query(self, query: str, parameters: Dict = None) -> List[Dict]:
-        """Cypher 쿼리 실행"""
+    def open_session(self):
+        """호출자가 여러 쿼리에 걸쳐 재사용할 세션 생성 (닫는 책임은 호출자, 스레드 간 공유 금지)"""
+        return self.driver.session()
+    
+    def execute_query(self, query: str, parameters: Dict = None, session=None,
+                      read_only: bool = False) -> List[Dict]:
+        """Cypher 쿼리 실행 (session을 넘기면 해당 세션 재사용, read_only면 읽기 트랜잭션으로 실행)"""
+        if read_only:
+            return self._execute_read(query, parameters, session)
         try:
+            if session is not None:
+                result = session.run(query, parameters or {})
+                return [record.data() for record in result]
             with self.driver.session() as session:
                 result = session.run(query, parameters or {})
                 return [record.data() for record in result]
@@ -48,6 +89,51 @@ class Neo4jManager:
             logging.error(f"쿼리 실행 오류: {e}")
             return []
     
+    def _execute_read(self, query: str, parameters: Dict = None, session=None) -> List[Dict]:
+        """읽기 전용 관리 트랜잭션으로 실행 (클러스터에서는 리더 대신 팔로워로 라우팅)"""
+        def work(tx):
+            return tx.run(query, parameters or {}).data()
+        
+        try:
+            if session is not None:
+                return session.execute_read(work)
+            with self.driver.session() as session:
+                return session.execute_read(work)
+        except Exception as e:
+            logging.error(f"쿼리 실행 오류: {e}")
+            return []
+    
+    def execute_write(self, query: str, parameters: Dict = None, session=None) -> List[Dict]:
+        """쓰기 쿼리를 관리 트랜잭션 하나로 실행 (실패 시 전체 롤백, 일시 오류는 드라이버가 재시도)"""
+        def work(tx):
+            return tx.run(query, parameters or {}).data()
+        
+        try:
+            if session is not None:
+                return session.execute_write(work)
+            with self.driver.session() as session:
+                return session.execute_write(work)
+        except Exception as e:
+            logging.error(f"쓰기 트랜잭션 오류: {e}")
+            return []
+    
+    def bulk_write(self, statements: List[Tuple[str, Dict]], session=None) -> Optional[List[List[Dict]]]:
+        """여러 (쿼리, 파라미터) 쌍을 쓰기 트랜잭션 하나로 실행하고 커밋은 한 번만 수행
+        
+        성공 시 문장별 결과 목록을, 실패 시(전체 롤백) None을 반환
+        """
+        def work(tx):
+            return [tx.run(query, parameters or {}).data() for query, parameters in statements]
+        
+        try:
+            if session is not None:
+                return session.execute_write(work)
+            with self.driver.session() as session:
+                return session.execute_write(work)
+        except Exception as e:
+            logging.error(f"일괄 쓰기 트랜잭션 오류: {e}")
+            return None
+    
     def create_constraints_and_indexes(self):
         """기본 제약조건 및 인덱스 생성"""
         constraints = [
@@ -17,6 +17,10 @@ from src.graph.neo4j_manager import Neo4jManager
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 import json
+import re
+
+# LLM 응답 앞뒤의 ```json / ``` 코드블럭 표시
+_CODE_FENCE_PATTERN = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
 
 class NewsRawMaterialEdgeCreator:
     """뉴스-원자재 영향 엣지 생성기"""
@@ -143,12 +147,8 @@ class NewsRawMaterialEdgeCreator:
                 ))
             ])
             
-            # JSON 파싱
-            content = response.content.strip()
-            if content.startswith('```json'):
-                content = content[7:-3]
-            elif content.startswith('```'):
-                content = content[3:-3]
+            # JSON 파싱 (앞뒤 코드블럭 표시만 제거, 닫는 표시가 없어도 본문은 보존)
+            content = _CODE_FENCE_PATTERN.sub('', response.content)
             
             result = json.loads(content)
             return result
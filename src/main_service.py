@@ -16,7 +16,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'graph'))
 from agents.kb_fortress_unified_agent import KBFortressUnifiedAgent
 from agents.ultimate_multihop_analyzer import UltimateMultihopAnalyzer
 from services.simple_notification import SimpleNotificationService
-from graph.enhanced_relationships import EnhancedRelationshipManager
+from graph.enhanced_relationships import EnhancedRelationshipManager, make_event_id
 
 class KBFortressMainService:
     """KB Fortress AI 메인 서비스"""
@@ -109,6 +109,9 @@ class KBFortressMainService:
         """리스크 이벤트 시뮬레이션 (실제로는 자동 감지)"""
         print(f" 리스크 이벤트 시뮬레이션: {event_data.get('title', 'N/A')}")
         
+        # 영향받는 모든 기업의 알림이 같은 RiskEvent 노드를 공유하도록 이벤트 ID를 한 번만 생성
+        event_data = {**event_data, 'event_id': make_event_id(event_data)}
+        
         # 모든 UserCompany 조회
         user_companies = self._get_all_user_companies()
         
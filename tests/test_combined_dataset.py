@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'collectors'))
+
+from combined_dataset import combine_frames
+from financial_products_dataset import FinancialProduct, PRODUCT_FIELDS
+from kb_data_parser import KBLoanProduct, PRODUCT_FIELDS as KB_PRODUCT_FIELDS
+
+
+def test_combined_frames_share_one_schema():
+    dataset_df = pd.DataFrame(
+        [[getattr(FinancialProduct("데이터셋상품", "KB국민은행", "운전자금", "중소기업", "10억", "4%", "", False, True), field)
+          for field in PRODUCT_FIELDS]],
+        columns=PRODUCT_FIELDS,
+    )
+    kb_df = pd.DataFrame(
+        [[getattr(KBLoanProduct("KB상품", product_type="시설자금", target_customer="소상공인",
+                                loan_limit="5억", interest_rate="3.5%", collateral="부동산담보"), field)
+          for field in KB_PRODUCT_FIELDS]],
+        columns=KB_PRODUCT_FIELDS,
+    )
+    manual_df = dataset_df.assign(productName="수동상품")
+
+    df = combine_frames(dataset_df, kb_df, manual_df)
+
+    assert list(df.columns) == list(PRODUCT_FIELDS)
+    assert df["productName"].tolist() == ["데이터셋상품", "KB상품", "수동상품"]
+    kb_row = df.iloc[1]
+    assert kb_row["category"] == "시설자금"
+    assert kb_row["targetCustomer"] == "소상공인"
+    assert kb_row["maxAmount"] == "5억"
+    assert bool(kb_row["collateralRequired"]) is True
+    assert not df[["productName", "category", "targetCustomer", "maxAmount"]].isna().any().any()
@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("langchain_core")
+pytest.importorskip("pydantic")
+pytest.importorskip("neo4j")
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.graph.enhanced_relationship_generator import EnhancedRelationshipGenerator, RelationshipCandidate
+
+
+class _RecordingManager:
+    """execute_write 호출을 기록하고 모든 행이 연결된 것처럼 응답"""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_write(self, query, parameters=None, session=None):
+        self.calls.append((query, parameters))
+        return [{"created": len(parameters["rows"])}]
+
+
+def test_indicator_without_node_id_is_matched_by_name():
+    generator = EnhancedRelationshipGenerator.__new__(EnhancedRelationshipGenerator)
+    generator.neo4j_manager = _RecordingManager()
+    candidate = RelationshipCandidate(
+        source_id="news_001",
+        source_type="NewsArticle",
+        source_data={"nodeId": "news_001", "title": "철강 가격 급등"},
+        target_id="macro_fallback",
+        target_type="MacroIndicator",
+        target_data={"indicatorName": "철강가격지수", "value": 112.3},
+        relationship_type="HAS_IMPACT_ON",
+        confidence=0.8,
+        reasoning="원가 상승",
+    )
+
+    created = generator._create_relationships_in_neo4j([candidate])
+
+    assert created == 1
+    [(query, parameters)] = generator.neo4j_manager.calls
+    assert "MATCH (source:NewsArticle {nodeId: row.sourceKey})" in query
+    assert "MATCH (target:MacroIndicator {indicatorName: row.targetKey})" in query
+    assert parameters["rows"][0]["sourceKey"] == "news_001"
+    assert parameters["rows"][0]["targetKey"] == "철강가격지수"